@@ -2,7 +2,9 @@
 #define HDF5HANDLER_HPP
 
 #include <hdf5.h>
+#include <map>
 #include <string_view>
+#include <vector>
 #include <unordered_map>
 
 #include "../Geometry/Mesh.hpp"
@@ -17,9 +19,28 @@ class HDF5Handler final
 {
 private:
     hid_t m_file_id;    // File id
+    hsize_t m_meshRows{}; // Count of the triangles in the saved mesh
     size_t m_firstID{}, // ID of the first triangle in mesh
         m_lastID{-1ul}; // ID of the last triangle in mesh
 
+    static constexpr char const *kmesh_group{"/mesh"};                   ///< Group that holds all the columnar mesh datasets.
+    static constexpr char const *kmesh_coordinates{"/mesh/coordinates"}; ///< N x 9 triangle vertices.
+    static constexpr char const *kmesh_area{"/mesh/area"};               ///< N triangle areas.
+    static constexpr char const *kmesh_counter{"/mesh/counter"};         ///< N counters of the settled particles.
+    static constexpr char const *kmesh_id{"/mesh/id"};                   ///< N triangle IDs.
+    static constexpr char const *kmesh_geometry_hash{"geometry_hash"};   ///< Attribute of the "/mesh" group: FNV-1a hash of the IDs and coordinates.
+    static constexpr char const *kmesh_counter_snapshots{"/mesh/counter_snapshots"}; ///< S x N counters, one row per snapshot (extendable).
+    static constexpr char const *kmesh_snapshot_time{"/mesh/snapshot_time"};         ///< S simulation time moments of the snapshots (extendable).
+
+    static constexpr char const *ktrajectories_group{"/trajectories"};                 ///< Group that holds all the particle trajectories.
+    static constexpr char const *ktrajectories_particle_id{"/trajectories/particle_id"}; ///< P particle IDs.
+    static constexpr char const *ktrajectories_offsets{"/trajectories/offsets"};         ///< P + 1 offsets of the trajectories in the positions dataset.
+    static constexpr char const *ktrajectories_positions{"/trajectories/positions"};     ///< N x 3 float positions of all the trajectories, one after another.
+
+    static constexpr hsize_t const kdefault_chunk_rows{65'536}; ///< Maximal count of triangles in one chunk of the columnar datasets.
+    static constexpr unsigned const kdefault_deflate_level{4};   ///< Compression level of the columnar datasets (0-9).
+    static constexpr hsize_t const kdefault_extendable_chunk_rows{64}; ///< Count of rows in one chunk of the extendable 1D datasets.
+
     /**
      * @brief Creates a new group in the HDF5 file.
      * @details This function creates a new group in the HDF5 file with the specified name.
@@ -33,39 +54,70 @@ private:
     void createGroup(std::string_view groupName);
 
     /**
-     * @brief Writes data to a dataset in a specified group within the HDF5 file.
-     * @details This function opens the specified group, creates a dataspace and a dataset,
-     *          and then writes the provided data to the dataset. If any of these operations fail,
-     *          it throws an exception. It uses H5Dwrite to write data and closes the handles
-     *          for the dataset and dataspace after the operation.
+     * @brief Writes data to a chunked and compressed dataset within the HDF5 file.
+     * @details This function creates a 1D or 2D dataspace, a dataset creation property list with
+     *          chunking along the first dimension (at most `kdefault_chunk_rows` rows per chunk),
+     *          shuffle and deflate filters (if the deflate filter is available), and then writes
+     *          the provided data with a single H5Dwrite call.
      *
-     * @param groupName The name of the group containing the dataset.
-     * @param datasetName The name of the dataset to which data will be written.
+     * @param datasetPath Full path to the dataset, e.g. "/mesh/coordinates".
      * @param type The HDF5 data type of the dataset.
-     * @param data A pointer to the data to be written.
-     * @param dims The dimension size of the dataset.
+     * @param data A pointer to the contiguous data to be written.
+     * @param rows Count of rows (triangles) in the dataset.
+     * @param cols Count of columns, 1 means that the dataset is one-dimensional.
      *
      * @throws `std::runtime_error` If creating the dataspace or dataset fails.
      */
-    void writeDataset(std::string_view groupName, std::string_view datasetName,
-                      hid_t type, void const *data, hsize_t dims);
+    void writeDataset(std::string_view datasetPath, hid_t type, void const *data, hsize_t rows, hsize_t cols = 1);
 
     /**
-     * @brief Reads data from a dataset within a specified group in the HDF5 file.
-     * @details This function opens the specified group and dataset, and then reads
-     *          the data into the provided buffer. It uses H5Dread for reading the data.
-     *          If opening the group or the dataset fails, an exception is thrown.
-     *          After the operation, it closes the handles for the dataset and the group.
+     * @brief Reads the whole dataset from the HDF5 file.
+     * @details This function opens the dataset and reads all of its elements into the provided
+     *          buffer with a single H5Dread call. The buffer must be large enough to hold the data.
      *
-     * @param groupName The name of the group containing the dataset.
-     * @param datasetName The name of the dataset from which data will be read.
+     * @param datasetPath Full path to the dataset, e.g. "/mesh/coordinates".
      * @param type The HDF5 data type of the dataset.
      * @param data A pointer where the read data will be stored.
      *
      * @throws `std::runtime_error` If the dataset opening fails.
      */
-    void readDataset(std::string_view groupName, std::string_view datasetName,
-                     hid_t type, void *data);
+    void readDataset(std::string_view datasetPath, hid_t type, void *data);
+
+    /**
+     * @brief Returns count of rows (first dimension) of the specified dataset.
+     * @param datasetPath Full path to the dataset.
+     * @throws `std::runtime_error` If the dataset opening fails.
+     */
+    hsize_t getDatasetRows(std::string_view datasetPath);
+
+    /**
+     * @brief Writes the scalar attribute to the object (group or dataset) of the HDF5 file.
+     * @param objectPath Full path to the object, e.g. "/mesh".
+     * @param name Name of the attribute.
+     * @param type The HDF5 data type of the attribute.
+     * @param value A pointer to the value.
+     * @throws `std::runtime_error` If opening the object or writing the attribute fails.
+     */
+    void writeAttribute(std::string_view objectPath, std::string_view name, hid_t type, void const *value);
+
+    /**
+     * @brief Creates an empty dataset that can grow along the first dimension.
+     * @param datasetPath Full path to the dataset.
+     * @param type The HDF5 data type of the dataset.
+     * @param cols Count of columns, 1 means that the dataset is one-dimensional.
+     * @throws `std::runtime_error` If creating the dataset fails.
+     */
+    void createExtendableDataset(std::string_view datasetPath, hid_t type, hsize_t cols = 1);
+
+    /**
+     * @brief Appends one row to the extendable dataset and flushes it, so SWMR readers see it.
+     * @param datasetPath Full path to the dataset.
+     * @param type The HDF5 data type of the data.
+     * @param data A pointer to the `cols` contiguous elements of the row.
+     * @param cols Count of columns of the dataset.
+     * @throws `std::runtime_error` If extending or writing the dataset fails.
+     */
+    void appendRow(std::string_view datasetPath, hid_t type, void const *data, hsize_t cols = 1);
 
 public:
     /**
@@ -73,6 +125,8 @@ public:
      * @param filename The name of the HDF5 file to be opened or created.
      * @details The constructor opens an HDF5 file if it exists, or creates a new one if it does not.
      *          The file is opened with write access, and the file handle is stored for future operations.
+     *          The latest file format is used, so that the file can be switched to the SWMR mode
+     *          (see `startCounterSnapshots`).
      */
     explicit HDF5Handler(std::string_view filename);
     ~HDF5Handler();
@@ -81,9 +135,15 @@ public:
      * @brief Saves mesh data to the HDF5 file.
      * @param mesh A vector of tuples representing the mesh's triangles, with each tuple containing
      *                  the triangle's ID, vertices (as PositionVector objects), and area.
-     * @details This method iterates through the given vector of triangles, creating a group for each
-     *          triangle in the HDF5 file. Within each group, it stores datasets for the triangle's
-     *          coordinates, area, and initializes the particle counter to zero.
+     * @details This method stores the mesh in the columnar layout: all the triangles are packed
+     *          into the contiguous datasets of the "/mesh" group:
+     *          - "/mesh/coordinates" - N x 9 doubles (x1, y1, z1, x2, y2, z2, x3, y3, z3),
+     *          - "/mesh/area"        - N doubles,
+     *          - "/mesh/counter"     - N ints (count of the settled particles),
+     *          - "/mesh/id"          - N unsigned 64-bit ints (triangle IDs).
+     *          Datasets are chunked and compressed, so the whole mesh is written with a handful of calls.
+     *          The "/mesh" group gets the "geometry_hash" attribute (FNV-1a of the IDs and coordinates),
+     *          so readers can reuse the geometry they have already built for the same mesh.
      * @throws `std::runtime_error` if it fails to create a group or dataset within the HDF5 file,
      *         or if writing to the dataset fails.
      */
@@ -91,15 +151,62 @@ public:
     void saveMeshToHDF5(MeshTriangleParamVector &&mesh);
 
     /**
-     * @brief Reads mesh data from the HDF5 file starting from a specified object ID.
+     * @brief Reads mesh data from the HDF5 file.
      * @return A vector of tuples representing the mesh's triangles, with each tuple containing
      *         the triangle's ID, vertices, area, and particle counter.
-     * @details This method reads the HDF5 file and constructs a vector of tuples, each representing a
-     *          triangle's data. It retrieves the triangle's ID, coordinates, area, and particle counter
-     *          from the HDF5 file, starting from the triangle with ID `firstObjectID`.
+     * @details This method reads the columnar datasets of the "/mesh" group (see `saveMeshToHDF5`)
+     *          with one read per dataset and constructs a vector of tuples, each representing a
+     *          triangle's data.
      * @throws `std::runtime_error` if it fails to open a group or dataset within the HDF5 file.
      */
     MeshTriangleParamVector readMeshFromHDF5();
+
+    /**
+     * @brief Prepares the file for the periodic counter snapshots written during the simulation.
+     * @details Creates the extendable "/mesh/counter_snapshots" (S x N ints) and "/mesh/snapshot_time"
+     *          (S doubles) datasets and switches the file to the single-writer/multiple-readers (SWMR) mode,
+     *          so the UI can read the snapshots while the simulation is still running.
+     *          Must be called after `saveMeshToHDF5`, no new datasets can be created afterwards.
+     * @throws `std::runtime_error` if the mesh hasn't been saved or creating the datasets fails.
+     */
+    void startCounterSnapshots();
+
+    /**
+     * @brief Appends the snapshot of the counters.
+     * @param time Simulation time moment of the snapshot.
+     * @param counters Counters of the settled particles in the order of the saved mesh triangles.
+     * @throws `std::runtime_error` if the count of counters doesn't match the mesh or writing fails.
+     */
+    void appendCounterSnapshot(double time, std::vector<int> const &counters);
+
+    /**
+     * @brief Overwrites the "/mesh/counter" dataset with the final counters.
+     * @param counters Counters of the settled particles in the order of the saved mesh triangles.
+     * @throws `std::runtime_error` if the count of counters doesn't match the mesh or writing fails.
+     */
+    void updateCounters(std::vector<int> const &counters);
+
+    /**
+     * @brief Saves the particle trajectories to the HDF5 file.
+     * @param particlesMovement Map of the trajectories: (Particle ID | All positions).
+     *                          Trajectories with less than 2 positions are skipped.
+     * @details Trajectories are stored as a ragged array in the "/trajectories" group:
+     *          - "/trajectories/particle_id" - P unsigned 64-bit ints (particle IDs),
+     *          - "/trajectories/offsets"     - P + 1 unsigned 64-bit ints, positions of the particle `i`
+     *                                          are rows [offsets[i], offsets[i + 1]) of the positions dataset,
+     *          - "/trajectories/positions"   - N x 3 floats (x, y, z).
+     *          This way the whole set of trajectories can be read back with three reads.
+     * @throws `std::runtime_error` if it fails to create a group or dataset within the HDF5 file.
+     */
+    void saveParticleMovementsToHDF5(std::map<size_t, std::vector<Point>> const &particlesMovement);
+
+    /**
+     * @brief Reads the particle trajectories from the HDF5 file.
+     * @return Map of the trajectories: (Particle ID | All positions).
+     * @details Reads the ragged "/trajectories" datasets written by `saveParticleMovementsToHDF5`.
+     * @throws `std::runtime_error` if it fails to open a dataset within the HDF5 file.
+     */
+    std::map<size_t, std::vector<Point>> readParticleMovementsFromHDF5();
 };
 
 #endif // !HDF5HANDLER_HPP
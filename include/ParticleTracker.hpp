@@ -2,9 +2,12 @@
 #define PARTICLETRACKER_HPP
 
 #include <barrier>
+#include <memory>
 #include <mutex>
 #include <shared_mutex>
+#include <unordered_map>
 
+#include "DataHandling/HDF5Handler.hpp"
 #include "FiniteElementMethod/MatrixEquationSolver.hpp"
 #include "Generators/VolumeCreator.hpp"
 #include "Geometry/Mesh.hpp"
@@ -17,6 +20,7 @@ class ParticleTracker final
 private:
     static constexpr short const kdefault_polynomOrder{1};                 ///< Polynom order. Responds for count of the basis functions.
     static constexpr short const kdefault_max_numparticles_to_anim{5'000}; ///< Maximal count of particles to do animation.
+    static constexpr size_t const kdefault_max_counter_snapshots{1'000};   ///< Maximal count of the counter snapshots written during the simulation.
 
     static std::mutex m_PICTracker_mutex;              ///< Mutex for synchronizing access to the particles in tetrahedrons.
     static std::mutex m_nodeChargeDensityMap_mutex;    ///< Mutex for synchronizing access to the charge densities in nodes.
@@ -40,6 +44,9 @@ private:
     std::map<size_t, std::vector<Point>> m_particlesMovement;        ///< Map to store all the particle movements: (Particle ID | All positions).
     std::map<double, std::map<size_t, ParticleVector>> m_PICtracker; ///< Global particle in cell tracker (Time moment: (Tetrahedron ID | Particles inside)).
 
+    std::unique_ptr<HDF5Handler> m_resultFile;              ///< Result file that is kept open during the simulation to write the counter snapshots.
+    std::unordered_map<size_t, size_t> m_triangleRows;      ///< Map of the triangle rows in the result file: (Triangle ID | Row).
+
     /**
      * @brief Checks the validity of the provided mesh filename.
      *
@@ -79,9 +86,10 @@ private:
                        std::shared_ptr<SolutionVector> &solutionVector);
 
     /**
-     * @brief Saves the particle movements to a JSON file.
+     * @brief Saves the particle movements to an HDF5 file.
      *
-     * This function saves the contents of m_particlesMovement to a JSON file named "particles_movements.json".
+     * This function saves the contents of m_particlesMovement to an HDF5 file named "particles_movements.hdf5"
+     * as a ragged float32 array of positions plus per-particle offsets (see `HDF5Handler::saveParticleMovementsToHDF5`).
      * It handles exceptions and provides a warning message if the map is empty.
      */
     void saveParticleMovements() const;
@@ -97,6 +105,26 @@ private:
     /// @brief Returns count of threads from config. Has initial checkings and warning msg when num threads occupies 80% of all the threads.
     unsigned int getNumThreads() const;
 
+    /// @brief Returns name of the result HDF5 file: name of the mesh file with the ".hdf5" extension.
+    std::string getResultFilename() const;
+
+    /// @brief Returns counters of the settled particles in the order of the triangles of `_triangleMesh`.
+    std::vector<int> collectCounters() const;
+
+    /**
+     * @brief Creates the result file before the simulation starts.
+     * @details Writes the surface mesh with zero counters and switches the file to the SWMR mode,
+     *          so the UI can follow the counter snapshots while the simulation is running.
+     *          If the file can't be prepared, snapshots are disabled and the file is written at the end.
+     */
+    void initializeResultFile();
+
+    /**
+     * @brief Appends the snapshot of the counters to the result file (if it's open).
+     * @param time Simulation time moment of the snapshot.
+     */
+    void saveCounterSnapshot(double time);
+
     /// @brief Using HDF5Handler to update the mesh according to the settled particles.
     void updateSurfaceMesh();
 
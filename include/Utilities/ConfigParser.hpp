@@ -76,7 +76,7 @@ namespace ConfigParserTypes
         int convergenceTestFrequency{}; ///< Frequency of convergence test during the solver execution.
 
         /* Boundary conditions. */
-        std::vector<std::pair<std::vector<size_t>, double>> boundaryConditions; ///< Boundary conditions data.
+        std::vector<std::pair<std::vector<size_t>, double>> boundaryConditions; ///< Boundary conditions data: node sets and their values (one value per node).
         std::unordered_map<size_t, std::vector<double>> nodeValues;             ///< Node values.
         std::vector<size_t> nonChangeableNodes;                                 ///< Non-changeable nodes.
     };
@@ -1,4 +1,6 @@
+#include <algorithm>
 #include <filesystem>
+#include <memory>
 #include <stdexcept>
 
 #include "../include/DataHandling/HDF5Handler.hpp"
@@ -8,7 +10,11 @@ HDF5Handler::HDF5Handler(std::string_view filename)
     if (std::filesystem::exists(filename))
         std::filesystem::remove(filename);
 
-    m_file_id = H5Fcreate(filename.data(), H5F_ACC_TRUNC, H5P_DEFAULT, H5P_DEFAULT);
+    // SWMR mode requires the latest file format.
+    hid_t fapl{H5Pcreate(H5P_FILE_ACCESS)};
+    H5Pset_libver_bounds(fapl, H5F_LIBVER_LATEST, H5F_LIBVER_LATEST);
+    m_file_id = H5Fcreate(filename.data(), H5F_ACC_TRUNC, H5P_DEFAULT, fapl);
+    H5Pclose(fapl);
     if (m_file_id < 0)
         throw std::runtime_error("Failed to create HDF5 file: " + std::string(filename));
 }
@@ -23,126 +29,303 @@ void HDF5Handler::createGroup(std::string_view groupName)
     H5Gclose(grp_id);
 }
 
-void HDF5Handler::writeDataset(std::string_view groupName, std::string_view datasetName,
-                               hid_t type, void const *data, hsize_t dims)
+void HDF5Handler::writeDataset(std::string_view datasetPath, hid_t type, void const *data, hsize_t rows, hsize_t cols)
 {
-    hid_t grp_id{H5Gopen2(m_file_id, groupName.data(), H5P_DEFAULT)},
-        dataspace{H5Screate_simple(1, std::addressof(dims), NULL)},
-        dataset{H5Dcreate2(grp_id, datasetName.data(), type, dataspace, H5P_DEFAULT, H5P_DEFAULT, H5P_DEFAULT)};
+    hsize_t dims[2]{rows, cols},
+        chunk[2]{std::clamp(rows, hsize_t{1}, kdefault_chunk_rows), cols};
+    int rank{cols > 1 ? 2 : 1};
+
+    hid_t dataspace{H5Screate_simple(rank, dims, NULL)},
+        plist{H5Pcreate(H5P_DATASET_CREATE)};
+    H5Pset_chunk(plist, rank, chunk);
+    if (H5Zfilter_avail(H5Z_FILTER_DEFLATE) > 0)
+    {
+        H5Pset_shuffle(plist);
+        H5Pset_deflate(plist, kdefault_deflate_level);
+    }
+
+    hid_t dataset{H5Dcreate2(m_file_id, datasetPath.data(), type, dataspace, H5P_DEFAULT, plist, H5P_DEFAULT)};
     if (dataspace < 0 || dataset < 0)
     {
-        H5Gclose(grp_id);
-        throw std::runtime_error("Failed to create dataset " + std::string(datasetName) + " in group: " + std::string(groupName));
+        H5Pclose(plist);
+        if (dataspace >= 0)
+            H5Sclose(dataspace);
+        throw std::runtime_error("Failed to create dataset " + std::string(datasetPath));
     }
-    H5Dwrite(dataset, type, H5S_ALL, H5S_ALL, H5P_DEFAULT, data);
+    herr_t status{H5Dwrite(dataset, type, H5S_ALL, H5S_ALL, H5P_DEFAULT, data)};
     H5Dclose(dataset);
+    H5Pclose(plist);
     H5Sclose(dataspace);
-    H5Gclose(grp_id);
+    if (status < 0)
+        throw std::runtime_error("Failed to write dataset " + std::string(datasetPath));
 }
 
-void HDF5Handler::readDataset(std::string_view groupName, std::string_view datasetName,
-                              hid_t type, void *data)
+void HDF5Handler::readDataset(std::string_view datasetPath, hid_t type, void *data)
 {
-    hid_t grp_id{H5Gopen2(m_file_id, groupName.data(), H5P_DEFAULT)},
-        dataset{H5Dopen2(grp_id, datasetName.data(), H5P_DEFAULT)};
+    hid_t dataset{H5Dopen2(m_file_id, datasetPath.data(), H5P_DEFAULT)};
     if (dataset < 0)
+        throw std::runtime_error("Failed to open dataset " + std::string(datasetPath));
+    H5Dread(dataset, type, H5S_ALL, H5S_ALL, H5P_DEFAULT, data);
+    H5Dclose(dataset);
+}
+
+hsize_t HDF5Handler::getDatasetRows(std::string_view datasetPath)
+{
+    hid_t dataset{H5Dopen2(m_file_id, datasetPath.data(), H5P_DEFAULT)};
+    if (dataset < 0)
+        throw std::runtime_error("Failed to open dataset " + std::string(datasetPath));
+
+    hid_t dataspace{H5Dget_space(dataset)};
+    hsize_t dims[2]{};
+    H5Sget_simple_extent_dims(dataspace, dims, NULL);
+    H5Sclose(dataspace);
+    H5Dclose(dataset);
+    return dims[0];
+}
+
+void HDF5Handler::writeAttribute(std::string_view objectPath, std::string_view name, hid_t type, void const *value)
+{
+    hid_t object{H5Oopen(m_file_id, objectPath.data(), H5P_DEFAULT)};
+    if (object < 0)
+        throw std::runtime_error("Failed to open object " + std::string(objectPath));
+
+    hid_t dataspace{H5Screate(H5S_SCALAR)},
+        attribute{H5Acreate2(object, name.data(), type, dataspace, H5P_DEFAULT, H5P_DEFAULT)};
+    herr_t status{attribute < 0 ? herr_t{-1} : H5Awrite(attribute, type, value)};
+    if (attribute >= 0)
+        H5Aclose(attribute);
+    H5Sclose(dataspace);
+    H5Oclose(object);
+    if (status < 0)
+        throw std::runtime_error("Failed to write attribute " + std::string(name) + " of the " + std::string(objectPath));
+}
+
+void HDF5Handler::createExtendableDataset(std::string_view datasetPath, hid_t type, hsize_t cols)
+{
+    int rank{cols > 1 ? 2 : 1};
+    hsize_t dims[2]{0, cols},
+        maxdims[2]{H5S_UNLIMITED, cols},
+        chunk[2]{rank == 1 ? kdefault_extendable_chunk_rows : 1, cols}; // One row of the 2D dataset per chunk
+
+    hid_t dataspace{H5Screate_simple(rank, dims, maxdims)},
+        plist{H5Pcreate(H5P_DATASET_CREATE)};
+    H5Pset_chunk(plist, rank, chunk);
+    if (H5Zfilter_avail(H5Z_FILTER_DEFLATE) > 0)
     {
-        H5Gclose(grp_id);
-        throw std::runtime_error("Failed to open dataset " + std::string(datasetName) + " in group: " + std::string(groupName));
+        H5Pset_shuffle(plist);
+        H5Pset_deflate(plist, kdefault_deflate_level);
     }
-    H5Dread(dataset, type, H5S_ALL, H5S_ALL, H5P_DEFAULT, data);
+
+    hid_t dataset{H5Dcreate2(m_file_id, datasetPath.data(), type, dataspace, H5P_DEFAULT, plist, H5P_DEFAULT)};
+    H5Pclose(plist);
+    if (dataspace >= 0)
+        H5Sclose(dataspace);
+    if (dataspace < 0 || dataset < 0)
+        throw std::runtime_error("Failed to create dataset " + std::string(datasetPath));
     H5Dclose(dataset);
-    H5Gclose(grp_id);
 }
 
-void HDF5Handler::saveMeshToHDF5(MeshTriangleParamVector const &mesh)
+void HDF5Handler::appendRow(std::string_view datasetPath, hid_t type, void const *data, hsize_t cols)
 {
-    if (mesh.empty())
-        return;
+    hid_t dataset{H5Dopen2(m_file_id, datasetPath.data(), H5P_DEFAULT)};
+    if (dataset < 0)
+        throw std::runtime_error("Failed to open dataset " + std::string(datasetPath));
 
-    auto minTriangle{*std::min_element(mesh.cbegin(), mesh.cend(),
-                                       [](MeshTriangleParam const &a, MeshTriangleParam const &b)
-                                       { return std::get<0>(a) < std::get<0>(b); })};
-    m_firstID = std::get<0>(minTriangle);
+    int rank{cols > 1 ? 2 : 1};
+    hsize_t dims[2]{}, start[2]{}, count[2]{1, cols};
+    hid_t filespace{H5Dget_space(dataset)};
+    H5Sget_simple_extent_dims(filespace, dims, NULL);
+    H5Sclose(filespace);
 
-    for (auto const &triangle : mesh)
+    start[0] = dims[0]++;
+    herr_t status{H5Dset_extent(dataset, dims)};
+    if (status >= 0)
     {
-        // Creating a group for each triangle using the triangle ID as the group name
-        auto id{std::get<0>(triangle)};
-        std::string groupName("Triangle_" + std::to_string(id));
-        createGroup(groupName);
-
-        // Store data related to the triangle in the group
-        double coordinates[9] = {
-            CGAL::to_double(std::get<1>(triangle).vertex(0).x()), CGAL::to_double(std::get<1>(triangle).vertex(0).y()), CGAL::to_double(std::get<1>(triangle).vertex(0).z()),
-            CGAL::to_double(std::get<1>(triangle).vertex(1).x()), CGAL::to_double(std::get<1>(triangle).vertex(1).y()), CGAL::to_double(std::get<1>(triangle).vertex(1).z()),
-            CGAL::to_double(std::get<1>(triangle).vertex(2).x()), CGAL::to_double(std::get<1>(triangle).vertex(2).y()), CGAL::to_double(std::get<1>(triangle).vertex(2).z())};
-        writeDataset(groupName, "Coordinates", H5T_NATIVE_DOUBLE, coordinates, 9);
-
-        double area{std::get<2>(triangle)};
-        writeDataset(groupName, "Area", H5T_NATIVE_DOUBLE, std::addressof(area), 1);
-
-        int count{std::get<3>(triangle)};
-        writeDataset(groupName, "Counter", H5T_NATIVE_INT, std::addressof(count), 1);
+        filespace = H5Dget_space(dataset);
+        H5Sselect_hyperslab(filespace, H5S_SELECT_SET, start, NULL, count, NULL);
+        hid_t memspace{H5Screate_simple(rank, count, NULL)};
+        status = H5Dwrite(dataset, type, memspace, filespace, H5P_DEFAULT, data);
+        if (status >= 0)
+            status = H5Dflush(dataset);
+        H5Sclose(memspace);
+        H5Sclose(filespace);
     }
+    H5Dclose(dataset);
+    if (status < 0)
+        throw std::runtime_error("Failed to append row to the dataset " + std::string(datasetPath));
 }
 
-void HDF5Handler::saveMeshToHDF5(MeshTriangleParamVector &&mesh)
+void HDF5Handler::saveMeshToHDF5(MeshTriangleParamVector const &mesh)
 {
     if (mesh.empty())
         return;
+    m_meshRows = mesh.size();
 
     auto minTriangle{*std::min_element(mesh.cbegin(), mesh.cend(),
                                        [](MeshTriangleParam const &a, MeshTriangleParam const &b)
                                        { return std::get<0>(a) < std::get<0>(b); })};
     m_firstID = std::get<0>(minTriangle);
 
-    for (auto const &triangle : mesh)
+    // Packing all the triangles into contiguous columns.
+    std::vector<double> coordinates, areas;
+    std::vector<int> counters;
+    std::vector<unsigned long long> ids;
+    coordinates.reserve(mesh.size() * 9);
+    areas.reserve(mesh.size());
+    counters.reserve(mesh.size());
+    ids.reserve(mesh.size());
+
+    for (auto const &[id, triangle, area, count] : mesh)
     {
-        auto id{std::get<0>(triangle)};
-        std::string groupName("Triangle_" + std::to_string(id));
-        createGroup(groupName);
+        for (short vertex{}; vertex < 3; ++vertex)
+        {
+            coordinates.emplace_back(CGAL::to_double(triangle.vertex(vertex).x()));
+            coordinates.emplace_back(CGAL::to_double(triangle.vertex(vertex).y()));
+            coordinates.emplace_back(CGAL::to_double(triangle.vertex(vertex).z()));
+        }
+        areas.emplace_back(area);
+        counters.emplace_back(count);
+        ids.emplace_back(id);
+    }
 
-        double coordinates[9] = {
-            CGAL::to_double(std::get<1>(triangle).vertex(0).x()), CGAL::to_double(std::get<1>(triangle).vertex(0).y()), CGAL::to_double(std::get<1>(triangle).vertex(0).z()),
-            CGAL::to_double(std::get<1>(triangle).vertex(1).x()), CGAL::to_double(std::get<1>(triangle).vertex(1).y()), CGAL::to_double(std::get<1>(triangle).vertex(1).z()),
-            CGAL::to_double(std::get<1>(triangle).vertex(2).x()), CGAL::to_double(std::get<1>(triangle).vertex(2).y()), CGAL::to_double(std::get<1>(triangle).vertex(2).z())};
-        writeDataset(groupName, "Coordinates", H5T_NATIVE_DOUBLE, coordinates, 9);
+    createGroup(kmesh_group);
+    writeDataset(kmesh_coordinates, H5T_NATIVE_DOUBLE, coordinates.data(), mesh.size(), 9);
+    writeDataset(kmesh_area, H5T_NATIVE_DOUBLE, areas.data(), mesh.size());
+    writeDataset(kmesh_counter, H5T_NATIVE_INT, counters.data(), mesh.size());
+    writeDataset(kmesh_id, H5T_NATIVE_ULLONG, ids.data(), mesh.size());
 
-        double area{std::get<2>(triangle)};
-        writeDataset(groupName, "Area", H5T_NATIVE_DOUBLE, std::addressof(area), 1);
+    // FNV-1a hash of the geometry: the same mesh gives the same hash regardless of the counters.
+    unsigned long long hash{14'695'981'039'346'656'037ull};
+    auto hashBytes{[&hash](void const *data, size_t size)
+                   {
+                       auto bytes{static_cast<unsigned char const *>(data)};
+                       for (size_t i{}; i < size; ++i)
+                           hash = (hash ^ bytes[i]) * 1'099'511'628'211ull;
+                   }};
+    hashBytes(ids.data(), ids.size() * sizeof(unsigned long long));
+    hashBytes(coordinates.data(), coordinates.size() * sizeof(double));
+    writeAttribute(kmesh_group, kmesh_geometry_hash, H5T_NATIVE_ULLONG, std::addressof(hash));
+}
 
-        int count{std::get<3>(triangle)};
-        writeDataset(groupName, "Counter", H5T_NATIVE_INT, std::addressof(count), 1);
-    }
+void HDF5Handler::saveMeshToHDF5(MeshTriangleParamVector &&mesh) { saveMeshToHDF5(static_cast<MeshTriangleParamVector const &>(mesh)); }
+
+void HDF5Handler::startCounterSnapshots()
+{
+    if (m_meshRows == 0)
+        throw std::runtime_error("Failed to start counter snapshots: mesh hasn't been saved");
+
+    createExtendableDataset(kmesh_counter_snapshots, H5T_NATIVE_INT, m_meshRows);
+    createExtendableDataset(kmesh_snapshot_time, H5T_NATIVE_DOUBLE);
+    if (H5Fstart_swmr_write(m_file_id) < 0)
+        throw std::runtime_error("Failed to switch HDF5 file to the SWMR mode");
+}
+
+void HDF5Handler::appendCounterSnapshot(double time, std::vector<int> const &counters)
+{
+    if (counters.size() != m_meshRows)
+        throw std::runtime_error("Failed to append counter snapshot: count of counters doesn't match the mesh");
+
+    // Counters go first: reader takes the count of the snapshots from the time dataset.
+    appendRow(kmesh_counter_snapshots, H5T_NATIVE_INT, counters.data(), m_meshRows);
+    appendRow(kmesh_snapshot_time, H5T_NATIVE_DOUBLE, std::addressof(time));
+}
+
+void HDF5Handler::updateCounters(std::vector<int> const &counters)
+{
+    if (counters.size() != m_meshRows)
+        throw std::runtime_error("Failed to update counters: count of counters doesn't match the mesh");
+
+    hid_t dataset{H5Dopen2(m_file_id, kmesh_counter, H5P_DEFAULT)};
+    if (dataset < 0)
+        throw std::runtime_error("Failed to open dataset " + std::string(kmesh_counter));
+    herr_t status{H5Dwrite(dataset, H5T_NATIVE_INT, H5S_ALL, H5S_ALL, H5P_DEFAULT, counters.data())};
+    if (status >= 0)
+        status = H5Dflush(dataset);
+    H5Dclose(dataset);
+    if (status < 0)
+        throw std::runtime_error("Failed to write dataset " + std::string(kmesh_counter));
 }
 
 MeshTriangleParamVector HDF5Handler::readMeshFromHDF5()
 {
     MeshTriangleParamVector mesh;
-    hsize_t num_objs{};
-    H5Gget_num_objs(m_file_id, std::addressof(num_objs));
-    m_lastID = m_firstID + num_objs;
-
-    for (size_t id{m_firstID}; id < m_lastID; ++id)
-    {
-        std::string groupName("Triangle_" + std::to_string(id));
+    hsize_t num_objs{getDatasetRows(kmesh_id)};
+    if (num_objs == 0)
+        return mesh;
 
-        double coordinates[9]{};
-        readDataset(groupName, "Coordinates", H5T_NATIVE_DOUBLE, coordinates);
+    std::vector<double> coordinates(num_objs * 9), areas(num_objs);
+    std::vector<int> counters(num_objs);
+    std::vector<unsigned long long> ids(num_objs);
+    readDataset(kmesh_coordinates, H5T_NATIVE_DOUBLE, coordinates.data());
+    readDataset(kmesh_area, H5T_NATIVE_DOUBLE, areas.data());
+    readDataset(kmesh_counter, H5T_NATIVE_INT, counters.data());
+    readDataset(kmesh_id, H5T_NATIVE_ULLONG, ids.data());
 
-        double area{};
-        readDataset(groupName, "Area", H5T_NATIVE_DOUBLE, std::addressof(area));
+    m_firstID = *std::ranges::min_element(ids);
+    m_lastID = *std::ranges::max_element(ids);
 
-        int counter{};
-        readDataset(groupName, "Counter", H5T_NATIVE_INT, std::addressof(counter));
+    mesh.reserve(num_objs);
+    for (size_t i{}; i < num_objs; ++i)
+    {
+        double const *c{coordinates.data() + i * 9};
 
         // Construct the tuple and add to the mesh vector
-        Triangle tmp(Point(coordinates[0], coordinates[1], coordinates[2]),
-                      Point(coordinates[3], coordinates[4], coordinates[5]),
-                      Point(coordinates[6], coordinates[7], coordinates[8]));
-        mesh.emplace_back(std::make_tuple(id, tmp, area, counter));
+        Triangle tmp(Point(c[0], c[1], c[2]),
+                     Point(c[3], c[4], c[5]),
+                     Point(c[6], c[7], c[8]));
+        mesh.emplace_back(std::make_tuple(static_cast<size_t>(ids[i]), tmp, areas[i], counters[i]));
     }
 
     return mesh;
 }
+
+void HDF5Handler::saveParticleMovementsToHDF5(std::map<size_t, std::vector<Point>> const &particlesMovement)
+{
+    std::vector<unsigned long long> ids, offsets{0ull};
+    std::vector<float> positions;
+    for (auto const &[id, movements] : particlesMovement)
+    {
+        if (movements.size() < 2)
+            continue;
+
+        for (auto const &point : movements)
+        {
+            positions.emplace_back(static_cast<float>(CGAL::to_double(point.x())));
+            positions.emplace_back(static_cast<float>(CGAL::to_double(point.y())));
+            positions.emplace_back(static_cast<float>(CGAL::to_double(point.z())));
+        }
+        ids.emplace_back(id);
+        offsets.emplace_back(positions.size() / 3);
+    }
+    if (ids.empty())
+        return;
+
+    createGroup(ktrajectories_group);
+    writeDataset(ktrajectories_particle_id, H5T_NATIVE_ULLONG, ids.data(), ids.size());
+    writeDataset(ktrajectories_offsets, H5T_NATIVE_ULLONG, offsets.data(), offsets.size());
+    writeDataset(ktrajectories_positions, H5T_NATIVE_FLOAT, positions.data(), positions.size() / 3, 3);
+}
+
+std::map<size_t, std::vector<Point>> HDF5Handler::readParticleMovementsFromHDF5()
+{
+    std::map<size_t, std::vector<Point>> particlesMovement;
+    hsize_t num_particles{getDatasetRows(ktrajectories_particle_id)};
+    if (num_particles == 0)
+        return particlesMovement;
+
+    std::vector<unsigned long long> ids(num_particles), offsets(num_particles + 1);
+    std::vector<float> positions(getDatasetRows(ktrajectories_positions) * 3);
+    readDataset(ktrajectories_particle_id, H5T_NATIVE_ULLONG, ids.data());
+    readDataset(ktrajectories_offsets, H5T_NATIVE_ULLONG, offsets.data());
+    readDataset(ktrajectories_positions, H5T_NATIVE_FLOAT, positions.data());
+
+    for (size_t i{}; i < num_particles; ++i)
+    {
+        auto &movements{particlesMovement[ids[i]]};
+        movements.reserve(offsets[i + 1] - offsets[i]);
+        for (auto row{offsets[i]}; row < offsets[i + 1]; ++row)
+            movements.emplace_back(positions[row * 3], positions[row * 3 + 1], positions[row * 3 + 2]);
+    }
+
+    return particlesMovement;
+}
@@ -2,8 +2,6 @@
 #include <atomic>
 #include <execution>
 #include <future>
-#include <nlohmann/json.hpp>
-using json = nlohmann::json;
 
 #include "../include/DataHandling/HDF5Handler.hpp"
 #include "../include/ParticleTracker.hpp"
@@ -132,37 +130,65 @@ void ParticleTracker::saveParticleMovements() const
             return;
         }
 
-        json j;
-        for (auto const &[id, movements] : m_particlesMovement)
-        {
-            if (movements.size() > 1)
-            {
-                json positions;
-                for (auto const &point : movements)
-                    positions.push_back({{"x", point.x()}, {"y", point.y()}, {"z", point.z()}});
-                j[std::to_string(id)] = positions;
-            }
-        }
-
-        std::string filepath("particles_movements.json");
-        std::ofstream file(filepath);
-        if (file.is_open())
-        {
-            file << j.dump(4); // 4 spaces indentation for pretty printing
-            file.close();
-        }
-        else
-            throw std::ios_base::failure("Failed to open file for writing");
+        std::string filepath("particles_movements.hdf5");
+        HDF5Handler hdf5handler(filepath);
+        hdf5handler.saveParticleMovementsToHDF5(m_particlesMovement);
 
         LOGMSG(util::stringify("Successfully written particle movements to the file ", filepath));
     }
-    catch (std::ios_base::failure const &e)
+    catch (std::exception const &e)
+    {
+        ERRMSG(util::stringify("Error occurred while saving particle movements: ", e.what()));
+    }
+}
+
+std::string ParticleTracker::getResultFilename() const
+{
+    std::string hdf5filename(std::string(m_config.getMeshFilename().substr(0ul, m_config.getMeshFilename().find("."))));
+    hdf5filename += ".hdf5";
+    return hdf5filename;
+}
+
+std::vector<int> ParticleTracker::collectCounters() const
+{
+    std::vector<int> counters(_triangleMesh.size());
+    for (auto const &[id, count] : _settledParticlesCounterMap)
+        if (auto it{m_triangleRows.find(id)}; it != m_triangleRows.cend())
+            counters[it->second] = count;
+    return counters;
+}
+
+void ParticleTracker::initializeResultFile()
+{
+    m_triangleRows.clear();
+    for (size_t row{}; row < _triangleMesh.size(); ++row)
+        m_triangleRows[std::get<0>(_triangleMesh[row])] = row;
+
+    try
     {
-        ERRMSG(util::stringify("I/O error occurred: ", e.what()));
+        m_resultFile = std::make_unique<HDF5Handler>(getResultFilename());
+        m_resultFile->saveMeshToHDF5(_triangleMesh);
+        m_resultFile->startCounterSnapshots();
     }
-    catch (json::exception const &e)
+    catch (std::exception const &e)
     {
-        ERRMSG(util::stringify("JSON error occurred: ", e.what()));
+        WARNINGMSG(util::stringify("Warning: Counter snapshots are disabled, results will be written at the end of the simulation: ", e.what()));
+        m_resultFile.reset();
+    }
+}
+
+void ParticleTracker::saveCounterSnapshot(double time)
+{
+    if (!m_resultFile)
+        return;
+
+    try
+    {
+        m_resultFile->appendCounterSnapshot(time, collectCounters());
+    }
+    catch (std::exception const &e)
+    {
+        ERRMSG(util::stringify("Can't write counter snapshot: ", e.what()));
     }
 }
 
@@ -174,9 +200,23 @@ void ParticleTracker::updateSurfaceMesh()
         if (auto it{_settledParticlesCounterMap.find(std::get<0>(meshParam))}; it != mapEnd)
             std::get<3>(meshParam) = it->second;
 
-    std::string hdf5filename(std::string(m_config.getMeshFilename().substr(0ul, m_config.getMeshFilename().find("."))));
-    hdf5filename += ".hdf5";
-    HDF5Handler hdf5handler(hdf5filename);
+    // Result file with the snapshots is already open: only the counters are updated in place.
+    if (m_resultFile)
+    {
+        try
+        {
+            m_resultFile->updateCounters(collectCounters());
+            m_resultFile.reset();
+            return;
+        }
+        catch (std::exception const &e)
+        {
+            ERRMSG(util::stringify("Can't update counters in the result file, rewriting it: ", e.what()));
+            m_resultFile.reset();
+        }
+    }
+
+    HDF5Handler hdf5handler(getResultFilename());
     hdf5handler.saveMeshToHDF5(_triangleMesh);
 }
 
@@ -449,8 +489,13 @@ void ParticleTracker::startSimulation()
     auto num_threads{getNumThreads()};
     std::map<GlobalOrdinal, double> nodeChargeDensityMap;
 
+    // Result file is written in advance, counters are appended to it periodically, so the progress can be watched.
+    initializeResultFile();
+    size_t step{},
+        snapshotPeriod{std::max<size_t>(1ul, static_cast<size_t>(m_config.getSimulationTime() / m_config.getTimeStep()) / kdefault_max_counter_snapshots)};
+
     // Separate particles on segments.
-    for (double t{}; t <= m_config.getSimulationTime() && !m_stop_processing.test(); t += m_config.getTimeStep())
+    for (double t{}; t <= m_config.getSimulationTime() && !m_stop_processing.test(); t += m_config.getTimeStep(), ++step)
     {
         // 1. Obtain charge densities in all the nodes.
         processWithThreads(num_threads, &ParticleTracker::processPIC, t, cubicGrid, assemblier, std::ref(nodeChargeDensityMap));
@@ -460,6 +505,10 @@ void ParticleTracker::startSimulation()
 
         // 3. Process surface collision tracking in parallel.
         processWithThreads(num_threads, &ParticleTracker::processSurfaceCollisionTracker, t, cubicGrid, assemblier);
+
+        // 4. Share the intermediate counters.
+        if (step % snapshotPeriod == 0)
+            saveCounterSnapshot(t);
     }
 
     updateSurfaceMesh();
@@ -14,6 +14,56 @@ void checkParameterExists(json const &j, std::string_view param)
         throw std::runtime_error("Missing required parameter: " + std::string(param) + ". Example: \"" + std::string(param) + "\": <value>");
 }
 
+/**
+ * @brief Parses the node set - key of the "Boundary Conditions".
+ * @details Key is the comma-separated list of node IDs and inclusive ranges of them, e.g. "1-100,105,200-300".
+ * @param key Node set key.
+ * @return Node IDs in the order of the key.
+ */
+std::vector<size_t> parseNodeSet(std::string_view key)
+{
+    std::vector<size_t> nodes;
+    size_t start{};
+    while (start <= key.size())
+    {
+        size_t end{key.find(',', start)};
+        if (end == std::string_view::npos)
+            end = key.size();
+        std::string token(key.substr(start, end - start));
+        start = end + 1ul;
+        if (token.empty())
+            continue;
+
+        // Token is a single node ID or an inclusive range of them: "first-last".
+        size_t dash{token.find('-')};
+        size_t first{}, last{};
+        try
+        {
+            first = std::stoul(token.substr(0ul, dash));
+            last = dash == std::string::npos ? first : std::stoul(token.substr(dash + 1ul));
+        }
+        catch (std::invalid_argument const &e)
+        {
+            throw std::runtime_error("Invalid node ID: " + token + ". Error: " + e.what());
+        }
+        catch (std::out_of_range const &e)
+        {
+            throw std::runtime_error("Node ID out of range: " + token + ". Error: " + e.what());
+        }
+        if (last < first)
+            throw std::runtime_error("Invalid node ID range: " + token + ". The end of the range is less than its start.");
+
+        nodes.reserve(nodes.size() + (last - first) + 1ul);
+        for (size_t nodeId{first};; ++nodeId)
+        {
+            nodes.emplace_back(nodeId);
+            if (nodeId == last)
+                break;
+        }
+    }
+    return nodes;
+}
+
 void ConfigParser::getConfigData(std::string_view config)
 {
     if (config.empty())
@@ -129,54 +179,15 @@ void ConfigParser::getConfigData(std::string_view config)
         if (configJson.contains("convergenceTestFrequency"))
             m_config.convergenceTestFrequency = std::stoi(configJson.at("convergenceTestFrequency").get<std::string>());
 
-        // Boundary conditions.
+        // Boundary conditions: key is the node set (node IDs and "first-last" ranges), value is the value of its nodes.
+        // Each node has exactly one value, so a node can't be in several node sets. The UI keeps this rule
+        // by moving the node to the last node set it was assigned to, the duplicates found here are an error.
         if (configJson.contains("Boundary Conditions"))
         {
             json boundaryConditionsJson = configJson.at("Boundary Conditions");
             for (auto const &[key, value] : boundaryConditionsJson.items())
             {
-                std::vector<size_t> nodes;
-                std::string nodesStr(key);
-                size_t pos{};
-                std::string token;
-                while ((pos = nodesStr.find(',')) != std::string::npos)
-                {
-                    token = nodesStr.substr(0ul, pos);
-                    try
-                    {
-                        size_t nodeId{std::stoul(token)};
-                        nodes.emplace_back(nodeId);
-                        m_config.nonChangeableNodes.emplace_back(nodeId);
-                        m_config.nodeValues[nodeId].emplace_back(value.get<double>());
-                    }
-                    catch (std::invalid_argument const &e)
-                    {
-                        throw std::runtime_error("Invalid node ID: " + token + ". Error: " + e.what());
-                    }
-                    catch (std::out_of_range const &e)
-                    {
-                        throw std::runtime_error("Node ID out of range: " + token + ". Error: " + e.what());
-                    }
-                    nodesStr.erase(0ul, pos + 1ul);
-                }
-                if (!nodesStr.empty())
-                {
-                    try
-                    {
-                        size_t nodeId{std::stoul(nodesStr)};
-                        nodes.emplace_back(nodeId);
-                        m_config.nonChangeableNodes.emplace_back(nodeId);
-                        m_config.nodeValues[nodeId].emplace_back(value.get<double>());
-                    }
-                    catch (std::invalid_argument const &e)
-                    {
-                        throw std::runtime_error("Invalid node ID: " + nodesStr + ". Error: " + e.what());
-                    }
-                    catch (std::out_of_range const &e)
-                    {
-                        throw std::runtime_error("Node ID out of range: " + nodesStr + ". Error: " + e.what());
-                    }
-                }
+                std::vector<size_t> nodes{parseNodeSet(key)};
 
                 double val{};
                 try
@@ -188,6 +199,12 @@ void ConfigParser::getConfigData(std::string_view config)
                     throw std::runtime_error("Invalid value for node IDs: " + key + ". Error: " + e.what());
                 }
 
+                for (size_t nodeId : nodes)
+                {
+                    m_config.nonChangeableNodes.emplace_back(nodeId);
+                    m_config.nodeValues[nodeId].emplace_back(val);
+                }
+
                 m_config.boundaryConditions.emplace_back(nodes, val);
             }
 
@@ -100,3 +100,33 @@ TEST_F(ConfigParserTest, InvalidConfigurations)
         EXPECT_NE(configParser.getStatusCode(), STATUS_OK) << "Status should not be OK for invalid config file: " << configFile;
     }
 }
+
+TEST_F(ConfigParserTest, BoundaryConditionNodeRanges)
+{
+    std::string const rangesConfigPath{"../configs/test_config_boundary_ranges.json"};
+    {
+        json j;
+        j["Mesh File"] = "../meshes/TetrahedronTestMesh.msh.gtest";
+        j["Threads"] = 4;
+        j["Time Step"] = 0.01;
+        j["Simulation Time"] = 1.0;
+        j["T"] = 300.0;
+        j["P"] = 101325;
+        j["Gas"] = "Ar";
+        j["Model"] = "HS";
+        j["EdgeSize"] = "1";
+        j["DesiredAccuracy"] = "3";
+        j["Boundary Conditions"]["1-3,7,10-11"] = 5.0;
+        j["Boundary Conditions"]["20,21"] = -1.0;
+
+        std::ofstream outFile(rangesConfigPath, std::ios::out | std::ios::trunc);
+        outFile << j.dump(4);
+    }
+
+    ConfigParser config(rangesConfigPath);
+    std::filesystem::remove(rangesConfigPath);
+
+    std::vector<std::pair<std::vector<size_t>, double>> expected{{{1, 2, 3, 7, 10, 11}, 5.0}, {{20, 21}, -1.0}};
+    EXPECT_EQ(config.getBoundaryConditions(), expected);
+    EXPECT_EQ(config.getNonChangeableNodes(), (std::vector<size_t>{1, 2, 3, 7, 10, 11, 20, 21}));
+}
@@ -46,3 +46,74 @@ TEST_F(HDF5HandlerTest, SaveAndReadMesh)
         EXPECT_EQ(std::get<3>(mesh.at(0)), count);
     }
 }
+
+TEST_F(HDF5HandlerTest, SaveAndReadColumnarMesh)
+{
+    // Create and save a mesh with non-contiguous IDs.
+    MeshTriangleParamVector mesh;
+    mesh.emplace_back(std::make_tuple(12ul, Triangle(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0)), 0.5, 3));
+    mesh.emplace_back(std::make_tuple(5ul, Triangle(Point(0, 0, 1), Point(1, 0, 1), Point(0, 1, 1)), 0.25, 0));
+    mesh.emplace_back(std::make_tuple(40ul, Triangle(Point(2, 2, 2), Point(3, 2, 2), Point(2, 3, 2)), 1.5, 17));
+    handler->saveMeshToHDF5(mesh);
+
+    // Read back the mesh, order of the triangles must be preserved.
+    MeshTriangleParamVector readMesh{handler->readMeshFromHDF5()};
+    ASSERT_EQ(mesh.size(), readMesh.size());
+    for (size_t i{}; i < mesh.size(); ++i)
+    {
+        auto const &[id, triangle, area, count]{readMesh[i]};
+
+        EXPECT_EQ(std::get<0>(mesh.at(i)), id);
+        EXPECT_EQ(std::get<1>(mesh.at(i)), triangle);
+        EXPECT_DOUBLE_EQ(std::get<2>(mesh.at(i)), area);
+        EXPECT_EQ(std::get<3>(mesh.at(i)), count);
+    }
+}
+
+TEST_F(HDF5HandlerTest, SaveAndReadParticleMovements)
+{
+    // Trajectory with a single position must be skipped.
+    std::map<size_t, std::vector<Point>> particlesMovement{
+        {3ul, {Point(0, 0, 0), Point(1, 1, 1), Point(2, 2, 2)}},
+        {7ul, {Point(5, 5, 5)}},
+        {11ul, {Point(-1, 0.5, 0), Point(-2, 1.5, 0)}}};
+    handler->saveParticleMovementsToHDF5(particlesMovement);
+
+    auto readMovements{handler->readParticleMovementsFromHDF5()};
+    ASSERT_EQ(readMovements.size(), 2ul);
+    EXPECT_EQ(readMovements.count(7ul), 0ul);
+    EXPECT_EQ(readMovements.at(3ul), particlesMovement.at(3ul));
+    EXPECT_EQ(readMovements.at(11ul), particlesMovement.at(11ul));
+}
+
+TEST_F(HDF5HandlerTest, AppendCounterSnapshots)
+{
+    MeshTriangleParamVector mesh;
+    mesh.emplace_back(std::make_tuple(1ul, Triangle(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0)), 0.5, 0));
+    mesh.emplace_back(std::make_tuple(2ul, Triangle(Point(0, 0, 1), Point(1, 0, 1), Point(0, 1, 1)), 0.5, 0));
+    handler->saveMeshToHDF5(mesh);
+    handler->startCounterSnapshots();
+
+    handler->appendCounterSnapshot(0.0, {0, 1});
+    handler->appendCounterSnapshot(0.1, {2, 3});
+    EXPECT_THROW(handler->appendCounterSnapshot(0.2, {1}), std::runtime_error);
+    handler->updateCounters({4, 5});
+
+    // Reading back with the SWMR reader while the writer is still open.
+    H5::H5File file(filename, H5F_ACC_RDONLY | H5F_ACC_SWMR_READ);
+    H5::DataSet snapshots{file.openDataSet("/mesh/counter_snapshots")};
+    hsize_t dims[2]{};
+    snapshots.getSpace().getSimpleExtentDims(dims);
+    ASSERT_EQ(dims[0], 2ul);
+    ASSERT_EQ(dims[1], 2ul);
+
+    int values[4]{};
+    snapshots.read(values, H5::PredType::NATIVE_INT);
+    EXPECT_EQ(values[2], 2);
+    EXPECT_EQ(values[3], 3);
+
+    int counters[2]{};
+    file.openDataSet("/mesh/counter").read(counters, H5::PredType::NATIVE_INT);
+    EXPECT_EQ(counters[0], 4);
+    EXPECT_EQ(counters[1], 5);
+}
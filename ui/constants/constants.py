@@ -4,9 +4,35 @@ DEFAULT_TEMP_MESH_FILE = 'temp.msh'
 DEFAULT_TEMP_VTK_FILE = 'temp.vtk'
 DEFAULT_TEMP_HDF5_FILE = 'temp.hdf5'
 DEFAULT_TEMP_CONFIG_FILE = 'temp_config.json'
+DEFAULT_PARTICLE_MOVEMENTS_FILE = 'particles_movements.hdf5'
+DEFAULT_LEGACY_PARTICLE_MOVEMENTS_FILE = 'particles_movements.json'
 
 DEFAULT_COUNT_OF_PROJECT_FILES = 3
 
+# Meshes with more triangles are loaded lazily in the results tab: only this many triangles with the most settled particles are read
+DEFAULT_RESULTS_MAX_TRIANGLES_IN_MEMORY = 5_000_000
+
+# Period of polling the result file for the new counter snapshots while the simulation is running
+DEFAULT_RESULTS_LIVE_REFRESH_INTERVAL_MS = 1000
+
+# Count of the triangles added to the expanded surface of the mesh tree at a time
+DEFAULT_MESH_TREE_FETCH_BATCH_SIZE = 256
+
+# Count of the meshes whose built geometry is kept between the result loads
+DEFAULT_RESULTS_GEOMETRY_CACHE_SIZE = 4
+
+# Memory budget of the precomputed particle animation frames
+DEFAULT_ANIMATION_FRAME_CACHE_BYTES = 512 * 1024 * 1024
+
+# Maximal count of the particles drawn while the camera moves (it's also limited by the count of the window pixels)
+DEFAULT_ANIMATION_LOD_PARTICLE_BUDGET = 100_000
+
+# Tolerance of the editor click picking (fraction of the render window diagonal)
+DEFAULT_EDITOR_PICKER_TOLERANCE = 0.005
+
+# Rubber band mode of the editor selects all the visible actors in the area with the hardware selector
+DEFAULT_EDITOR_HARDWARE_AREA_PICKING = True
+
 ANSI_COLOR_REGEX = compile(r'\033\[(\d+)(;\d+)*m')
 ANSI_TO_QCOLOR = {
     '31': 'red',
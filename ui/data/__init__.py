@@ -1 +1,7 @@
+from .counter_stats import CounterStats
+from .mesh_data import MeshData
 from .hdf5handler import HDF5Handler
+from .hdf5_converter import convert_legacy_hdf5
+from .trajectory_data import TrajectoryData
+from .mesh_tree_data import MeshTreeData, MeshTreeDict, MeshNodeIndex, MESH_TREE_OBJECT_TYPES
+from .config_document import ConfigDocument, CONFIG_BOUNDARY_CONDITIONS
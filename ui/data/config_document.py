@@ -0,0 +1,215 @@
+import numpy as np
+from os import stat
+from json import load, dump
+from contextlib import contextmanager
+
+CONFIG_BOUNDARY_CONDITIONS = 'Boundary Conditions'
+CONFIG_NODE_SEPARATOR = ','
+CONFIG_NODE_RANGE_SEPARATOR = '-'  # Inclusive range of the node tags: "first-last"
+
+
+class ConfigDocument:
+    """
+    In-memory model of the configuration JSON with dirty tracking.
+
+    The file is read once and reloaded only when it was changed on disk by someone else (e.g. the config tab
+    rewrote it). Modifications are done in memory and written with a single `flush`, changes made inside
+    `transaction()` are flushed once at the end of the outermost transaction.
+
+    Boundary conditions are kept as sorted unique node arrays (node set -> value), the keys of the JSON
+    are built from them only when the document is written. Keys are the runs of the consecutive node tags,
+    e.g. "1-100,105,200-300" (plain lists of the node tags written by the older versions are read as well).
+    Each node has at most one value: setting the value for the node set takes its nodes away from the other sets.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.data = {}                 # All the keys of the config except the boundary conditions
+        self.boundary_conditions = {}  # Key = bytes of the node array  |  value = pair(node array, value)
+        self.file_state = None         # (mtime, size) of the file when it was read or written last time
+        self.dirty = False
+        self.transaction_depth = 0
+
+    @staticmethod
+    def get_file_state(path: str):
+        try:
+            file_stat = stat(path)
+        except OSError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    @staticmethod
+    def normalize_nodes(node_ids) -> np.ndarray:
+        return np.unique(np.asarray(node_ids, dtype=np.uint64).reshape(-1))
+
+    @staticmethod
+    def decode_nodes(key: str) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Sorted unique node tags of the node set key (runs and single tags separated by commas).
+
+        Raises:
+            ValueError: If the key has invalid node tags or ranges.
+        """
+        firsts, lasts = [], []
+        for token in key.split(CONFIG_NODE_SEPARATOR):
+            token = token.strip()
+            if not token:
+                continue
+            first, _, last = token.partition(CONFIG_NODE_RANGE_SEPARATOR)
+            firsts.append(int(first))
+            lasts.append(int(last) if last else firsts[-1])
+
+        firsts = np.asarray(firsts, dtype=np.int64)
+        lengths = np.asarray(lasts, dtype=np.int64) - firsts + 1
+        if np.any(firsts < 0) or np.any(lengths < 1):
+            raise ValueError(f"Invalid node set: '{key}'")
+
+        # Expanding all the runs at once: position in the run is added to its first tag
+        offsets = np.cumsum(lengths) - lengths
+        nodes = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(firsts, lengths)
+        return ConfigDocument.normalize_nodes(nodes)
+
+    @staticmethod
+    def encode_nodes(nodes: np.ndarray) -> str:
+        """
+        Returns:
+            str: Key of the sorted unique node tags, runs of the consecutive tags are written as "first-last".
+        """
+        if nodes.size == 0:
+            return ''
+        breaks = np.flatnonzero(np.diff(nodes) != 1) + 1
+        firsts = nodes[np.r_[0, breaks]].tolist()
+        lasts = nodes[np.r_[breaks - 1, nodes.size - 1]].tolist()
+        return CONFIG_NODE_SEPARATOR.join(str(first) if first == last else f'{first}{CONFIG_NODE_RANGE_SEPARATOR}{last}'
+                                          for first, last in zip(firsts, lasts))
+
+    def open(self, path: str):
+        """
+        Makes the document follow the `path`. The file is (re)read if it's another file or it was changed on disk.
+        Missing file gives the empty document.
+
+        Raises:
+            RuntimeError: If the document has unsaved changes and it would be reread (see `discard_changes`).
+            JSONDecodeError: If the file isn't a valid JSON.
+            ValueError: If the boundary conditions have invalid node sets.
+            OSError: If the file can't be read.
+        """
+        file_state = self.get_file_state(path)
+        if path == self.path and file_state == self.file_state:
+            return
+        if self.dirty:
+            raise RuntimeError(f"Configuration '{self.path}' has unsaved changes, "
+                               f"and {'it was changed on disk' if path == self.path else f'another file is opened: {path}'}")
+
+        data = {}
+        if file_state is not None:
+            with open(path, 'r') as file:
+                data = load(file)
+
+        self.path = path
+        self.file_state = file_state
+        self.boundary_conditions = {}
+        for key, value in data.pop(CONFIG_BOUNDARY_CONDITIONS, {}).items():
+            nodes = self.decode_nodes(key)
+            if nodes.size:
+                self.put_boundary_condition(nodes, value)
+        self.data = data
+        self.dirty = False
+
+    def discard_changes(self):
+        """
+        Drops the unsaved changes, the file is read again on the next `open`.
+        """
+        self.file_state = None
+        self.path = None
+        self.dirty = False
+
+    def put_boundary_condition(self, nodes: np.ndarray, value):
+        self.boundary_conditions[nodes.tobytes()] = (nodes, value)
+
+    def set_boundary_condition(self, node_ids, value):
+        """
+        Sets the value for the node set (replaces the value if the same node set already has one).
+        Nodes of the set are removed from the other node sets, the sets left empty are dropped.
+
+        Returns:
+            list: Pairs (node array, previous value) of the nodes that had the value in the other node sets
+                  (or in the same node set) and got the new one.
+        """
+        nodes = self.normalize_nodes(node_ids)
+        if nodes.size == 0:
+            return []
+
+        key = nodes.tobytes()
+        entry = self.boundary_conditions.get(key)
+        if entry is not None and entry[1] == value:
+            return []
+
+        reassigned = [entry] if entry is not None else []
+        for other_key, (other_nodes, other_value) in list(self.boundary_conditions.items()):
+            if other_key == key or other_nodes[-1] < nodes[0] or other_nodes[0] > nodes[-1]:
+                continue
+            taken = np.isin(other_nodes, nodes, assume_unique=True)
+            if not taken.any():
+                continue
+            reassigned.append((other_nodes[taken], other_value))
+            del self.boundary_conditions[other_key]
+            rest = other_nodes[~taken]
+            if rest.size:
+                self.put_boundary_condition(rest, other_value)
+
+        self.put_boundary_condition(nodes, value)
+        self.dirty = True
+        return reassigned
+
+    def get_boundary_conditions(self) -> list:
+        """
+        Returns:
+            list: Pairs (sorted node array, value).
+        """
+        return list(self.boundary_conditions.values())
+
+    def to_dict(self) -> dict:
+        data = dict(self.data)
+        if self.boundary_conditions:
+            data[CONFIG_BOUNDARY_CONDITIONS] = {self.encode_nodes(nodes): value
+                                                for nodes, value in self.boundary_conditions.values()}
+        return data
+
+    def flush(self):
+        """
+        Writes the document if it has unsaved changes.
+
+        Raises:
+            OSError: If the file can't be written.
+        """
+        if not self.dirty:
+            return
+
+        with open(self.path, 'w') as file:
+            dump(self.to_dict(), file, indent=4)
+        self.file_state = self.get_file_state(self.path)
+        self.dirty = False
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups the changes: the document is flushed once when the outermost transaction ends.
+        If the transaction fails, its changes are discarded.
+        """
+        if self.transaction_depth == 0:
+            saved = (dict(self.data), dict(self.boundary_conditions), self.dirty)
+
+        self.transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.data, self.boundary_conditions, self.dirty = saved
+            raise
+
+        self.transaction_depth -= 1
+        if self.transaction_depth == 0:
+            self.flush()
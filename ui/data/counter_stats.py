@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class CounterStats:
+    """
+    Statistics of the per-triangle counters computed in a single pass and shared by all the consumers
+    (mesh visualizer, colorbar, etc.).
+
+    Attributes:
+        count (int): Number of the counters.
+        min (number): Minimal counter value (0 for the empty array).
+        max (number): Maximal counter value (0 for the empty array).
+        unique (np.ndarray): Sorted unique counter values.
+        frequencies (np.ndarray): Number of triangles with each of the unique values.
+    """
+
+    def __init__(self, counters):
+        counters = np.asarray(counters).reshape(-1)
+        self.count = counters.shape[0]
+        self.unique, self.frequencies = self.count_unique(counters)
+        self.min = self.unique[0] if self.unique.size else 0
+        self.max = self.unique[-1] if self.unique.size else 0
+        self._histograms = {}
+
+    @staticmethod
+    def count_unique(counters):
+        """
+        Counts the unique values. Non-negative integer counters with a modest range are counted with
+        np.bincount (linear time), everything else falls back to the sorting np.unique.
+
+        Returns:
+            tuple: (unique values, their frequencies).
+        """
+        if counters.size and np.issubdtype(counters.dtype, np.integer):
+            low, high = counters.min(), counters.max()
+            if low >= 0 and high <= 4 * counters.size:
+                bins = np.bincount(counters)
+                unique = np.flatnonzero(bins)
+                return unique.astype(counters.dtype), bins[unique]
+        return np.unique(counters, return_counts=True)
+
+    def histogram(self, bins=10):
+        """
+        Histogram of the counters over [min, max]. Built from the unique values and their frequencies,
+        so it doesn't touch the counters array again. Results are cached per bin count.
+
+        Args:
+            bins (int): Number of the bins.
+
+        Returns:
+            tuple: (hist, bin_edges) as returned by np.histogram.
+        """
+        if bins not in self._histograms:
+            self._histograms[bins] = np.histogram(self.unique, bins=bins, range=(self.min, self.max),
+                                                  weights=self.frequencies)
+        return self._histograms[bins]
+
+    def pick_uniformly(self, n):
+        """
+        Picks N evenly spaced unique values including the first and the last one.
+
+        Args:
+            n (int): Number of the values to pick.
+
+        Returns:
+            np.ndarray: Picked values.
+        """
+        if n >= self.unique.size:
+            return self.unique
+        return self.unique[np.round(np.linspace(0, self.unique.size - 1, n)).astype(int)]
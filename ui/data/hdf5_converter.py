@@ -0,0 +1,49 @@
+from os import replace
+from os.path import splitext
+from .hdf5handler import HDF5Handler, HDF5_LAYOUT_COLUMNAR
+
+
+def convert_legacy_hdf5(src_filename: str, dst_filename: str = None) -> str:
+    """
+    Migrates the result file from the legacy "Triangle_{id}" layout to the columnar one.
+
+    Args:
+        src_filename (str): Path to the legacy HDF5 file.
+        dst_filename (str, optional): Path to the output file. If not specified, the source file is replaced.
+
+    Returns:
+        str: Path to the file in the columnar layout.
+
+    Raises:
+        ValueError: If the source file isn't a valid HDF5 file.
+        RuntimeError: If the source file can't be read.
+    """
+    handler = HDF5Handler(src_filename)
+    try:
+        if handler.layout == HDF5_LAYOUT_COLUMNAR:
+            if dst_filename is None or dst_filename == src_filename:
+                return src_filename
+        mesh = handler.read_mesh_arrays()
+    finally:
+        handler.close()
+
+    if dst_filename is None or dst_filename == src_filename:
+        root, ext = splitext(src_filename)
+        tmp_filename = f"{root}.columnar{ext}"
+        HDF5Handler.write_mesh_arrays(tmp_filename, mesh)
+        replace(tmp_filename, src_filename)
+        return src_filename
+
+    HDF5Handler.write_mesh_arrays(dst_filename, mesh)
+    return dst_filename
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Converts legacy HDF5 mesh results (one group per triangle) to the columnar layout.")
+    parser.add_argument("src", help="Path to the legacy HDF5 file")
+    parser.add_argument("dst", nargs='?', default=None, help="Path to the output file (the source file is replaced if omitted)")
+    args = parser.parse_args()
+
+    print(f"Converted mesh is written to {convert_legacy_hdf5(args.src, args.dst)}")
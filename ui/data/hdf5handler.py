@@ -1,16 +1,36 @@
 import h5py
 import numpy as np
-from re import compile
+from os import stat
+from .mesh_data import MeshData
+
+HDF5_LAYOUT_LEGACY = 'legacy'        # One "Triangle_{id}" group per triangle
+HDF5_LAYOUT_COLUMNAR = 'columnar'    # Contiguous datasets in the "/mesh" group
+
+HDF5_LEGACY_GROUP_PREFIX = 'Triangle_'
+
+HDF5_MESH_GROUP = 'mesh'
+HDF5_MESH_COORDINATES = 'mesh/coordinates'
+HDF5_MESH_AREA = 'mesh/area'
+HDF5_MESH_COUNTER = 'mesh/counter'
+HDF5_MESH_ID = 'mesh/id'
+HDF5_MESH_GEOMETRY_HASH = 'geometry_hash'  # Attribute of the "/mesh" group written by the backend
+HDF5_MESH_COUNTER_SNAPSHOTS = 'mesh/counter_snapshots'  # Counters written periodically while the simulation is running
+HDF5_MESH_SNAPSHOT_TIME = 'mesh/snapshot_time'
+
+HDF5_DEFAULT_CHUNK_ROWS = 65536
+HDF5_DEFAULT_COMPRESSION_LEVEL = 4
 
 
 class HDF5Handler:
-    def __init__(self, filename, first_id=0):
+    def __init__(self, filename, first_id=0, swmr=False):
         """
         Initialize the HDF5Handler object.
 
         Args:
             filename (str): Path to the HDF5 file.
             first_id (int, optional): Starting ID for reading groups. Defaults to 0.
+            swmr (bool, optional): Open the file as a SWMR reader to follow the counter snapshots
+                                   while the simulation is still writing them. Defaults to False.
         """
         # Check if the file exists and is not empty
         if not h5py.is_hdf5(filename):
@@ -18,35 +38,77 @@ class HDF5Handler:
                 f"The file {filename} doesn't exist or is empty or isn't a hdf5 file.")
 
         self.filename = filename
-        self.file = h5py.File(filename, "r")
-        self.first_id = self.get_first_id_from_hdf5(self.filename) or first_id
+        self.swmr = swmr
+        self.file = h5py.File(filename, "r", libver='latest', swmr=True) if swmr else h5py.File(filename, "r")
+        self.layout = self.detect_layout()
+        self.build_group_index()
+        self.first_id = self.get_first_id_from_hdf5()
+        if self.first_id is None:
+            self.first_id = first_id
 
-    def get_first_id_from_hdf5(self, filename):
+    def detect_layout(self):
         """
-        Extracts the first ID from the HDF5 file based on the naming convention of groups.
-
-        Args:
-            filename (str): Path to the HDF5 file.
+        Detects which layout is used to store the mesh in the opened file.
 
         Returns:
-            int or None: The smallest ID found in the group names, or None if no ID is found.
+            str: HDF5_LAYOUT_COLUMNAR if the file has the "/mesh" datasets, otherwise HDF5_LAYOUT_LEGACY.
         """
-        with h5py.File(filename, "r") as file:
-            group_names = list(file.keys())
+        if HDF5_MESH_COORDINATES in self.file and HDF5_MESH_ID in self.file:
+            return HDF5_LAYOUT_COLUMNAR
+        return HDF5_LAYOUT_LEGACY
 
-            # Extract IDs using a regular expression
-            ids = []
-            pattern = compile(r"Triangle_(\d+)")
-            for name in group_names:
-                match = pattern.match(name)
-                if match:
-                    ids.append(int(match.group(1)))
+    def build_group_index(self):
+        """
+        Builds the index of the triangles stored in the file in a single pass over the root group.
 
-            # Returning the samllest ID of the triangle or None if no IDs found
-            return min(ids) if ids else None
+        Fills:
+            ids (np.ndarray): Sorted triangle IDs.
+            id_rows (np.ndarray): Dataset row of each triangle from `ids` (columnar layout only).
+            group_ids (dict): Group name -> triangle ID (legacy layout only, empty for the columnar one).
+            group_rows (dict): Group name -> row of the triangle in the sorted `ids` (legacy layout only).
+            group_names (list): Group names sorted by triangle ID (legacy layout only).
+        """
+        self.group_ids = {}
+        self.group_rows = {}
+        self.group_names = []
+        self.id_rows = None
+
+        if self.layout == HDF5_LAYOUT_COLUMNAR:
+            raw_ids = self.file[HDF5_MESH_ID][:].astype(np.int64)
+            self.id_rows = np.argsort(raw_ids, kind='stable')
+            self.ids = raw_ids[self.id_rows]
+            return
+
+        prefix_len = len(HDF5_LEGACY_GROUP_PREFIX)
+        for name in self.file:
+            if name.startswith(HDF5_LEGACY_GROUP_PREFIX) and name[prefix_len:].isdigit():
+                self.group_ids[name] = int(name[prefix_len:])
+
+        ids = np.fromiter(self.group_ids.values(), dtype=np.int64, count=len(self.group_ids))
+        order = np.argsort(ids, kind='stable')
+        self.ids = ids[order]
+
+        names = list(self.group_ids)
+        self.group_names = [names[index] for index in order.tolist()]
+        self.group_rows = {name: row for row, name in enumerate(self.group_names)}
+
+    def get_first_id_from_hdf5(self, filename=None):
+        """
+        Returns the first (smallest) triangle ID from the group index built on construction.
+
+        Args:
+            filename (str, optional): Kept for backward compatibility, the file isn't reopened.
+
+        Returns:
+            int or None: The smallest ID found in the file, or None if no ID is found.
+        """
+        return int(self.ids[0]) if self.ids.size else None
 
     def __del__(self):
-        if hasattr(self, 'file'):  # Check if self.file exists before attempting to close it
+        self.close()
+
+    def close(self):
+        if hasattr(self, 'file') and self.file:  # Check if self.file exists before attempting to close it
             self.file.close()
 
     def read_dataset(self, group_name, dataset_name):
@@ -69,6 +131,253 @@ class HDF5Handler:
         except Exception as e:
             raise RuntimeError(f"Failed to open dataset {dataset_name} in group: {group_name}") from e
 
+    def read_mesh_arrays(self):
+        """
+        Reads the whole mesh from the HDF5 file into contiguous NumPy arrays.
+        Both columnar and legacy layouts are supported.
+
+        Returns:
+            MeshData: IDs, coordinates (N, 3, 3), areas and counters sorted by triangle ID.
+
+        Raises:
+            RuntimeError: If the file contains missing or malformed datasets.
+        """
+        if self.layout == HDF5_LAYOUT_COLUMNAR:
+            return self.read_columnar_mesh()
+        return self.read_legacy_mesh()
+
+    def read_columnar_mesh(self):
+        """
+        Reads the mesh stored in the columnar layout: one read per "/mesh/*" dataset.
+
+        Returns:
+            MeshData: Mesh arrays sorted by triangle ID.
+        """
+        try:
+            mesh = MeshData(self.file[HDF5_MESH_ID][:],
+                            self.file[HDF5_MESH_COORDINATES][:],
+                            self.file[HDF5_MESH_AREA][:],
+                            self.file[HDF5_MESH_COUNTER][:])
+        except Exception as e:
+            raise RuntimeError(f"Failed to read mesh from the file {self.filename}") from e
+
+        mesh.sort_by_id()
+        return mesh
+
+    def read_legacy_mesh(self):
+        """
+        Reads the mesh stored in the legacy layout with one "Triangle_{id}" group per triangle.
+
+        All the groups are walked once with `visititems`, every dataset is read directly
+        into the row of the preallocated output arrays taken from the group index, so no
+        Python objects are built per triangle and IDs may contain gaps.
+
+        Returns:
+            MeshData: Mesh arrays sorted by triangle ID.
+        """
+        num_objs = self.ids.shape[0]
+        coordinates = np.empty((num_objs, 9), dtype=np.float64)
+        areas = np.empty(num_objs, dtype=np.float64)
+        counters = np.empty(num_objs, dtype=np.int32)
+        filled = np.zeros((num_objs, 3), dtype=bool)
+        rows = self.group_rows
+
+        def visitor(name, obj):
+            group_name, _, dataset_name = name.partition('/')
+            if not dataset_name:
+                return None
+
+            row = rows.get(group_name)
+            if row is None:
+                return None
+
+            if dataset_name == "Coordinates":
+                obj.read_direct(coordinates, dest_sel=np.s_[row])
+                filled[row, 0] = True
+            elif dataset_name == "Area":
+                obj.read_direct(areas, source_sel=np.s_[0:1], dest_sel=np.s_[row:row + 1])
+                filled[row, 1] = True
+            elif dataset_name == "Counter":
+                obj.read_direct(counters, source_sel=np.s_[0:1], dest_sel=np.s_[row:row + 1])
+                filled[row, 2] = True
+            return None
+
+        try:
+            self.file.visititems(visitor)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read mesh from the file {self.filename}") from e
+
+        if not filled.all():
+            missing = np.flatnonzero(~filled.all(axis=1))
+            raise RuntimeError(f"{HDF5_LEGACY_GROUP_PREFIX}{self.ids[missing[0]]} in the file {self.filename} doesn't contain all the required datasets")
+
+        return MeshData(self.ids, coordinates, areas, counters)
+
+    def get_dataset_rows(self, start, stop):
+        """
+        Maps the range of the sorted rows to the rows of the columnar datasets.
+
+        Returns:
+            tuple: (selection, order) - selection to read from the datasets (slice or increasing index array)
+                   and the permutation that restores ascending order of IDs (None if not needed).
+        """
+        rows = self.id_rows[start:stop]
+        if rows.size and (np.diff(rows) == 1).all():
+            return np.s_[int(rows[0]):int(rows[-1]) + 1], None
+
+        order = np.argsort(rows, kind='stable')
+        return rows[order], np.argsort(order, kind='stable')
+
+    def read_rows(self, start, stop):
+        """
+        Reads only the triangles with the rows [start, stop) of the sorted ID index.
+
+        Args:
+            start (int): First row (inclusive).
+            stop (int): Last row (exclusive).
+
+        Returns:
+            MeshData: Mesh arrays of the requested triangles sorted by ID.
+        """
+        start, stop = max(0, start), min(stop, self.ids.shape[0])
+        if stop <= start:
+            return MeshData.concatenate([])
+
+        if self.layout == HDF5_LAYOUT_COLUMNAR:
+            selection, order = self.get_dataset_rows(start, stop)
+            try:
+                coordinates = self.file[HDF5_MESH_COORDINATES][selection]
+                areas = self.file[HDF5_MESH_AREA][selection]
+                counters = self.file[HDF5_MESH_COUNTER][selection]
+            except Exception as e:
+                raise RuntimeError(f"Failed to read rows [{start}, {stop}) from the file {self.filename}") from e
+            if order is not None:
+                coordinates, areas, counters = coordinates[order], areas[order], counters[order]
+            return MeshData(self.ids[start:stop], coordinates, areas, counters)
+
+        count = stop - start
+        coordinates = np.empty((count, 9), dtype=np.float64)
+        areas = np.empty(count, dtype=np.float64)
+        counters = np.empty(count, dtype=np.int32)
+        for row, group_name in enumerate(self.group_names[start:stop]):
+            group = self.file[group_name]
+            group["Coordinates"].read_direct(coordinates, dest_sel=np.s_[row])
+            group["Area"].read_direct(areas, source_sel=np.s_[0:1], dest_sel=np.s_[row:row + 1])
+            group["Counter"].read_direct(counters, source_sel=np.s_[0:1], dest_sel=np.s_[row:row + 1])
+        return MeshData(self.ids[start:stop], coordinates, areas, counters)
+
+    def read_counters(self, start, stop):
+        """
+        Reads only the counters of the triangles with the rows [start, stop) of the sorted ID index.
+
+        Returns:
+            np.ndarray: Counters sorted by triangle ID.
+        """
+        start, stop = max(0, start), min(stop, self.ids.shape[0])
+        if stop <= start:
+            return np.empty(0, dtype=np.int32)
+
+        if self.layout == HDF5_LAYOUT_COLUMNAR:
+            selection, order = self.get_dataset_rows(start, stop)
+            counters = self.file[HDF5_MESH_COUNTER][selection]
+            return counters if order is None else counters[order]
+
+        counters = np.empty(stop - start, dtype=np.int32)
+        for row, group_name in enumerate(self.group_names[start:stop]):
+            self.file[group_name]["Counter"].read_direct(counters, source_sel=np.s_[0:1], dest_sel=np.s_[row:row + 1])
+        return counters
+
+    def geometry_hash(self):
+        """
+        Returns:
+            int or None: Hash of the triangle IDs and coordinates written by the backend, None if the file has no hash.
+        """
+        if self.layout != HDF5_LAYOUT_COLUMNAR:
+            return None
+        geometry_hash = self.file[HDF5_MESH_GROUP].attrs.get(HDF5_MESH_GEOMETRY_HASH)
+        return None if geometry_hash is None else int(geometry_hash)
+
+    def rows_of_ids(self, ids):
+        """
+        Maps the triangle IDs to the rows of the columnar datasets.
+
+        Args:
+            ids (np.ndarray): Triangle IDs that are present in the file.
+
+        Returns:
+            np.ndarray: Dataset row of each ID.
+        """
+        positions = np.searchsorted(self.ids, ids)
+        return positions if self.id_rows is None else self.id_rows[positions]
+
+    @staticmethod
+    def probe_file_state(filename):
+        """
+        Reads the state of the result file without indexing it, so the file of the new run can be told
+        from the stale one of the previous run (their modification times may be equal on the coarse filesystems).
+
+        Returns:
+            tuple or None: (signature, has counter snapshots), the signature is (mtime in ns, size, geometry hash).
+                           None if the file doesn't exist.
+        """
+        try:
+            file_stat = stat(filename)
+        except OSError:
+            return None
+
+        geometry_hash, has_snapshots = None, False
+        try:
+            with h5py.File(filename, "r", libver='latest', swmr=True) as file:
+                if HDF5_MESH_GROUP in file:
+                    geometry_hash = file[HDF5_MESH_GROUP].attrs.get(HDF5_MESH_GEOMETRY_HASH)
+                    geometry_hash = None if geometry_hash is None else int(geometry_hash)
+                has_snapshots = HDF5_MESH_COUNTER_SNAPSHOTS in file
+        except OSError:
+            pass  # File is being created by the simulation or isn't a hdf5 file
+        return (file_stat.st_mtime_ns, file_stat.st_size, geometry_hash), has_snapshots
+
+    def has_counter_snapshots(self):
+        return HDF5_MESH_COUNTER_SNAPSHOTS in self.file and HDF5_MESH_SNAPSHOT_TIME in self.file
+
+    def read_latest_counter_snapshot(self, known_count=0):
+        """
+        Reads the latest counter snapshot written by the running simulation.
+
+        Args:
+            known_count (int, optional): Count of the snapshots that have already been read.
+
+        Returns:
+            tuple or None: (count, time, counters) - count of the snapshots, time of the latest one and its
+                           counters in the order of the dataset rows. None if there are no new snapshots.
+        """
+        if not self.has_counter_snapshots():
+            return None
+
+        times = self.file[HDF5_MESH_SNAPSHOT_TIME]
+        snapshots = self.file[HDF5_MESH_COUNTER_SNAPSHOTS]
+        if self.swmr:
+            times.refresh()
+            snapshots.refresh()
+
+        # Counters are appended before the time, so the time dataset never runs ahead of them
+        count = min(times.shape[0], snapshots.shape[0])
+        if count <= known_count:
+            return None
+        return count, float(times[count - 1]), snapshots[count - 1]
+
+    def lazy_mesh(self, block_rows=HDF5_DEFAULT_CHUNK_ROWS):
+        """
+        Creates the lazy accessor that reads only requested slices of the triangles.
+
+        Args:
+            block_rows (int, optional): Count of triangles read at once while filtering.
+
+        Returns:
+            LazyMeshAccessor: Accessor bound to this handler.
+        """
+        from .lazy_mesh_accessor import LazyMeshAccessor
+        return LazyMeshAccessor(self, block_rows)
+
     def read_mesh_from_hdf5(self):
         """
         Reads mesh data from the HDF5 file, based on the group names following the pattern "Triangle_{id}".
@@ -76,21 +385,25 @@ class HDF5Handler:
         Returns:
             list of tuples: Each tuple contains the mesh data for a triangle.
         """
-        mesh = []
-        num_objs = len(self.file.keys())
-        last_id = self.first_id + num_objs
-
-        for id in range(self.first_id, last_id):
-            group_name = f"Triangle_{id}"
+        return self.read_mesh_arrays().to_tuples()
 
-            coordinates = self.read_dataset(group_name, "Coordinates").reshape(3, 3)
-            area = self.read_dataset(group_name, "Area")[0]
-            counter = self.read_dataset(group_name, "Counter")[0]
-
-            vertex1 = np.array(coordinates[0])
-            vertex2 = np.array(coordinates[1])
-            vertex3 = np.array(coordinates[2])
+    @staticmethod
+    def write_mesh_arrays(filename, mesh: MeshData):
+        """
+        Writes the mesh to a new HDF5 file in the columnar layout.
 
-            mesh.append((id, vertex1, vertex2, vertex3, area, counter))
+        Args:
+            filename (str): Path to the output HDF5 file. Existing file will be overwritten.
+            mesh (MeshData): Mesh arrays to write.
+        """
+        rows = len(mesh)
+        chunk_rows = max(1, min(rows, HDF5_DEFAULT_CHUNK_ROWS))
+        options = dict(compression='gzip', compression_opts=HDF5_DEFAULT_COMPRESSION_LEVEL, shuffle=True)
 
-        return mesh
+        with h5py.File(filename, "w") as file:
+            file.create_group(HDF5_MESH_GROUP)
+            file.create_dataset(HDF5_MESH_COORDINATES, data=mesh.coordinates.reshape(rows, 9),
+                                chunks=(chunk_rows, 9), **options)
+            file.create_dataset(HDF5_MESH_AREA, data=mesh.areas, chunks=(chunk_rows,), **options)
+            file.create_dataset(HDF5_MESH_COUNTER, data=mesh.counters.astype(np.int32), chunks=(chunk_rows,), **options)
+            file.create_dataset(HDF5_MESH_ID, data=mesh.ids.astype(np.uint64), chunks=(chunk_rows,), **options)
@@ -0,0 +1,126 @@
+import numpy as np
+from .mesh_data import MeshData
+
+
+class LazyMeshAccessor:
+    """
+    Reads the triangles from the result file only when they are asked for.
+
+    Nothing is materialized on construction: the accessor relies on the ID index of the
+    `HDF5Handler` and reads the datasets slice by slice (h5py dataset slicing for the columnar
+    layout, per-group reads for the legacy one). Filtering queries process the file in blocks
+    of `block_rows` triangles, so peak memory is bounded by one block plus the result.
+    """
+
+    def __init__(self, handler, block_rows: int):
+        self.handler = handler
+        self.block_rows = max(1, int(block_rows))
+
+    def __len__(self):
+        return self.handler.ids.shape[0]
+
+    def iter_blocks(self):
+        """
+        Yields the mesh block by block in ascending order of IDs.
+
+        Yields:
+            MeshData: At most `block_rows` triangles.
+        """
+        for start in range(0, len(self), self.block_rows):
+            yield self.handler.read_rows(start, start + self.block_rows)
+
+    def by_id_range(self, first_id: int, last_id: int) -> MeshData:
+        """
+        Reads the triangles with IDs from the range [first_id, last_id]. Gaps in the IDs are allowed.
+
+        Returns:
+            MeshData: Triangles sorted by ID.
+        """
+        start = int(np.searchsorted(self.handler.ids, first_id, side='left'))
+        stop = int(np.searchsorted(self.handler.ids, last_id, side='right'))
+        return self.handler.read_rows(start, stop)
+
+    def by_bounding_box(self, min_point, max_point) -> MeshData:
+        """
+        Reads the triangles whose bounding boxes intersect the axis-aligned box [min_point, max_point].
+
+        Returns:
+            MeshData: Triangles sorted by ID.
+        """
+        min_point = np.asarray(min_point, dtype=np.float64)
+        max_point = np.asarray(max_point, dtype=np.float64)
+
+        def select(block):
+            return ((block.coordinates.min(axis=1) <= max_point) & (block.coordinates.max(axis=1) >= min_point)).all(axis=1)
+
+        return self.filter_blocks(select)
+
+    def by_counter_threshold(self, min_count: int, max_rows: int = None) -> MeshData:
+        """
+        Reads the triangles with at least `min_count` settled particles.
+        Counters are scanned first, coordinates are read only for the blocks that have matches.
+
+        Args:
+            min_count (int): Least count of the settled particles.
+            max_rows (int, optional): Reading stops after so many triangles (the ones with the lower IDs are kept).
+
+        Returns:
+            MeshData: Triangles sorted by ID.
+        """
+        parts, count = [], 0
+        for start in range(0, len(self), self.block_rows):
+            if max_rows is not None and count >= max_rows:
+                break
+
+            stop = start + self.block_rows
+            rows = np.flatnonzero(self.handler.read_counters(start, stop) >= min_count)
+            if max_rows is not None:
+                rows = rows[:max_rows - count]
+            if rows.size == 0:
+                continue
+
+            block = self.handler.read_rows(start + int(rows[0]), start + int(rows[-1]) + 1)
+            parts.append(block.take(rows - rows[0]))
+            count += rows.size
+        return MeshData.concatenate(parts)
+
+    def counter_threshold(self, max_rows: int):
+        """
+        Finds the least count of the settled particles that at most about `max_rows` triangles reach.
+        Only the counters are read, the largest `max_rows` of them are kept while scanning the blocks.
+        Triangles with the same counter may still exceed `max_rows`, see `by_counter_threshold`.
+
+        Returns:
+            tuple: (threshold, count of the triangles with at least one settled particle).
+        """
+        largest = np.empty(0, dtype=np.int64)
+        settled_count = 0
+        for start in range(0, len(self), self.block_rows):
+            counters = self.handler.read_counters(start, start + self.block_rows)
+            counters = counters[counters >= 1].astype(np.int64)
+            settled_count += counters.size
+
+            largest = np.concatenate((largest, counters))
+            if largest.size > max_rows:
+                largest = np.partition(largest, largest.size - max_rows)[-max_rows:]
+
+        if settled_count <= max_rows or max_rows <= 0:
+            return 1, settled_count
+        return int(largest.min()), settled_count
+
+    def filter_blocks(self, select) -> MeshData:
+        """
+        Applies the vectorized predicate to each block and collects only the matching triangles.
+
+        Args:
+            select (callable): Takes MeshData block and returns boolean mask of the triangles to keep.
+
+        Returns:
+            MeshData: Matching triangles sorted by ID.
+        """
+        parts = []
+        for block in self.iter_blocks():
+            mask = select(block)
+            if mask.any():
+                parts.append(block.take(mask))
+        return MeshData.concatenate(parts)
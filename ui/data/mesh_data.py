@@ -0,0 +1,84 @@
+import numpy as np
+from .counter_stats import CounterStats
+
+
+class MeshData:
+    """
+    Contiguous, array-backed representation of the triangle mesh results.
+
+    Attributes:
+        ids (np.ndarray): Triangle IDs, shape (N,).
+        coordinates (np.ndarray): Triangle vertices, shape (N, 3, 3) - [triangle, vertex, xyz].
+        areas (np.ndarray): Triangle areas, shape (N,).
+        counters (np.ndarray): Count of the settled particles on each triangle, shape (N,).
+    """
+
+    def __init__(self, ids, coordinates, areas, counters):
+        self.ids = np.ascontiguousarray(ids, dtype=np.int64)
+        self.coordinates = np.ascontiguousarray(coordinates, dtype=np.float64).reshape(-1, 3, 3)
+        self.areas = np.ascontiguousarray(areas, dtype=np.float64)
+        self.counters = np.ascontiguousarray(counters)
+        self._counter_stats = None
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    def sort_by_id(self):
+        """
+        Reorders all the arrays in place so that triangles go in ascending order of their IDs.
+        """
+        order = np.argsort(self.ids, kind='stable')
+        self.ids = self.ids[order]
+        self.coordinates = self.coordinates[order]
+        self.areas = self.areas[order]
+        self.counters = self.counters[order]
+
+    def set_counters(self, counters):
+        """
+        Replaces the counters (e.g. with the newer snapshot) and drops the cached statistics.
+        """
+        self.counters = np.ascontiguousarray(counters)
+        self._counter_stats = None
+
+    def counter_stats(self):
+        """
+        Returns the statistics of the counters. They are computed once on the first call and then shared.
+
+        Returns:
+            CounterStats: Min, max, unique values and histogram of the counters.
+        """
+        if self._counter_stats is None:
+            self._counter_stats = CounterStats(self.counters)
+        return self._counter_stats
+
+    def take(self, selection):
+        """
+        Returns the new mesh with only the selected triangles.
+
+        Args:
+            selection (np.ndarray or slice): Boolean mask, indices or slice of the triangles.
+        """
+        return MeshData(self.ids[selection], self.coordinates[selection],
+                        self.areas[selection], self.counters[selection])
+
+    @staticmethod
+    def concatenate(parts):
+        """
+        Joins several meshes into one. Returns an empty mesh if there is nothing to join.
+        """
+        if not parts:
+            return MeshData(np.empty(0, dtype=np.int64), np.empty((0, 3, 3)), np.empty(0), np.empty(0, dtype=np.int32))
+        return MeshData(np.concatenate([part.ids for part in parts]),
+                        np.concatenate([part.coordinates for part in parts]),
+                        np.concatenate([part.areas for part in parts]),
+                        np.concatenate([part.counters for part in parts]))
+
+    def to_tuples(self):
+        """
+        Converts the arrays into the legacy list-of-tuples representation.
+
+        Returns:
+            list of tuples: (id, vertex1, vertex2, vertex3, area, counter) for each triangle.
+        """
+        return [(int(id), coords[0], coords[1], coords[2], area, counter)
+                for id, coords, area, counter in zip(self.ids, self.coordinates, self.areas, self.counters)]
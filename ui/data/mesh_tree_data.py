@@ -0,0 +1,345 @@
+import numpy as np
+from collections.abc import Mapping, Sequence
+
+
+MESH_TREE_OBJECT_TYPES = ('point', 'line', 'surface', 'volume')
+
+
+class MeshTreeData:
+    """
+    Array-backed representation of the mesh shown in the mesh tree of the graphical editor.
+
+    All the elements refer to the nodes by their rows in the shared node arrays, which are sorted by tag,
+    so tags are mapped to rows with `np.searchsorted`.
+
+    Attributes:
+        obj_type (str): Type of the object - 'point', 'line', 'surface' or 'volume'.
+        node_tags (np.ndarray): Sorted unique node tags, shape (M,).
+        node_coords (np.ndarray): Node coordinates in the order of `node_tags`, shape (M, 3).
+        volumes (dict): Volume tag -> list of its surface tags. Without volumes, each surface is its own volume.
+        surfaces (dict): Surface tag -> (triangle tags of shape (K,), node rows of the triangles of shape (K, 3)).
+        line_tags (np.ndarray): Tags of the line elements, shape (L,).
+        lines (np.ndarray): Node rows of the line elements, shape (L, 2).
+    """
+
+    def __init__(self, obj_type, node_tags, node_coords):
+        if obj_type not in MESH_TREE_OBJECT_TYPES:
+            raise ValueError(f"Invalid obj_type. Must be one of {', '.join(map(repr, MESH_TREE_OBJECT_TYPES))}.")
+
+        node_tags = np.asarray(node_tags, dtype=np.uint64)
+        node_coords = np.asarray(node_coords, dtype=np.float64).reshape(-1, 3)
+        self.node_tags, first = np.unique(node_tags, return_index=True)
+        self.node_coords = np.ascontiguousarray(node_coords[first])
+
+        self.obj_type = obj_type
+        self.volumes = {}
+        self.surfaces = {}
+        self.line_tags = np.empty(0, dtype=np.uint64)
+        self.lines = np.empty((0, 2), dtype=np.int64)
+        self._node_index = None
+
+    @staticmethod
+    def from_tree_dict(treedict, obj_type):
+        """
+        Converts the tree dict into the arrays. `MeshTreeDict` is unwrapped without copying,
+        a plain dict in the legacy format is walked once.
+
+        Args:
+            treedict (dict): Tree dict of the `obj_type` layout (see `MeshTreeDict`).
+            obj_type (str): Type of the object - 'point', 'line', 'surface' or 'volume'.
+
+        Returns:
+            MeshTreeData: Array-backed mesh data.
+        """
+        if isinstance(treedict, MeshTreeDict):
+            return treedict.mesh_tree
+
+        node_tags, node_coords = [], []
+        def add_nodes(nodes):
+            for node_tag, coords in nodes:
+                node_tags.append(node_tag)
+                node_coords.append(coords)
+
+        if obj_type == 'point':
+            for key, coords in treedict.items():
+                add_nodes([(MeshTreeDict.parse_key(key, 'Point'), coords)])
+            return MeshTreeData(obj_type, node_tags, node_coords)
+
+        if obj_type == 'line':
+            line_tags, line_node_tags = [], []
+            for key, nodes in treedict.items():
+                add_nodes(nodes)
+                line_tags.append(MeshTreeDict.parse_key(key, 'Line'))
+                line_node_tags.append([node_tag for node_tag, _ in nodes[:2]])
+            mesh_tree = MeshTreeData(obj_type, node_tags, node_coords)
+            mesh_tree.set_lines(line_tags, np.array(line_node_tags, dtype=np.uint64).reshape(-1, 2))
+            return mesh_tree
+
+        volumes = treedict if obj_type == 'volume' else {tag: {tag: triangles} for tag, triangles in treedict.items()}
+        surfaces = {}
+        for volume_tag, surface_map in volumes.items():
+            for surface_tag, triangles in surface_map.items():
+                triangle_tags, triangle_node_tags = [], []
+                for triangle_tag, nodes in triangles:
+                    add_nodes(nodes)
+                    triangle_tags.append(triangle_tag)
+                    triangle_node_tags.extend(node_tag for node_tag, _ in nodes)
+                surfaces[surface_tag] = (triangle_tags, triangle_node_tags)
+
+        mesh_tree = MeshTreeData(obj_type, node_tags, node_coords)
+        mesh_tree.volumes = {volume_tag: list(surface_map) for volume_tag, surface_map in volumes.items()}
+        for surface_tag, (triangle_tags, triangle_node_tags) in surfaces.items():
+            mesh_tree.add_surface(surface_tag, triangle_tags, triangle_node_tags)
+        return mesh_tree
+
+    def node_rows(self, tags):
+        """
+        Maps node tags to the rows of the node arrays.
+
+        Args:
+            tags (array-like): Node tags of any shape.
+
+        Returns:
+            np.ndarray: Rows of the same shape as `tags`.
+
+        Raises:
+            KeyError: If some of the tags are not present in the mesh.
+        """
+        tags = np.asarray(tags, dtype=np.uint64)
+        flat_tags = tags.reshape(-1)
+        rows = np.searchsorted(self.node_tags, flat_tags)
+        found = rows < len(self.node_tags)
+        found[found] = self.node_tags[rows[found]] == flat_tags[found]
+        if not found.all():
+            raise KeyError(f"Unknown node tag {flat_tags[~found][0]}")
+        return rows.reshape(tags.shape)
+
+    def add_surface(self, surface_tag, triangle_tags, triangle_node_tags):
+        """
+        Args:
+            surface_tag (int): Tag of the surface entity.
+            triangle_tags (array-like): Tags of the triangles, shape (K,).
+            triangle_node_tags (array-like): Node tags of the triangles, flat or of shape (K, 3).
+        """
+        triangle_tags = np.asarray(triangle_tags, dtype=np.uint64)
+        self.surfaces[surface_tag] = (triangle_tags, self.node_rows(triangle_node_tags).reshape(-1, 3))
+
+    def set_lines(self, line_tags, line_node_tags):
+        """
+        Args:
+            line_tags (array-like): Tags of the line elements, shape (L,).
+            line_node_tags (array-like): Node tags of the line elements, flat or of shape (L, 2).
+        """
+        self.line_tags = np.asarray(line_tags, dtype=np.uint64)
+        self.lines = self.node_rows(line_node_tags).reshape(-1, 2)
+
+    def surface_tags(self):
+        """
+        Returns:
+            list: Surface tags in the order of the volumes, i.e. in the order of the created surface actors.
+        """
+        return [surface_tag for surfaces in self.volumes.values() for surface_tag in surfaces]
+
+    def surface_node_tags(self, surface_tag):
+        """
+        Returns:
+            np.ndarray: Sorted unique tags of the nodes of the surface triangles.
+        """
+        return self.node_index().surface_nodes(surface_tag)
+
+    def node_index(self):
+        """
+        Returns:
+            MeshNodeIndex: Surface <-> node index, built on the first call.
+        """
+        if self._node_index is None:
+            self._node_index = MeshNodeIndex(self)
+        return self._node_index
+
+    def surface_arrays(self, surface_tag):
+        """
+        Returns the surface as the standalone arrays with only its own nodes, ready for the polydata.
+
+        Returns:
+            tuple: (points, triangles) - coordinates of shape (K, 3) and local point indices of shape (N, 3).
+        """
+        _, triangles = self.surfaces[surface_tag]
+        used_rows, local_rows = np.unique(triangles.reshape(-1), return_inverse=True)
+        return self.node_coords[used_rows], local_rows.reshape(-1, 3)
+
+    def node_entry(self, row):
+        """
+        Returns the node in the legacy tree dict format: (node tag, (x, y, z)).
+        """
+        return int(self.node_tags[row]), tuple(self.node_coords[row].tolist())
+
+    def tree_dict(self):
+        """
+        Returns:
+            MeshTreeDict: Lazy view of the mesh in the legacy nested dict format.
+        """
+        return MeshTreeDict(self)
+
+
+class MeshNodeIndex:
+    """
+    Index between the surfaces and their nodes, built in one pass over the triangles.
+
+    Nodes of each surface are kept as the sorted unique array. The reverse direction is stored in the
+    CSR form: surfaces of the node row `r` are `node_surfaces[node_offsets[r]:node_offsets[r + 1]]`.
+    """
+
+    def __init__(self, mesh_tree: MeshTreeData):
+        self.mesh_tree = mesh_tree
+        self.surface_node_rows = {}
+
+        surface_tags, node_rows = [], []
+        for surface_tag, (_, triangles) in mesh_tree.surfaces.items():
+            rows = np.unique(triangles)
+            self.surface_node_rows[surface_tag] = rows
+            surface_tags.append(np.full(len(rows), surface_tag, dtype=np.int64))
+            node_rows.append(rows)
+
+        node_rows = np.concatenate(node_rows) if node_rows else np.empty(0, dtype=np.int64)
+        surface_tags = np.concatenate(surface_tags) if surface_tags else np.empty(0, dtype=np.int64)
+        order = np.argsort(node_rows, kind='stable')
+        self.node_surfaces = surface_tags[order]
+        self.node_offsets = np.zeros(len(mesh_tree.node_tags) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(node_rows, minlength=len(mesh_tree.node_tags)), out=self.node_offsets[1:])
+
+    def surface_nodes(self, surface_tag):
+        """
+        Returns:
+            np.ndarray: Sorted unique tags of the nodes of the surface.
+        """
+        return self.mesh_tree.node_tags[self.surface_node_rows[surface_tag]]
+
+    def node_surfaces_of(self, node_tag):
+        """
+        Returns:
+            np.ndarray: Tags of the surfaces containing the node, empty if the node is unknown.
+        """
+        try:
+            row = int(self.mesh_tree.node_rows(node_tag))
+        except KeyError:
+            return self.node_surfaces[:0]
+        return self.node_surfaces[self.node_offsets[row]:self.node_offsets[row + 1]]
+
+
+class TriangleListView(Sequence):
+    """
+    Lazy list of the surface triangles in the legacy format: (triangle tag, [(node tag, (x, y, z)) * 3]).
+    """
+
+    def __init__(self, mesh_tree: MeshTreeData, surface_tag):
+        self.mesh_tree = mesh_tree
+        self.triangle_tags, self.triangles = mesh_tree.surfaces[surface_tag]
+
+    def __len__(self):
+        return len(self.triangle_tags)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return int(self.triangle_tags[index]), [self.mesh_tree.node_entry(row) for row in self.triangles[index]]
+
+
+class SurfaceMapView(Mapping):
+    """
+    Lazy dict of the surfaces of one volume: surface tag -> TriangleListView.
+    """
+
+    def __init__(self, mesh_tree: MeshTreeData, surface_tags):
+        self.mesh_tree = mesh_tree
+        self.surface_tags = list(surface_tags)
+
+    def __getitem__(self, surface_tag):
+        if surface_tag not in self.surface_tags:
+            raise KeyError(surface_tag)
+        return TriangleListView(self.mesh_tree, surface_tag)
+
+    def __iter__(self):
+        return iter(self.surface_tags)
+
+    def __len__(self):
+        return len(self.surface_tags)
+
+
+class MeshTreeDict(Mapping):
+    """
+    Read-only adapter presenting `MeshTreeData` as the legacy tree dict for the code that still expects it:
+
+    - 'volume':  {volume tag: {surface tag: [(triangle tag, [(node tag, (x, y, z)) * 3]), ...]}}
+    - 'surface': {surface tag: [(triangle tag, [(node tag, (x, y, z)) * 3]), ...]}
+    - 'line':    {'Line[<tag>]': [(node tag, (x, y, z)) * 2]}
+    - 'point':   {'Point[<tag>]': (x, y, z)}
+
+    Values are generated on access, nothing is materialized up front. The underlying arrays are available
+    as the `mesh_tree` attribute.
+    """
+
+    def __init__(self, mesh_tree: MeshTreeData):
+        self.mesh_tree = mesh_tree
+        self._line_rows = None
+
+    def line_rows(self):
+        # Built on the first access by the line key only
+        if self._line_rows is None:
+            self._line_rows = {int(tag): row for row, tag in enumerate(self.mesh_tree.line_tags)}
+        return self._line_rows
+
+    @staticmethod
+    def parse_key(key, prefix):
+        if not isinstance(key, str) or not key.startswith(f'{prefix}[') or not key.endswith(']'):
+            raise KeyError(key)
+        try:
+            return int(key[len(prefix) + 1:-1])
+        except ValueError:
+            raise KeyError(key)
+
+    def __getitem__(self, key):
+        mesh_tree = self.mesh_tree
+        if mesh_tree.obj_type == 'volume':
+            return SurfaceMapView(mesh_tree, mesh_tree.volumes[key])
+        if mesh_tree.obj_type == 'surface':
+            if key not in mesh_tree.surfaces:
+                raise KeyError(key)
+            return TriangleListView(mesh_tree, key)
+        if mesh_tree.obj_type == 'line':
+            row = self.line_rows().get(self.parse_key(key, 'Line'))
+            if row is None:
+                raise KeyError(key)
+            return [mesh_tree.node_entry(node_row) for node_row in mesh_tree.lines[row]]
+
+        tag = self.parse_key(key, 'Point')
+        row = np.searchsorted(mesh_tree.node_tags, tag)
+        if row == len(mesh_tree.node_tags) or mesh_tree.node_tags[row] != tag:
+            raise KeyError(key)
+        return mesh_tree.node_entry(row)[1]
+
+    def __iter__(self):
+        mesh_tree = self.mesh_tree
+        if mesh_tree.obj_type == 'volume':
+            return iter(mesh_tree.volumes)
+        if mesh_tree.obj_type == 'surface':
+            return iter(mesh_tree.surfaces)
+        if mesh_tree.obj_type == 'line':
+            return (f'Line[{tag}]' for tag in mesh_tree.line_tags)
+        return (f'Point[{tag}]' for tag in mesh_tree.node_tags)
+
+    def __len__(self):
+        mesh_tree = self.mesh_tree
+        if mesh_tree.obj_type == 'volume':
+            return len(mesh_tree.volumes)
+        if mesh_tree.obj_type == 'surface':
+            return len(mesh_tree.surfaces)
+        if mesh_tree.obj_type == 'line':
+            return len(mesh_tree.line_tags)
+        return len(mesh_tree.node_tags)
+
+    # Comparing by content would materialize the whole mesh
+    def __eq__(self, other):
+        return isinstance(other, MeshTreeDict) and other.mesh_tree is self.mesh_tree
+
+    def __hash__(self):
+        return id(self.mesh_tree)
@@ -0,0 +1,179 @@
+import numpy as np
+
+
+TRAJECTORIES_PARTICLE_ID = 'trajectories/particle_id'
+TRAJECTORIES_OFFSETS = 'trajectories/offsets'
+TRAJECTORIES_POSITIONS = 'trajectories/positions'
+
+
+class TrajectoryData:
+    """
+    Ragged, array-backed representation of the particle trajectories.
+
+    Positions of the particle `i` are rows [offsets[i], offsets[i + 1]) of the `positions` array.
+
+    Attributes:
+        particle_ids (np.ndarray): Particle IDs, shape (P,).
+        offsets (np.ndarray): Offsets of the trajectories, shape (P + 1,).
+        positions (np.ndarray): Positions of all the trajectories one after another, shape (N, 3), float32.
+    """
+
+    def __init__(self, particle_ids, offsets, positions):
+        self.particle_ids = np.ascontiguousarray(particle_ids, dtype=np.int64)
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        self.positions = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3)
+
+        if self.offsets.shape[0] != self.particle_ids.shape[0] + 1:
+            raise ValueError(f"Expected {self.particle_ids.shape[0] + 1} offsets, got {self.offsets.shape[0]}")
+
+    def __len__(self):
+        return self.particle_ids.shape[0]
+
+    def lengths(self):
+        """
+        Returns:
+            np.ndarray: Count of the positions in each trajectory, shape (P,).
+        """
+        return np.diff(self.offsets)
+
+    def max_length(self):
+        """
+        Returns:
+            int: Count of the positions in the longest trajectory (0 if there are no trajectories).
+        """
+        return int(self.lengths().max()) if len(self) else 0
+
+    def trajectory(self, index):
+        """
+        Returns the positions of the particle with the specified index (not ID) as a view, shape (T, 3).
+        """
+        return self.positions[self.offsets[index]:self.offsets[index + 1]]
+
+    def step_positions(self, time_step):
+        """
+        Returns the positions of all the particles at the beginning of the time step and their displacements
+        over this step. Particles whose trajectory ended stay at their last position (zero displacement).
+
+        Args:
+            time_step (int): Index of the time step.
+
+        Returns:
+            tuple: (start, delta) - np.ndarray, both of shape (P, 3), float32.
+        """
+        last = self.offsets[1:] - 1
+        first = np.minimum(self.offsets[:-1] + time_step, last)
+        start = self.positions[first]
+        delta = self.positions[np.minimum(first + 1, last)] - start
+        return start, delta
+
+    def interpolate(self, time_step, t, out=None, step=None):
+        """
+        Computes positions of all the particles between time steps `time_step` and `time_step + 1`
+        with a single linear interpolation over the whole arrays.
+
+        Args:
+            time_step (int): Index of the time step.
+            t (float): Interpolation factor in [0, 1].
+            out (np.ndarray, optional): Buffer of shape (P, 3), float32, to write the positions to.
+            step (tuple, optional): Result of `step_positions(time_step)` to avoid recomputing it every frame.
+
+        Returns:
+            np.ndarray: Positions of the particles, shape (P, 3).
+        """
+        start, delta = step if step is not None else self.step_positions(time_step)
+        if out is None:
+            out = np.empty_like(start)
+        np.multiply(delta, t, out=out, casting='unsafe')
+        np.add(out, start, out=out)
+        return out
+
+    def lod_subset(self, budget, grid_resolution=64, seed=0):
+        """
+        Selects a stable, density-aware subset of the particles for the level-of-detail rendering.
+
+        Start positions are binned into a uniform grid and each occupied cell keeps at most the same quota
+        of particles (the largest one that fits into the budget), so sparse regions stay visible while
+        dense clusters are thinned. Selection is random within the cell but seeded, so it's the same every time.
+
+        Args:
+            budget (int): Maximal count of the selected particles.
+            grid_resolution (int): Count of the grid cells along each axis.
+            seed (int): Seed of the random selection within the cells.
+
+        Returns:
+            np.ndarray: Sorted indices of the selected particles.
+        """
+        count = len(self)
+        if count <= budget:
+            return np.arange(count)
+
+        points = self.positions[self.offsets[:-1]]
+        low, high = points.min(axis=0), points.max(axis=0)
+        cells = ((points - low) / np.maximum(high - low, np.finfo(np.float32).tiny) * (grid_resolution - 1)).astype(np.int64)
+        cell_ids = (cells[:, 0] * grid_resolution + cells[:, 1]) * grid_resolution + cells[:, 2]
+
+        # Random order within each cell, rank of the particle in its cell
+        rng = np.random.default_rng(seed)
+        order = np.lexsort((rng.random(count), cell_ids))
+        sorted_cells = cell_ids[order]
+        starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+        counts = np.diff(np.r_[starts, count])
+        rank = np.arange(count) - np.repeat(starts, counts)
+
+        # The largest per-cell quota that fits into the budget
+        low_quota, high_quota = 0, int(counts.max())
+        while low_quota < high_quota:
+            quota = (low_quota + high_quota + 1) // 2
+            if np.minimum(counts, quota).sum() <= budget:
+                low_quota = quota
+            else:
+                high_quota = quota - 1
+
+        if low_quota == 0:
+            # More occupied cells than the budget: one random particle from the random cells
+            selected = order[rank == 0]
+            selected = selected[rng.permutation(selected.shape[0])[:budget]]
+        else:
+            selected = order[rank < low_quota]
+        return np.sort(selected)
+
+    @staticmethod
+    def from_hdf5(filename):
+        """
+        Reads the trajectories written by the backend. Each dataset is read with a single call.
+
+        Args:
+            filename (str): Path to the HDF5 file with the "trajectories" group.
+
+        Returns:
+            TrajectoryData: Read trajectories.
+
+        Raises:
+            KeyError: If some of the trajectory datasets are missing.
+        """
+        from h5py import File
+
+        with File(filename, 'r') as file:
+            return TrajectoryData(file[TRAJECTORIES_PARTICLE_ID][()],
+                                  file[TRAJECTORIES_OFFSETS][()],
+                                  file[TRAJECTORIES_POSITIONS][()])
+
+    @staticmethod
+    def from_json(filename):
+        """
+        Reads the legacy JSON trajectories: {"<particle ID>": [{"x": .., "y": .., "z": ..}, ...], ...}.
+        The file is streamed into the arrays without building the whole JSON document in memory.
+        Trajectories with less than 2 positions are skipped as the backend does.
+
+        Args:
+            filename (str): Path to the JSON file.
+
+        Returns:
+            TrajectoryData: Read trajectories.
+
+        Raises:
+            JSONDecodeError: If the file is not a valid JSON or has an unexpected structure.
+        """
+        from .trajectory_json_reader import TrajectoryJsonReader
+
+        return TrajectoryData(*TrajectoryJsonReader(filename).read())
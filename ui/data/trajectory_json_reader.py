@@ -0,0 +1,127 @@
+import numpy as np
+from json import JSONDecodeError
+from os.path import getsize
+from re import compile
+
+
+TRAJECTORY_JSON_CHUNK_SIZE = 1 << 20
+TRAJECTORY_JSON_BYTES_PER_POSITION = 96 # Approximate size of one pretty-printed position, used for the initial allocation
+TRAJECTORY_JSON_TOKEN_MARGIN = 64       # Tokens ending closer to the end of the chunk may be cut, so they are parsed with the next chunk
+
+TRAJECTORY_JSON_TOKEN_REGEX = compile(r'''\s*(?:([{}\[\]:,])|"((?:[^"\\]|\\.)*)"|(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|(true|false|null))''')
+TRAJECTORY_JSON_COORDINATES = {'x': 0, 'y': 1, 'z': 2}
+
+
+class TrajectoryJsonReader:
+    """
+    Streaming reader of the legacy JSON trajectories: {"<particle ID>": [{"x": .., "y": .., "z": ..}, ...], ...}.
+
+    The file is read in chunks and tokenized incrementally, positions are written straight into a float32
+    buffer, so the peak memory stays close to the size of the resulting arrays instead of the size of
+    the parsed JSON document.
+    """
+
+    def __init__(self, filename, chunk_size=TRAJECTORY_JSON_CHUNK_SIZE):
+        self.filename = filename
+        self.chunk_size = max(chunk_size, 2 * TRAJECTORY_JSON_TOKEN_MARGIN)
+
+    def tokens(self):
+        """
+        Yields JSON tokens of the file one by one.
+
+        Yields:
+            tuple: (kind, value) - kind is one of the punctuation characters '{', '}', '[', ']', ':', ','
+                   or 'string', 'number', 'literal'.
+
+        Raises:
+            JSONDecodeError: If the file contains something that is not a valid JSON token.
+        """
+        offset = 0 # Position of the buffer start in the file
+        tail = ''
+        with open(self.filename, 'r') as file:
+            while True:
+                chunk = file.read(self.chunk_size)
+                eof = not chunk
+                buffer = tail + chunk
+                limit = len(buffer) if eof else len(buffer) - TRAJECTORY_JSON_TOKEN_MARGIN
+                pos = 0
+
+                for match in TRAJECTORY_JSON_TOKEN_REGEX.finditer(buffer):
+                    if match.start() != pos or match.end() > limit:
+                        break
+                    pos = match.end()
+
+                    punctuation, string, number, literal = match.groups()
+                    if punctuation:
+                        yield punctuation, punctuation
+                    elif string is not None:
+                        yield 'string', string
+                    elif number:
+                        yield 'number', number
+                    else:
+                        yield 'literal', literal
+
+                tail = buffer[pos:]
+                if eof:
+                    if tail.strip():
+                        raise JSONDecodeError(f"Unexpected data at offset {offset + pos}", tail[:32], 0)
+                    return
+                offset += pos
+
+    def read(self):
+        """
+        Parses the whole file into the ragged arrays. Trajectories with less than 2 positions are skipped
+        as the backend does.
+
+        Returns:
+            tuple: (particle_ids, offsets, positions) - np.ndarray of shapes (P,), (P + 1,) and (N, 3).
+
+        Raises:
+            JSONDecodeError: If the file is not a valid JSON or has an unexpected structure.
+        """
+        capacity = max(getsize(self.filename) // TRAJECTORY_JSON_BYTES_PER_POSITION, 1)
+        positions = np.empty((capacity, 3), dtype=np.float32)
+        particle_ids, offsets = [], [0]
+        count = 0                # Count of the positions written to the buffer
+        depth = 0                # 1 - particles object, 2 - trajectory array, 3 - position object
+        particle_id = None
+        key = None
+
+        for kind, value in self.tokens():
+            if kind == '{' or kind == '[':
+                depth += 1
+                if depth == 3:
+                    if kind != '{':
+                        raise JSONDecodeError("Expected position object", value, 0)
+                    if count == capacity:
+                        capacity *= 2
+                        positions.resize((capacity, 3), refcheck=False)
+                    positions[count] = np.nan
+                    key = None
+            elif kind == '}' or kind == ']':
+                depth -= 1
+                if depth == 2:
+                    if np.isnan(positions[count]).any():
+                        raise JSONDecodeError(f"Incomplete position of the particle {particle_id}", value, 0)
+                    count += 1
+                elif depth == 1:
+                    # End of the trajectory: keeping it only if it has at least 2 positions
+                    if count - offsets[-1] < 2:
+                        count = offsets[-1]
+                    else:
+                        particle_ids.append(particle_id)
+                        offsets.append(count)
+            elif kind == 'string':
+                if depth == 1:
+                    particle_id = int(value)
+                elif depth == 3 and key is None:
+                    key = value
+            elif kind == 'number':
+                if depth == 3 and key in TRAJECTORY_JSON_COORDINATES:
+                    positions[count, TRAJECTORY_JSON_COORDINATES[key]] = float(value)
+            elif kind == ',':
+                key = None
+
+        # Shrinking the buffer in place to the actual count of the positions
+        positions.resize((count, 3), refcheck=False)
+        return np.array(particle_ids, dtype=np.int64), np.array(offsets, dtype=np.int64), positions
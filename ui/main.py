@@ -6,9 +6,11 @@ check_and_install_packages(["numpy", "h5py", "gmsh", "matplotlib", "PyQt5", "vtk
 
 from PyQt5.QtWidgets import QApplication
 from window import WindowApp
+from util import GmshSession
 
 def main():    
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(GmshSession.shutdown)
     main_window = WindowApp()
     main_window.show()    
     sys.exit(app.exec_())
@@ -1,10 +1,11 @@
-from os.path import dirname
+from os.path import dirname, isfile
 from json import load, dump, JSONDecodeError
 from util import *
 from field_validators import CustomIntValidator, CustomDoubleValidator
 from styles import *
 from .configurations import *
 from dialogs import MeshDialog
+from data import ConfigDocument, CONFIG_BOUNDARY_CONDITIONS
 from PyQt5.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QWidget, QComboBox,
     QMessageBox, QLabel, QLineEdit, QFormLayout,
@@ -30,6 +31,7 @@ class ConfigTab(QWidget):
         self.setup_ui()
         self.mesh_file = ""
         self.config_file_path = ""
+        self.config_document = ConfigDocument()
 
         self.log_console = log_console
         self.log_console.logSignal.connect(self.log_console.appendLog)
@@ -509,17 +511,24 @@ class ConfigTab(QWidget):
             return
 
     def read_config_file(self, config_file_path):
-        config = str()
+        # Boundary conditions are decoded once into the config document, the editor writes them through it
         try:
-            with open(config_file_path, 'r') as file:
-                config = load(file)
+            if not isfile(config_file_path):
+                raise FileNotFoundError(config_file_path)
+            self.open_config_document(config_file_path)
         except FileNotFoundError:
             QMessageBox.warning(self, "Warning", f"File not found: {config_file_path}")
             return None
         except JSONDecodeError:
             QMessageBox.warning(self, "Warning", f"Failed to decode JSON from {config_file_path}")
             return None
-        if not self.apply_config(config):
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", f"Invalid boundary conditions in {config_file_path}: {e}")
+            return None
+        except RuntimeError as e:
+            QMessageBox.warning(self, "Warning", f"Configuration isn't reloaded: {e}")
+            return None
+        if not self.apply_config(self.config_document.data):
             return None
         else:
             return 1
@@ -594,15 +603,33 @@ class ConfigTab(QWidget):
         picfem_params["DesiredAccuracy"] = self.fem_input.text()
         return picfem_params
 
+    def open_config_document(self, config_file_path: str):
+        """
+        Opens the config document. If rereading the file would drop the unsaved changes of the document,
+        the user is asked whether to discard them.
+
+        Raises:
+            RuntimeError: If the user keeps the unsaved changes.
+            Other exceptions of `ConfigDocument.open`.
+        """
+        try:
+            self.config_document.open(config_file_path)
+        except RuntimeError as e:
+            reply = QMessageBox.question(
+                self, "Configuration Changed",
+                f"{e}. Discard the unsaved changes and read the configuration '{config_file_path}'?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                raise
+            self.config_document.discard_changes()
+            self.log_console.printWarning(f"Unsaved configuration changes were discarded, reading '{config_file_path}'")
+            self.config_document.open(config_file_path)
+
     def save_boundary_conditions_to_dict(self, config_file_path: str):
         boundary_conditions = {}
         try:
-            with open(config_file_path, 'r') as file:
-                data = load(file)
-                if "Boundary Conditions" in data:
-                    boundary_conditions = data["Boundary Conditions"]
-        except FileNotFoundError:
-            pass
+            self.open_config_document(config_file_path)
+            boundary_conditions = self.config_document.to_dict().get(CONFIG_BOUNDARY_CONDITIONS, {})
         except JSONDecodeError as e:
             QMessageBox.critical(
                 self, "Error",
@@ -776,37 +803,31 @@ class ConfigTab(QWidget):
             self.upload_mesh_file()
 
     def convert_stp_to_msh(self, file_path, mesh_size, mesh_dim):
-        from gmsh import initialize, finalize, isInitialized, write, model, option
+        from gmsh import write, model, option
         
         try:
-            if not isInitialized():
-                initialize()
-            
-            model.add("model")
-            model.occ.importShapes(file_path)
-            model.occ.synchronize()
-            option.setNumber("Mesh.MeshSizeMin", mesh_size)
-            option.setNumber("Mesh.MeshSizeMax", mesh_size)
-
-            if mesh_dim == 2:
-                model.mesh.generate(2)
-            elif mesh_dim == 3:
-                model.mesh.generate(3)
-
-            output_file = file_path.replace(".stp", ".msh")
-            write(output_file)
+            with GmshSession.use_model(GMSH_STP_CONVERSION_MODEL):
+                model.occ.importShapes(file_path)
+                model.occ.synchronize()
+                option.setNumber("Mesh.MeshSizeMin", mesh_size)
+                option.setNumber("Mesh.MeshSizeMax", mesh_size)
+
+                if mesh_dim == 2:
+                    model.mesh.generate(2)
+                elif mesh_dim == 3:
+                    model.mesh.generate(3)
+
+                output_file = file_path.replace(".stp", ".msh")
+                write(output_file)
         
         except Exception as e:
             QMessageBox.critical(
                 self, "Error",
                 f"An error occurred during conversion: {str(e)}")
             return None
-        finally:
-            if isInitialized():
-                finalize()
-            
-            self.mesh_file = output_file
-            self.log_console.logSignal.emit(f'Successfully converted {file_path} to {output_file}. Mesh size is {mesh_size}. Mesh dimension: {mesh_dim}\n')
+
+        self.mesh_file = output_file
+        self.log_console.logSignal.emit(f'Successfully converted {file_path} to {output_file}. Mesh size is {mesh_size}. Mesh dimension: {mesh_dim}\n')
 
     def load_magnetic_induction(self):
         # TODO: Implement the functionality to load and parse the generated magnetic induction file from Ansys
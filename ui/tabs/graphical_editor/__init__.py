@@ -2,4 +2,5 @@ from .interactor import *
 from .mesh_tree_manager import *
 from .simple_geometry import *
 from .particle_source_manager import *
+from .actor_registry import ActorRegistry
 from .graphical_editor import *
@@ -0,0 +1,209 @@
+from vtk import vtkActor
+
+
+class ActorRegistry:
+    """
+    Bookkeeping of the editor actors: tree rows, colors, transformation matrices, mesh files and nodes.
+
+    Forward maps (actor -> value) are kept together with the reverse hash indexes, so that all the lookups
+    in both directions are O(1) instead of scanning the forward maps. The forward maps are exposed for reading
+    (e.g. `GraphicalEditor.actor_rows`), all the modifications must go through the registry methods to keep
+    the indexes consistent.
+
+    External row - is the 1st row in the tree view (volume), internal row - is the 2nd row (surface).
+    Reverse indexes keep the actors in the insertion order (dicts with None values are used as ordered sets).
+    """
+
+    def __init__(self):
+        self.actor_rows = {}       # Key = actor               |  value = pair(external row, internal row)
+        self.actor_color = {}      # Key = actor               |  value = color
+        self.actor_matrix = {}     # Key = actor               |  value = transformation matrix: pair(initial, current)
+        self.actor_filename = {}   # Key = actor               |  value = mesh filename
+        self.actor_nodes = {}      # Key = actor               |  value = sorted array of node tags
+
+        self.rows_actors = {}      # Key = pair of rows        |  value = ordered set of actors
+        self.volume_actors = {}    # Key = external row        |  value = ordered set of actors
+        self.surface_actors = {}   # Key = internal row        |  value = ordered set of actors
+        self.filename_actors = {}  # Key = mesh filename       |  value = ordered set of actors
+        self.node_actors = {}      # Key = node of line/point  |  value = ordered set of actors
+        self.surface_node_indexes = {} # Key = id of {surface tag: actor}  |  value = (MeshNodeIndex, {surface tag: actor}) of each loaded surface mesh
+        self.actor_surface = {}    # Key = actor               |  value = pair({surface tag: actor} it's in, surface tag)
+
+    def __contains__(self, actor):
+        return actor in self.actor_rows
+
+    def __len__(self):
+        return len(self.actor_rows)
+
+    @staticmethod
+    def index_add(index: dict, key, actor: vtkActor):
+        index.setdefault(key, {})[actor] = None
+
+    @staticmethod
+    def index_remove(index: dict, key, actor: vtkActor):
+        actors = index.get(key)
+        if actors is not None:
+            actors.pop(actor, None)
+            if not actors:
+                del index[key]
+
+    def add_rows_index(self, actor: vtkActor, rows):
+        self.index_add(self.rows_actors, rows, actor)
+        self.index_add(self.volume_actors, rows[0], actor)
+        self.index_add(self.surface_actors, rows[1], actor)
+
+    def remove_rows_index(self, actor: vtkActor, rows):
+        self.index_remove(self.rows_actors, rows, actor)
+        self.index_remove(self.volume_actors, rows[0], actor)
+        self.index_remove(self.surface_actors, rows[1], actor)
+
+    def add(self, actor: vtkActor, rows, color, matrix, filename: str = None):
+        """
+        Registers the actor (or replaces its entry if it's already registered).
+
+        Args:
+            actor (vtkActor): Actor to register.
+            rows (tuple): Pair (external row, internal row) of the actor in the tree view.
+            color (tuple): Own color of the actor (restored after the selection).
+            matrix (tuple): Pair (initial, current) of the transformation matrices.
+            filename (str, optional): Mesh file the actor was created from.
+        """
+        if actor in self.actor_rows:
+            self.remove(actor)
+
+        self.actor_rows[actor] = rows
+        self.actor_color[actor] = color
+        self.actor_matrix[actor] = matrix
+        self.actor_filename[actor] = filename
+        self.add_rows_index(actor, rows)
+        self.index_add(self.filename_actors, filename, actor)
+
+    def add_many(self, entries):
+        """
+        Registers a batch of actors.
+
+        Args:
+            entries (iterable): Tuples (actor, rows, color, matrix, filename).
+        """
+        for actor, rows, color, matrix, filename in entries:
+            self.add(actor, rows, color, matrix, filename)
+
+    def remove(self, actor: vtkActor):
+        """
+        Drops the actor from all the maps and indexes. Does nothing if the actor isn't registered.
+        """
+        rows = self.actor_rows.pop(actor, None)
+        if rows is None:
+            return
+
+        self.remove_rows_index(actor, rows)
+        self.index_remove(self.filename_actors, self.actor_filename.pop(actor, None), actor)
+        self.actor_color.pop(actor, None)
+        self.actor_matrix.pop(actor, None)
+
+        # Surfaces are found through the node index of their mesh, other actors are in the node -> actors index
+        nodes = self.actor_nodes.pop(actor, None)
+        surface = self.actor_surface.pop(actor, None)
+        if surface is not None:
+            surface_actors, surface_tag = surface
+            surface_actors.pop(surface_tag, None)
+            if not surface_actors:
+                # Node index keeps the whole mesh alive, it's dropped with the last surface of the mesh
+                self.surface_node_indexes.pop(id(surface_actors), None)
+        elif nodes is not None:
+            for node in nodes.tolist():
+                self.index_remove(self.node_actors, node, actor)
+
+    def remove_many(self, actors):
+        for actor in list(actors):
+            self.remove(actor)
+
+    def clear(self):
+        """
+        Drops all the actors. The maps are cleared in place, as they are shared with the editor.
+        """
+        for mapping in (self.actor_rows, self.actor_color, self.actor_matrix, self.actor_filename, self.actor_nodes,
+                        self.rows_actors, self.volume_actors, self.surface_actors, self.filename_actors,
+                        self.node_actors, self.surface_node_indexes, self.actor_surface):
+            mapping.clear()
+
+    def replace(self, actor_to_remove: vtkActor, actor_to_add: vtkActor, color, matrix):
+        """
+        Puts the `actor_to_add` on the place (rows, mesh file) of the `actor_to_remove`.
+        """
+        rows = self.actor_rows.get(actor_to_remove)
+        if rows is None:
+            return
+        filename = self.actor_filename.get(actor_to_remove)
+        self.remove(actor_to_remove)
+        self.add(actor_to_add, rows, color, matrix, filename)
+
+    def set_rows(self, actor: vtkActor, rows):
+        self.update_rows({actor: rows})
+
+    def update_rows(self, actor_rows: dict):
+        """
+        Moves the batch of actors to the new tree rows. All the old rows are released first,
+        so the actors may swap their rows within one batch.
+        """
+        for actor in actor_rows:
+            old_rows = self.actor_rows.get(actor)
+            if old_rows is not None:
+                self.remove_rows_index(actor, old_rows)
+
+        for actor, rows in actor_rows.items():
+            self.actor_rows[actor] = rows
+            self.add_rows_index(actor, rows)
+
+    def set_color(self, actor: vtkActor, color):
+        self.actor_color[actor] = color
+
+    def set_matrix(self, actor: vtkActor, matrix):
+        self.actor_matrix[actor] = matrix
+
+    def set_nodes(self, actor_nodes: dict, surface_actors=None):
+        """
+        Sets the nodes of the batch of actors created from one mesh.
+
+        Args:
+            actor_nodes (dict): Actor -> sorted array of node tags.
+            surface_actors (tuple, optional): (MeshNodeIndex, {surface tag: actor}) for the surface meshes,
+                                              node -> actors lookups of them go through the node index.
+        """
+        self.actor_nodes.update(actor_nodes)
+        if surface_actors:
+            if surface_actors[1]:
+                self.surface_node_indexes[id(surface_actors[1])] = surface_actors
+            for surface_tag, actor in surface_actors[1].items():
+                self.actor_surface[actor] = (surface_actors[1], surface_tag)
+        else:
+            for actor, nodes in actor_nodes.items():
+                for node in nodes.tolist():
+                    self.index_add(self.node_actors, node, actor)
+
+    def actor_at(self, rows):
+        """
+        Returns:
+            vtkActor or None: The first actor at the pair (external row, internal row).
+        """
+        actors = self.rows_actors.get(rows)
+        return next(iter(actors)) if actors else None
+
+    def actors_of_volume(self, volume_row) -> list:
+        return list(self.volume_actors.get(volume_row, ()))
+
+    def actors_of_surface_row(self, surface_row) -> list:
+        return list(self.surface_actors.get(surface_row, ()))
+
+    def actors_of_file(self, filename: str) -> list:
+        return list(self.filename_actors.get(filename, ()))
+
+    def filenames(self) -> list:
+        return [filename for filename in self.filename_actors if filename is not None]
+
+    def actors_of_node(self, node) -> list:
+        actors = list(self.node_actors.get(node, ()))
+        for node_index, surface_actors in self.surface_node_indexes.values():
+            actors.extend(surface_actors[surface_tag] for surface_tag in node_index.node_surfaces_of(node).tolist()
+                          if surface_tag in surface_actors)
+        return actors
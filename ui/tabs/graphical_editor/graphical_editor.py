@@ -1,7 +1,7 @@
-from gmsh import initialize, finalize, isInitialized, write, model, option
+from gmsh import write, model, option
 from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
 from PyQt5.QtCore import QSize, Qt, pyqtSlot, QItemSelectionModel
-from PyQt5.QtGui import QCursor, QStandardItemModel, QBrush, QIcon
+from PyQt5.QtGui import QCursor, QBrush, QIcon
 from PyQt5.QtWidgets import (
     QFrame, QVBoxLayout, QHBoxLayout, QTreeView,
     QPushButton, QDialog, QSpacerItem, QColorDialog,
@@ -11,17 +11,18 @@ from PyQt5.QtWidgets import (
 from vtk import (
     vtkRenderer, vtkPoints, vtkPolyData, vtkPolyLine, vtkCellArray, vtkPolyDataMapper,
     vtkActor, vtkAxesActor, vtkOrientationMarkerWidget, vtkGenericDataObjectReader, 
-    vtkDataSetMapper, vtkCellPicker, vtkPlane, vtkClipPolyData, vtkCommand, vtkMatrix4x4, 
+    vtkDataSetMapper, vtkPlane, vtkClipPolyData, vtkCommand, vtkMatrix4x4, 
     vtkInteractorStyleTrackballCamera, vtkInteractorStyleTrackballActor, vtkInteractorStyleRubberBandPick, 
 )
 from util import (
     convert_unstructured_grid_to_polydata, compare_matrices, merge_actors, align_view_by_axis,
-    ActionHistory, ProjectManager
+    ActionHistory, ProjectManager, GmshSession, GMSH_STP_CONVERSION_MODEL
 )
 from logger import LogConsole
 from .simple_geometry import SimpleGeometryManager, SimpleGeometryTransformer
 from .particle_source_manager import ParticleSourceManager
-from .mesh_tree_manager import MeshTreeManager
+from .mesh_tree_manager import MeshTreeManager, LazyMeshTreeModel
+from .actor_registry import ActorRegistry
 from .simple_geometry.simple_geometry_constants import *
 from styles import *
 from constants import *
@@ -67,27 +68,32 @@ class GraphicalEditor(QFrame):
         # Internal row - is the 2nd row in the tree view (surface)
         # Tree dictionary (treedict) - own invented dictionary that stores data to fill the mesh tree
         self.externRow_treedict = {}   # Key = external row        |  value = treedict
-        self.externRow_actors = {}     # Key = external row        |  value = list of actors
-        self.actor_rows = {}           # Key = actor               |  value = pair(external row, internal row)
-        self.actor_color = {}          # Key = actor               |  value = color
-        self.actor_nodes = {}          # Key = actor               |  value = list of nodes
-        self.actor_matrix = {}         # Key = actor               |  value = transformation matrix: pair(initial, current)
-        self.meshfile_actors = {}      # Key = mesh filename       |  value = list of actors
+        self.actor_registry = ActorRegistry()
+
+        # Forward maps of the registry, only for reading: modifications go through the registry to keep its reverse indexes
+        self.actor_rows = self.actor_registry.actor_rows     # Key = actor  |  value = pair(external row, internal row)
+        self.actor_color = self.actor_registry.actor_color   # Key = actor  |  value = color
+        self.actor_nodes = self.actor_registry.actor_nodes   # Key = actor  |  value = sorted array of node tags
+        self.actor_matrix = self.actor_registry.actor_matrix # Key = actor  |  value = transformation matrix: pair(initial, current)
         
     def setup_tree_view(self):
         self.treeView = QTreeView()
-        self.model = QStandardItemModel()
+        self.model = LazyMeshTreeModel()
         self.model.setHorizontalHeaderLabels(['Mesh Tree'])
     
     def setup_selected_actors(self):
         self.selected_actors = set()
+        self.tree_selection_model = None    # Selection model whose changes are connected to the handler
+        self.is_syncing_tree_selection = False
         
     def setup_difficult_geometry_actors(self):
         self.difficult_geometries = set()
 
     def setup_picker(self, log_console):
-        self.picker = vtkCellPicker()
-        self.picker.SetTolerance(0.005)
+        self.actor_picker = ActorPicker()
+        self.picker = self.actor_picker.picker
+        self.is_area_picking = False  # Selection mode of the rubber band style, see `on_rubber_band_char`
+        self.area_pick_start = None
         self.log_console = log_console
         
     def setup_toolbar(self):
@@ -187,19 +193,17 @@ class GraphicalEditor(QFrame):
         return None
 
     def get_actors_by_extern_row(self, extern_row):
-        return self.externRow_actors.get(extern_row, [])
+        return self.actor_registry.actors_of_volume(extern_row)
 
     def get_extern_row_by_actor(self, actor):
-        for extern_row, actors in self.externRow_actors.items():
-            if actor in actors:
-                return extern_row
-        return None
+        rows = self.actor_rows.get(actor)
+        return rows[0] if rows else None
 
     def get_rows_by_actor(self, actor):
         return self.actor_rows.get(actor, None)
 
     def get_actors_by_extern_row_from_actorRows(self, extern_row):
-        return [actor for actor, (ext_row, _) in self.actor_rows.items() if ext_row == extern_row]
+        return self.actor_registry.actors_of_volume(extern_row)
 
     def get_color_by_actor(self, actor):
         return self.actor_color.get(actor, None)
@@ -211,7 +215,7 @@ class GraphicalEditor(QFrame):
         return self.actor_nodes.get(actor, [])
 
     def get_actors_by_node(self, node):
-        return [actor for actor, nodes in self.actor_nodes.items() if node in nodes]
+        return self.actor_registry.actors_of_node(node)
 
     def get_matrix_by_actor(self, actor):
         return self.actor_matrix.get(actor, None)
@@ -220,19 +224,13 @@ class GraphicalEditor(QFrame):
         return [actor for actor, matrices in self.actor_matrix.items() if matrices == matrix]
 
     def get_actors_by_filename(self, filename):
-        return self.meshfile_actors.get(filename, [])
+        return self.actor_registry.actors_of_file(filename)
 
     def get_filename_by_actor(self, actor):
-        for filename, actors in self.meshfile_actors.items():
-            if actor in actors:
-                return filename
-        return None
+        return self.actor_registry.actor_filename.get(actor, None)
     
     def get_filenames_from_dict(self) -> list:
-        filenames = []
-        for filename, actors in self.meshfile_actors.items():
-            filenames.append(filename)
-        return filenames
+        return self.actor_registry.filenames()
 
     def get_index_from_rows(self, external_row, internal_row):
         # Get the external index
@@ -247,12 +245,6 @@ class GraphicalEditor(QFrame):
 
         return internal_index
 
-    def update_actor_dictionaries(self, actor_to_add: vtkActor, volume_row: int, surface_row: int, filename: str):
-        self.actor_rows[actor_to_add] = (volume_row, surface_row)
-        self.actor_color[actor_to_add] = DEFAULT_ACTOR_COLOR
-        self.actor_matrix[actor_to_add] = (actor_to_add.GetMatrix(), actor_to_add.GetMatrix())
-        self.meshfile_actors.setdefault(filename, []).append(actor_to_add)
-
     def update_actor_dictionaries(self, actor_to_remove: vtkActor, actor_to_add=None):
         """
         Remove actor_to_remove from all dictionaries and add actor_to_add to those dictionaries if provided.
@@ -261,49 +253,33 @@ class GraphicalEditor(QFrame):
             actor_to_remove (vtkActor): The actor to remove from all dictionaries.
             actor_to_add (vtkActor, optional): The actor to add to all dictionaries. Defaults to None.
         """
-        if actor_to_remove in self.actor_rows:
-            volume_row, surface_row = self.actor_rows[actor_to_remove]
-
-            # Remove actor from actor_rows
-            del self.actor_rows[actor_to_remove]
-
-            # Remove actor from actor_color
-            if actor_to_remove in self.actor_color:
-                del self.actor_color[actor_to_remove]
-
-            # Remove actor from actor_matrix
-            if actor_to_remove in self.actor_matrix:
-                del self.actor_matrix[actor_to_remove]
-
-            # Remove actor from meshfile_actors
-            for filename, actors in self.meshfile_actors.items():
-                if actor_to_remove in actors:
-                    actors.remove(actor_to_remove)
-                    break
-
-            # If an actor to add is provided, add it to the dictionaries
-            if actor_to_add:
-                self.actor_rows[actor_to_add] = (volume_row, surface_row)
-                self.actor_color[actor_to_add] = DEFAULT_ACTOR_COLOR
-                self.actor_matrix[actor_to_add] = (
-                    actor_to_add.GetMatrix(), actor_to_add.GetMatrix())
-                self.meshfile_actors.setdefault(
-                    filename, []).append(actor_to_add)
+        if actor_to_add:
+            # The new actor takes the rows and the mesh file of the removed one
+            self.actor_registry.replace(actor_to_remove, actor_to_add, DEFAULT_ACTOR_COLOR,
+                                        (actor_to_add.GetMatrix(), actor_to_add.GetMatrix()))
+        else:
+            self.actor_registry.remove(actor_to_remove)
 
     @pyqtSlot()
     def activate_selection_boundary_conditions_mode_slot(self):
         self.setBoundaryConditionsSurfaceButton.click()
 
     def initialize_tree(self):
-        self.model = QStandardItemModel()
+        self.model = LazyMeshTreeModel()
         self.model.setHorizontalHeaderLabels(['Mesh Tree'])
         self.setTreeViewModel()
 
     def setTreeViewModel(self):
         self.treeView.setModel(self.model)
         self.treeView.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.treeView.selectionModel().selectionChanged.connect(
-            self.on_tree_selection_changed)
+        self.connect_tree_selection()
+
+    def connect_tree_selection(self):
+        # Connecting once per selection model, otherwise the handler runs several times for each change
+        selection_model = self.treeView.selectionModel()
+        if selection_model is not self.tree_selection_model:
+            selection_model.selectionChanged.connect(self.on_tree_selection_changed)
+            self.tree_selection_model = selection_model
 
     def upload_mesh_file(self, file_path):
         from os.path import exists, isfile
@@ -313,12 +289,7 @@ class GraphicalEditor(QFrame):
             self.mesh_file = file_path
             self.initialize_tree()
             
-            if not isInitialized():
-                initialize()
             treedict = MeshTreeManager.get_tree_dict(self.mesh_file)
-            if isInitialized():
-                finalize()
-            
             self.add_actors_and_populate_tree_view(treedict, file_path)
         else:
             QMessageBox.warning(self, "Warning", f"Unable to open file {file_path}")
@@ -599,34 +570,29 @@ class GraphicalEditor(QFrame):
                 f'Successfully uploaded custom object from {file_name}')
 
     def convert_stp_to_msh(self, filename, mesh_size, mesh_dim):
+        output_file = None
         try:
-            if not isInitialized():
-                initialize()
-            
-            model.add("model")
-            model.occ.importShapes(filename)
-            model.occ.synchronize()
-            option.setNumber("Mesh.MeshSizeMin", mesh_size)
-            option.setNumber("Mesh.MeshSizeMax", mesh_size)
-
-            if mesh_dim == 2:
-                model.mesh.generate(2)
-            elif mesh_dim == 3:
-                model.mesh.generate(3)
-            else:
-                QMessageBox.warning(self, "Convert STP to MSH", f"Failed to generate mesh with mesh dim = {mesh_dim}")
-                self.log_console.printWarning(f"Failed to generate mesh with mesh dim = {mesh_dim}")
-                return None
+            with GmshSession.use_model(GMSH_STP_CONVERSION_MODEL):
+                model.occ.importShapes(filename)
+                model.occ.synchronize()
+                option.setNumber("Mesh.MeshSizeMin", mesh_size)
+                option.setNumber("Mesh.MeshSizeMax", mesh_size)
+
+                if mesh_dim == 2:
+                    model.mesh.generate(2)
+                elif mesh_dim == 3:
+                    model.mesh.generate(3)
+                else:
+                    QMessageBox.warning(self, "Convert STP to MSH", f"Failed to generate mesh with mesh dim = {mesh_dim}")
+                    self.log_console.printWarning(f"Failed to generate mesh with mesh dim = {mesh_dim}")
+                    return None
 
-            output_file = filename.replace(".stp", ".msh")
-            write(output_file)
+                output_file = filename.replace(".stp", ".msh")
+                write(output_file)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred during conversion: {str(e)}")
             return None
-        finally:
-            if isInitialized():
-                finalize()
-            return output_file
+        return output_file
 
     def add_actor(self, actor: vtkActor):
         self.renderer.AddActor(actor)
@@ -691,7 +657,7 @@ class GraphicalEditor(QFrame):
             for actor in self.selected_actors:
                 if actor and isinstance(actor, vtkActor):
                     actor.GetProperty().SetColor(r, g, b)
-                    self.actor_color[actor] = (r, g, b)
+                    self.actor_registry.set_color(actor, (r, g, b))
             self.deselect()
             
     def remove_gradient(self):
@@ -712,18 +678,13 @@ class GraphicalEditor(QFrame):
         for i in range(actors.GetNumberOfItems()):
             actor = actors.GetNextActor()
             self.renderer.RemoveActor(actor)
+        self.actor_registry.clear()
 
         self.render_editor_window()
 
     def add_custom(self, meshfilename: str):
-        if not isInitialized():
-            initialize()
-        
         customTreeDict = MeshTreeManager.get_tree_dict(meshfilename)
         self.add_actors_and_populate_tree_view(customTreeDict, meshfilename, 'volume')
-        
-        if isInitialized():
-            finalize()
 
     def global_undo(self):
         if not self.global_undo_stack:
@@ -804,21 +765,16 @@ class GraphicalEditor(QFrame):
         """
         transformed_actors = set()
 
-        for actor, (initial_transform, _) in self.actor_matrix.items():
+        for actor, (initial_transform, _) in list(self.actor_matrix.items()):
             current_transform = actor.GetMatrix()
 
             if not compare_matrices(current_transform, initial_transform):
-                filename = None
-                for fn, actors in self.meshfile_actors.items():
-                    if actor in actors:
-                        filename = fn
-                        break
-                transformed_actors.add((actor, filename))
+                transformed_actors.add((actor, self.get_filename_by_actor(actor)))
 
                 # Update the actor_matrix with the new transform
                 new_transform = vtkMatrix4x4()
                 new_transform.DeepCopy(current_transform)
-                self.actor_matrix[actor] = (initial_transform, new_transform)
+                self.actor_registry.set_matrix(actor, (initial_transform, new_transform))
 
         return transformed_actors
 
@@ -833,55 +789,19 @@ class GraphicalEditor(QFrame):
             filename (str): The mesh filename associated with the actors.
         """
         if objType == 'volume':
-            volume_row = row
-            for i, actor in enumerate(actors):
-                if actor and isinstance(actor, vtkActor):
-                    surface_row = volume_row + i
-                    actor_color = actor.GetProperty().GetColor()
-                    initial_transform = vtkMatrix4x4()
-                    initial_transform.DeepCopy(actor.GetMatrix())
-
-                    self.actor_rows[actor] = (volume_row, surface_row)
-                    self.actor_color[actor] = actor_color
-                    self.actor_matrix[actor] = (
-                        initial_transform, initial_transform)
-                    if filename in self.meshfile_actors:
-                        self.meshfile_actors[filename].append(actor)
-                    else:
-                        self.meshfile_actors[filename] = [actor]
-
+            actor_rows = [(row, row + i) for i in range(len(actors))]
         elif objType == 'line':
-            for i, r in enumerate(row):
-                actor = actors[i]
-                if actor and isinstance(actor, vtkActor):
-                    actor_color = actor.GetProperty().GetColor()
-                    initial_transform = vtkMatrix4x4()
-                    initial_transform.DeepCopy(actor.GetMatrix())
-
-                    self.actor_rows[actor] = (r, r)
-                    self.actor_color[actor] = actor_color
-                    self.actor_matrix[actor] = (
-                        initial_transform, initial_transform)
-                    if filename in self.meshfile_actors:
-                        self.meshfile_actors[filename].append(actor)
-                    else:
-                        self.meshfile_actors[filename] = [actor]
-
+            actor_rows = [(r, r) for r in row]
         else:
-            for actor in actors:
-                if actor and isinstance(actor, vtkActor):
-                    actor_color = actor.GetProperty().GetColor()
-                    initial_transform = vtkMatrix4x4()
-                    initial_transform.DeepCopy(actor.GetMatrix())
-
-                    self.actor_rows[actor] = (row, row)
-                    self.actor_color[actor] = actor_color
-                    self.actor_matrix[actor] = (
-                        initial_transform, initial_transform)
-                    if filename in self.meshfile_actors:
-                        self.meshfile_actors[filename].append(actor)
-                    else:
-                        self.meshfile_actors[filename] = [actor]
+            actor_rows = [(row, row)] * len(actors)
+
+        entries = []
+        for actor, rows in zip(actors, actor_rows):
+            if actor and isinstance(actor, vtkActor):
+                initial_transform = vtkMatrix4x4()
+                initial_transform.DeepCopy(actor.GetMatrix())
+                entries.append((actor, rows, actor.GetProperty().GetColor(), (initial_transform, initial_transform), filename))
+        self.actor_registry.add_many(entries)
 
     def get_volume_row(self, actor):
         """
@@ -921,8 +841,7 @@ class GraphicalEditor(QFrame):
         Returns:
             list: A list of actors for the given volume index, or None if not found.
         """
-        actors = [actor for actor, (vol_idx, _) in self.actor_rows.items(
-        ) if vol_idx == volume_row]
+        actors = self.actor_registry.actors_of_volume(volume_row)
         return actors if actors else None
 
     def get_actor_from_surface_row(self, surface_row):
@@ -935,27 +854,22 @@ class GraphicalEditor(QFrame):
         Returns:
             vtkActor: The actor for the given surface index, or None if not found.
         """
-        for actor, (_, surf_idx) in self.actor_rows.items():
-            if surf_idx == surface_row:
-                return actor
-        return None
+        actors = self.actor_registry.actors_of_surface_row(surface_row)
+        return actors[0] if actors else None
 
-    def fill_actor_nodes(self, treedict: dict, objType: str):
-        # Ensure the dictionary exists
-        if not hasattr(self, 'actor_nodes'):
-            self.actor_nodes = {}
-
-        # Update the actor_nodes with the new data
-        self.actor_nodes.update(MeshTreeManager.form_actor_nodes_dictionary(treedict, self.actor_rows, objType))
+    def fill_actor_nodes(self, treedict: dict, actors: list, objType: str):
+        # Surfaces are looked up by node through the node index of their mesh
+        self.actor_registry.set_nodes(MeshTreeManager.form_actor_nodes_dictionary(treedict, actors, objType),
+                                      MeshTreeManager.form_surface_actors_dictionary(treedict, actors, objType))
 
     def populate_tree(self, treedict: dict, objType: str, filename: str) -> list:
         row = MeshTreeManager.populate_tree_view(treedict, self.action_history.id, self.model, self.treeView, objType)
         self.treeView.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.treeView.selectionModel().selectionChanged.connect(self.on_tree_selection_changed)
+        self.connect_tree_selection()
         actors = MeshTreeManager.create_actors_from_tree_dict(treedict, objType)
 
         self.fill_dicts(row, actors, objType, filename)
-        self.fill_actor_nodes(treedict, objType)
+        self.fill_actor_nodes(treedict, actors, objType)
 
         return row, actors
 
@@ -965,9 +879,6 @@ class GraphicalEditor(QFrame):
         self.add_actors(actors)
 
         self.externRow_treedict[row] = treedict
-        if row not in self.externRow_actors:
-            self.externRow_actors[row] = []
-        self.externRow_actors[row].append(actors)
 
         self.action_history.add_action((row, actors, treedict, objType))
         self.global_undo_stack.append(ACTION_ACTOR_ADDING)
@@ -988,33 +899,48 @@ class GraphicalEditor(QFrame):
     def unhighlight_actors(self):
         self.restore_actor_colors()
 
+    def set_selected_actors(self, actors):
+        """
+        Makes the `actors` the selected ones. Only the actors whose selection state changed are recolored,
+        the scene is rendered once.
+
+        Args:
+            actors (iterable): Actors to select, the rest of the previously selected ones are deselected.
+        """
+        actors = set(actors)
+        deselected = self.selected_actors - actors
+        selected = actors - self.selected_actors
+
+        for actor in deselected:
+            actor.GetProperty().SetColor(self.actor_color.get(actor, DEFAULT_ACTOR_COLOR))
+        for actor in selected:
+            actor.GetProperty().SetColor(DEFAULT_SELECTED_ACTOR_COLOR)
+
+        # Keeping the same set object, it's shared with the particle source manager
+        self.selected_actors.difference_update(deselected)
+        self.selected_actors.update(selected)
+        if deselected or selected:
+            self.render_editor_window_without_resetting_camera()
+
+    def get_actor_by_tree_index(self, index):
+        parent_row = index.parent().row()
+        if parent_row == -1:
+            # Volume row selects its first surface
+            actors = self.actor_registry.actors_of_volume(index.row())
+            return actors[0] if actors else None
+        return self.actor_registry.actor_at((parent_row, index.row()))
+
     def on_tree_selection_changed(self):
+        # Selection made from the viewport is already applied to the actors
+        if self.is_syncing_tree_selection:
+            return
+        
         selected_indexes = self.treeView.selectedIndexes()
         if not selected_indexes:
             return
 
-        self.unhighlight_actors()
-        self.selected_actors.clear()
-
-        for index in selected_indexes:
-            selected_row = index.row()
-            parent_index = index.parent().row()
-
-            selected_item = None
-            if parent_index == -1:
-                for actor, (volume_row, _) in self.actor_rows.items():
-                    if volume_row == selected_row:
-                        selected_item = actor
-                        break
-            else:
-                for actor, (volume_row, surface_row) in self.actor_rows.items():
-                    if volume_row == parent_index and surface_row == selected_row:
-                        selected_item = actor
-                        break
-
-            if selected_item:
-                self.highlight_actors([selected_item])
-                self.selected_actors.add(selected_item)
+        actors = (self.get_actor_by_tree_index(index) for index in selected_indexes)
+        self.set_selected_actors(actor for actor in actors if actor)
 
     def retrieve_mesh_filename(self) -> str:
         """
@@ -1033,10 +959,9 @@ class GraphicalEditor(QFrame):
 
     def handle_drawing_line(self):
         click_pos = self.interactor.GetEventPosition()
-        picker = vtkCellPicker()
-        picker.Pick(click_pos[0], click_pos[1], 0, self.renderer)
+        self.actor_picker.pick(self.renderer, click_pos[0], click_pos[1])
 
-        pickedPosition = picker.GetPickPosition()
+        pickedPosition = self.picker.GetPickPosition()
         self.crossSectionLinePoints.append(pickedPosition)
 
         if len(self.crossSectionLinePoints) == 1:
@@ -1091,36 +1016,40 @@ class GraphicalEditor(QFrame):
             self.tempLineActor = None
         self.render_editor_window()
 
+    def select_tree_rows(self, actors, is_additive: bool):
+        """
+        Mirrors the actors picked in the viewport into the tree view selection.
+
+        Args:
+            actors (iterable): Picked actors, the ones that aren't in the tree are skipped.
+            is_additive (bool): Keeps the current tree selection if True, otherwise it's reset.
+        """
+        # Tree selection follows the viewport, its change handler mustn't recolor the actors once more
+        self.is_syncing_tree_selection = True
+        try:
+            if not is_additive:
+                # Reset selection of all previous tree view items
+                self.reset_selection_treeview()
+
+            # Select the rows in the tree view if the actor is in the tree
+            selection_model = self.treeView.selectionModel()
+            for actor in actors:
+                rows_to_select = self.actor_rows.get(actor)
+                if rows_to_select:
+                    index = self.model.index(
+                        rows_to_select[1], 0, self.model.index(rows_to_select[0], 0))
+                    selection_model.select(
+                        index, QItemSelectionModel.Select | QItemSelectionModel.Rows)
+        finally:
+            self.is_syncing_tree_selection = False
+
     def pick_actor(self, obj, event):
         click_pos = self.interactor.GetEventPosition()
-        self.picker.Pick(click_pos[0], click_pos[1], 0, self.renderer)
-
-        actor = self.picker.GetActor()
+        actor = self.actor_picker.pick(self.renderer, click_pos[0], click_pos[1])
         if actor:
-            if not (self.interactor.GetControlKey() or self.interactor.GetShiftKey()):
-                # Reset selection of all previous actors and tree view items
-                self.unhighlight_actors()
-                self.reset_selection_treeview()
-                self.selected_actors.clear()
-
-            rows_to_select = ()
-
-            # Find the corresponding rows
-            for act, (volume_row, surface_row) in self.actor_rows.items():
-                if actor == act:
-                    rows_to_select = (volume_row, surface_row)
-                    break
-
-            # Select the rows in the tree view if rows_to_select is not empty
-            if rows_to_select:
-                index = self.model.index(
-                    rows_to_select[1], 0, self.model.index(rows_to_select[0], 0))
-                self.treeView.selectionModel().select(
-                    index, QItemSelectionModel.Select | QItemSelectionModel.Rows)
-            
-            actor.GetProperty().SetColor(DEFAULT_SELECTED_ACTOR_COLOR)
-            self.selected_actors.add(actor)
-            self.render_editor_window_without_resetting_camera()
+            is_additive = self.interactor.GetControlKey() or self.interactor.GetShiftKey()
+            self.select_tree_rows({actor}, is_additive)
+            self.set_selected_actors(self.selected_actors | {actor} if is_additive else {actor})
 
         # Call the original OnLeftButtonDown event handler to maintain default interaction behavior
         self.interactorStyle.OnLeftButtonDown()
@@ -1152,14 +1081,39 @@ class GraphicalEditor(QFrame):
     def on_left_button_press(self, obj, event):
         if self.isDrawingLine:
             self.handle_drawing_line()
+        elif self.is_area_picking:
+            self.area_pick_start = self.interactor.GetEventPosition()
+            self.interactorStyle.OnLeftButtonDown()
         else:
             self.pick_actor(obj, event)
 
+    def on_left_button_release(self, obj, event):
+        # Rubber band is drawn by the interactor style, it's removed before the selection render
+        self.interactorStyle.OnLeftButtonUp()
+
+        if self.is_area_picking and self.area_pick_start is not None and DEFAULT_EDITOR_HARDWARE_AREA_PICKING:
+            x0, y0 = self.area_pick_start
+            x1, y1 = self.interactor.GetEventPosition()
+            actors = self.actor_picker.pick_area(self.renderer, x0, y0, x1, y1)
+
+            is_additive = self.interactor.GetControlKey() or self.interactor.GetShiftKey()
+            self.select_tree_rows(actors, is_additive)
+            self.set_selected_actors(self.selected_actors | actors if is_additive else actors)
+
+        # Style stays in the selection mode until 'r' is pressed again
+        self.area_pick_start = None
+
+    def on_rubber_band_char(self, obj, event):
+        # Observer of the char event replaces the handler of the style, so the style switches its mode only here.
+        # The style has no getter for the mode, it's taken right after the style toggled it on 'r'
+        key = self.interactor.GetKeyCode()
+        self.interactorStyle.OnChar()
+        if key == 'r' or key == 'R':
+            self.is_area_picking = not self.is_area_picking
+
     def on_right_button_press(self, obj, event):
         click_pos = self.interactor.GetEventPosition()
-        self.picker.Pick(click_pos[0], click_pos[1], 0, self.renderer)
-
-        actor = self.picker.GetActor()
+        actor = self.actor_picker.pick(self.renderer, click_pos[0], click_pos[1])
         if actor:
             self.selected_actors.add(actor)
             self.context_menu()
@@ -1291,19 +1245,21 @@ class GraphicalEditor(QFrame):
             
     def change_interactor(self, style: str):
         self.interactor = self.vtkWidget.GetRenderWindow().GetInteractor()
+        self.is_area_picking = False
+        self.area_pick_start = None
 
         if style == INTERACTOR_STYLE_TRACKBALL_CAMERA:
             self.interactorStyle = vtkInteractorStyleTrackballCamera()
-            self.picker = vtkCellPicker()  # Use single object picker
             self.interactorStyle.AddObserver(vtkCommand.LeftButtonPressEvent, self.on_left_button_press)
             self.interactorStyle.AddObserver(vtkCommand.RightButtonPressEvent, self.on_right_button_press)
         elif style == INTERACTOR_STYLE_TRACKBALL_ACTOR:
             self.interactorStyle = vtkInteractorStyleTrackballActor()
-            self.picker = vtkCellPicker()  # Use single object picker
             self.log_console.printWarning("Interactor style changed: Be careful with arbitrary object transformation! If you want to set boundary conditions for this object, they will apply to the old coordinates of the nodes. Because the program does not provide for changes to key objects for which boundary conditions are set")
         elif style == INTERACTOR_STYLE_RUBBER_AND_PICK:
             self.interactorStyle = vtkInteractorStyleRubberBandPick()
             self.interactorStyle.AddObserver(vtkCommand.LeftButtonPressEvent, self.on_left_button_press)
+            self.interactorStyle.AddObserver(vtkCommand.LeftButtonReleaseEvent, self.on_left_button_release)
+            self.interactorStyle.AddObserver(vtkCommand.CharEvent, self.on_rubber_band_char)
         else:
             QMessageBox.warning(self, "Change Interactor", f"Can't change current interactor style. There is no such interactor: {style}")
             self.log_console.printWarning(f"Can't change current interactor style. There is no such interactor: {style}")
@@ -1368,7 +1324,7 @@ class GraphicalEditor(QFrame):
         MeshTreeManager.update_tree_view(model, volume_row, surface_indices)
 
         # Updating the actor_rows dictionary with the new internal row index
-        self.actor_rows[merged_actor] = (volume_row, surface_indices[0])
+        self.actor_registry.set_rows(merged_actor, (volume_row, surface_indices[0]))
 
         # Adjusting indices in actor_rows after removal
         self.adjust_actor_rows(volume_row, surface_indices)
@@ -1385,9 +1341,8 @@ class GraphicalEditor(QFrame):
         removed_indices = sorted(removed_indices)
 
         # Initialize a list of current surface indices
-        current_surface_indices = [
-            rows[1] for actor, rows in self.actor_rows.items() if rows[0] == volume_row]
-        current_surface_indices.sort()
+        volume_actors = self.actor_registry.actors_of_volume(volume_row)
+        current_surface_indices = sorted(self.actor_rows[actor][1] for actor in volume_actors)
 
         # Create a new list of sequential indices
         new_indices = []
@@ -1399,9 +1354,8 @@ class GraphicalEditor(QFrame):
 
         # Update actor_rows with new sequential indices
         index_mapping = dict(zip(current_surface_indices, new_indices))
-        for actor, (vol_row, surf_row) in list(self.actor_rows.items()):
-            if vol_row == volume_row and surf_row in index_mapping:
-                self.actor_rows[actor] = (vol_row, index_mapping[surf_row])
+        self.actor_registry.update_rows({actor: (volume_row, index_mapping[self.actor_rows[actor][1]]) for actor in volume_actors
+                                         if self.actor_rows[actor][1] in index_mapping})
 
     def align_view_by_axis(self, axis: str):
         align_view_by_axis(axis, self.renderer, self.vtkWidget)
@@ -1554,35 +1508,46 @@ class GraphicalEditor(QFrame):
 
         self.log_console.printInfo("Successfully created a cross-section")
 
-    def save_boundary_conditions(self, node_ids, value):
-        from json import dump, load, JSONDecodeError
-        
+    def save_boundary_conditions(self, node_sets, value):
+        """
+        Applies the value to all the node sets in one transaction of the config document, the config is written once.
+
+        Args:
+            node_sets (iterable): Arrays of node tags, each of them gets its own boundary condition.
+            value (float): Value of the boundary conditions.
+
+        Returns:
+            list or None: Pairs (node array, previous value) of the nodes that had another value before
+                          (each node has only one value), None if the config wasn't saved.
+        """
+        from json import JSONDecodeError
+
+        config_file_path = self.config_tab.config_file_path
+        document = self.config_tab.config_document
         try:
-            with open(self.config_tab.config_file_path, 'r') as file:
-                data = load(file)
-        except FileNotFoundError:
-            data = {}
+            self.config_tab.open_config_document(config_file_path)
+        except RuntimeError as e:
+            self.log_console.printWarning(f"Boundary conditions aren't saved: {e}")
+            return None
         except JSONDecodeError as e:
             QMessageBox.critical(self, "Error", 
-                                 f"Error parsing JSON file '{self.config_tab.config_file_path}': {e}")
-            return
+                                 f"Error parsing JSON file '{config_file_path}': {e}")
+            return None
         except Exception as e:
             QMessageBox.critical(self, "Error", 
-                                 f"An error occurred while reading the configuration file '{self.config_tab.config_file_path}': {e}")
-            return
-
-        if "Boundary Conditions" not in data:
-            data["Boundary Conditions"] = {}
-
-        node_key = ','.join(map(str, node_ids))
-        data["Boundary Conditions"][node_key] = value
+                                 f"An error occurred while reading the configuration file '{config_file_path}': {e}")
+            return None
 
+        reassigned = []
         try:
-            with open(self.config_tab.config_file_path, 'w') as file:
-                dump(data, file, indent=4)
+            with document.transaction():
+                for nodes in node_sets:
+                    reassigned.extend(document.set_boundary_condition(nodes, value))
         except Exception as e:
             QMessageBox.critical(
                 self, "Error", f"Failed to save configuration: {e}")
+            return None
+        return [(nodes, old_value) for nodes, old_value in reassigned if old_value != value]
 
     def activate_selection_boundary_conditions_mode_for_surface(self):
         if not self.selected_actors:
@@ -1600,11 +1565,14 @@ class GraphicalEditor(QFrame):
         else:
             return
 
-        for actor in self.selected_actors:
-            if actor in self.actor_nodes:
-                nodes = self.actor_nodes[actor]
-                self.save_boundary_conditions(nodes, value)
+        actor_nodes = {actor: self.actor_nodes[actor] for actor in self.selected_actors if actor in self.actor_nodes}
+        reassigned = self.save_boundary_conditions(actor_nodes.values(), value)
+        if reassigned is not None:
+            for actor, nodes in actor_nodes.items():
                 self.log_console.printInfo(f"Object: {hex(id(actor))}, Nodes: {nodes}, Value: {value}")
+            # Each node has one value: the shared nodes of the previously saved boundary conditions get the new one
+            for nodes, old_value in reassigned:
+                self.log_console.printWarning(f"Nodes {nodes} had the boundary condition value {old_value}, reassigned to {value}")
         self.deselect()
 
     def save_and_mesh_simple_objects(self):
@@ -1633,8 +1601,6 @@ class GraphicalEditor(QFrame):
             self.log_console.printInfo("There is no objects to mesh")
             return
 
-        from gmsh import isInitialized, initialize, finalize, write, open, model, option
-
         # TODO: implement
 
         self.difficult_geometries.clear()
@@ -1651,18 +1617,15 @@ class GraphicalEditor(QFrame):
             pass
     
     def test(self):
-        if not isInitialized():
-            initialize()
-        model.occ.addBox(0, 0, 0, 5, 5, 5)
-        model.occ.addBox(2.5, 2.5, 2.5, 5, 5, 5)
-        # model.occ.fuse([(3, 1)], [(3, 2)]) # Union
-        model.occ.intersect([(3, 1)], [(3, 2)]) # Intersection
-        # model.occ.cut([(3, 1)], [(3, 2)]) # Subtract
-        model.occ.synchronize()
-        model.mesh.generate(3)
-        option.setNumber("Mesh.MeshSizeMin", 0.1)
-        option.setNumber("Mesh.MeshSizeMax", 0.1)
-        write("test.msh")
-        if isInitialized():
-            finalize()
+        with GmshSession.use_model("test"):
+            model.occ.addBox(0, 0, 0, 5, 5, 5)
+            model.occ.addBox(2.5, 2.5, 2.5, 5, 5, 5)
+            # model.occ.fuse([(3, 1)], [(3, 2)]) # Union
+            model.occ.intersect([(3, 1)], [(3, 2)]) # Intersection
+            # model.occ.cut([(3, 1)], [(3, 2)]) # Subtract
+            model.occ.synchronize()
+            model.mesh.generate(3)
+            option.setNumber("Mesh.MeshSizeMin", 0.1)
+            option.setNumber("Mesh.MeshSizeMax", 0.1)
+            write("test.msh")
     
\ No newline at end of file
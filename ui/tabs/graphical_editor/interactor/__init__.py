@@ -1 +1,2 @@
 from .interactor_constants import *
+from .actor_picker import ActorPicker
@@ -0,0 +1,101 @@
+from vtk import vtkCellPicker, vtkStaticCellLocator, vtkHardwareSelector, vtkSelectionNode, vtkDataObject, vtkActor
+from constants import DEFAULT_EDITOR_PICKER_TOLERANCE
+
+
+class ActorPicker:
+    """
+    Picking of the editor actors.
+
+    Single clicks go through `vtkCellPicker` with a prebuilt `vtkStaticCellLocator` for the data of each actor,
+    so the cells are not tested one by one. The picker transforms the ray into the coordinates of the actor, so
+    locators stay valid when the actors are moved, they are rebuilt only when the data of the actor changes
+    (it's detected by the modification time of the data set).
+
+    Area (rubber band) picking renders the cell IDs with `vtkHardwareSelector` and returns all the actors
+    visible in the area at once.
+    """
+
+    def __init__(self, tolerance: float = DEFAULT_EDITOR_PICKER_TOLERANCE):
+        self.picker = vtkCellPicker()
+        self.picker.SetTolerance(tolerance)
+        self.locators = {}  # Key = actor  |  value = (data set, its modification time, locator)
+
+    @staticmethod
+    def get_actor_dataset(actor: vtkActor):
+        mapper = actor.GetMapper()
+        if mapper is None or not hasattr(mapper, "GetInput"):
+            return None
+        return mapper.GetInput()
+
+    def drop_locator(self, actor: vtkActor):
+        entry = self.locators.pop(actor, None)
+        if entry is not None:
+            self.picker.RemoveLocator(entry[2])
+
+    def invalidate(self, actor: vtkActor = None):
+        """
+        Drops the locator of the actor (or of all the actors), it's rebuilt on the next pick.
+        """
+        for cached_actor in ([actor] if actor is not None else list(self.locators)):
+            self.drop_locator(cached_actor)
+
+    def update_locators(self, renderer):
+        """
+        Builds the missing and the outdated locators for the actors of the renderer and drops the locators of the removed actors.
+        """
+        actors = set()
+        collection = renderer.GetActors()
+        collection.InitTraversal()
+        for _ in range(collection.GetNumberOfItems()):
+            actor = collection.GetNextActor()
+            actors.add(actor)
+
+            dataset = self.get_actor_dataset(actor)
+            if dataset is None or dataset.GetNumberOfCells() == 0:
+                self.drop_locator(actor)
+                continue
+
+            entry = self.locators.get(actor)
+            if entry is not None and entry[0] is dataset and entry[1] == dataset.GetMTime():
+                continue
+
+            self.drop_locator(actor)
+            locator = vtkStaticCellLocator()
+            locator.SetDataSet(dataset)
+            locator.BuildLocator()
+            self.picker.AddLocator(locator)
+            self.locators[actor] = (dataset, dataset.GetMTime(), locator)
+
+        for actor in [actor for actor in self.locators if actor not in actors]:
+            self.drop_locator(actor)
+
+    def pick(self, renderer, x: int, y: int):
+        """
+        Returns:
+            vtkActor or None: The nearest actor under the display position.
+        """
+        self.update_locators(renderer)
+        self.picker.Pick(x, y, 0, renderer)
+        return self.picker.GetActor()
+
+    @staticmethod
+    def pick_area(renderer, x0: int, y0: int, x1: int, y1: int) -> set:
+        """
+        Returns:
+            set: Actors with at least one visible cell in the display area.
+        """
+        selector = vtkHardwareSelector()
+        selector.SetRenderer(renderer)
+        selector.SetFieldAssociation(vtkDataObject.FIELD_ASSOCIATION_CELLS)
+        selector.SetArea(int(min(x0, x1)), int(min(y0, y1)), int(max(x0, x1)), int(max(y0, y1)))
+
+        actors = set()
+        selection = selector.Select()
+        if selection is None:
+            return actors
+
+        for i in range(selection.GetNumberOfNodes()):
+            prop = selection.GetNode(i).GetProperties().Get(vtkSelectionNode.PROP())
+            if isinstance(prop, vtkActor):
+                actors.add(prop)
+        return actors
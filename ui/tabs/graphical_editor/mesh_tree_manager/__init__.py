@@ -1 +1,2 @@
 from .mesh_tree_manager import MeshTreeManager
+from .lazy_mesh_tree_model import LazyMeshTreeModel
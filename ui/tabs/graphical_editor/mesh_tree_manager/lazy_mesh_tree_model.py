@@ -0,0 +1,137 @@
+from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from PyQt5.QtCore import Qt, QModelIndex
+from data import MeshTreeData
+from constants import DEFAULT_MESH_TREE_FETCH_BATCH_SIZE
+
+
+MESH_TREE_SOURCE_ROLE = Qt.UserRole + 1 # Item data role with the lazy source of the item children
+
+
+class SurfaceTrianglesSource:
+    """
+    Children of the surface item: triangles of one or several (merged) surfaces one after another.
+    """
+
+    def __init__(self, mesh_tree: MeshTreeData, surface_tags):
+        self.mesh_tree = mesh_tree
+        self.surface_tags = list(surface_tags)
+
+    def __len__(self):
+        return sum(len(self.mesh_tree.surfaces[surface_tag][0]) for surface_tag in self.surface_tags)
+
+    def merged(self, other):
+        return SurfaceTrianglesSource(self.mesh_tree, self.surface_tags + other.surface_tags)
+
+    def create_items(self, start, stop):
+        items, offset = [], 0
+        for surface_tag in self.surface_tags:
+            triangle_tags, triangles = self.mesh_tree.surfaces[surface_tag]
+            first, last = max(start - offset, 0), min(stop - offset, len(triangle_tags))
+            for row in range(first, last):
+                item = QStandardItem(f'Triangle[{triangle_tags[row]}]')
+                item.setData(TriangleEdgesSource(self.mesh_tree, triangles[row]), MESH_TREE_SOURCE_ROLE)
+                items.append(item)
+            offset += len(triangle_tags)
+            if offset >= stop:
+                break
+        return items
+
+
+class TriangleEdgesSource:
+    """
+    Children of the triangle item: 3 lines with their end points.
+    """
+
+    def __init__(self, mesh_tree: MeshTreeData, node_rows):
+        self.mesh_tree = mesh_tree
+        self.node_rows = [int(row) for row in node_rows]
+
+    def __len__(self):
+        return 3
+
+    def create_items(self, start, stop):
+        items = []
+        for line_idx in range(start, stop):
+            line_item = QStandardItem(f'Line[{line_idx + 1}]')
+            for row in (self.node_rows[line_idx], self.node_rows[(line_idx + 1) % 3]):
+                node_tag, coords = self.mesh_tree.node_entry(row)
+                line_item.appendRow(QStandardItem(f'Point[{node_tag}]: {coords}'))
+            items.append(line_item)
+        return items
+
+
+class LazyMeshTreeModel(QStandardItemModel):
+    """
+    Mesh tree model that creates the Triangle/Line/Point items only when the view needs them.
+
+    Surface and triangle items keep the lazy source of their children in the `MESH_TREE_SOURCE_ROLE` data.
+    The view asks for the children with `canFetchMore`/`fetchMore` when the item is expanded or scrolled
+    to the end, so the count of the created items follows what is shown rather than the mesh size.
+    Items without a source behave as in `QStandardItemModel`.
+    """
+
+    def __init__(self, parent=None, fetch_batch_size: int = DEFAULT_MESH_TREE_FETCH_BATCH_SIZE):
+        super().__init__(parent)
+        self.fetch_batch_size = max(1, fetch_batch_size)
+
+    @staticmethod
+    def create_surface_item(text: str, mesh_tree: MeshTreeData, surface_tag) -> QStandardItem:
+        item = QStandardItem(text)
+        item.setData(SurfaceTrianglesSource(mesh_tree, [surface_tag]), MESH_TREE_SOURCE_ROLE)
+        return item
+
+    @staticmethod
+    def children_source(item: QStandardItem):
+        return item.data(MESH_TREE_SOURCE_ROLE) if item is not None else None
+
+    def lazy_item(self, parent: QModelIndex):
+        """
+        Returns:
+            tuple: (item, source) for the lazy item or (None, None).
+        """
+        if not parent.isValid():
+            return None, None
+        item = self.itemFromIndex(parent)
+        source = self.children_source(item)
+        return (item, source) if source is not None else (None, None)
+
+    def hasChildren(self, parent=QModelIndex()):
+        item, source = self.lazy_item(parent)
+        if source is not None:
+            return item.rowCount() > 0 or len(source) > 0
+        return super().hasChildren(parent)
+
+    def canFetchMore(self, parent):
+        item, source = self.lazy_item(parent)
+        if source is not None:
+            return item.rowCount() < len(source)
+        return super().canFetchMore(parent)
+
+    def fetchMore(self, parent):
+        item, source = self.lazy_item(parent)
+        if source is None:
+            return super().fetchMore(parent)
+
+        start = item.rowCount()
+        stop = min(start + self.fetch_batch_size, len(source))
+        if start < stop:
+            item.appendRows(source.create_items(start, stop))
+
+    @staticmethod
+    def merge_lazy_items(target: QStandardItem, items) -> bool:
+        """
+        Appends the children sources of the `items` to the `target`, so that their children are fetched
+        after the target's own ones. Already created children of the `items` are not copied.
+
+        Returns:
+            bool: False if some of the items are not lazy, nothing is merged then.
+        """
+        sources = [LazyMeshTreeModel.children_source(item) for item in [target, *items]]
+        if not all(isinstance(source, SurfaceTrianglesSource) and source.mesh_tree is sources[0].mesh_tree for source in sources):
+            return False
+
+        merged = sources[0]
+        for source in sources[1:]:
+            merged = merged.merged(source)
+        target.setData(merged, MESH_TREE_SOURCE_ROLE)
+        return True
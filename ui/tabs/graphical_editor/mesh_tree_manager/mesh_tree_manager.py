@@ -1,194 +1,208 @@
 import gmsh
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from vtk import (
-    vtkPoints, vtkCellArray, vtkUnstructuredGrid, vtkUnstructuredGridWriter,
-    vtkTriangle, vtkPolyData, vtkPolyDataMapper, vtkActor, vtkVertexGlyphFilter,
-    vtkPolyLine,
+    vtkUnstructuredGrid, vtkUnstructuredGridWriter, vtkXMLUnstructuredGridWriter,
+    vtkPolyData, vtkPolyDataMapper, vtkActor, vtkVertexGlyphFilter,
     VTK_TRIANGLE
 )
 from PyQt5.QtGui import QStandardItemModel, QStandardItem
 from PyQt5.QtWidgets import QTreeView
 from PyQt5.QtCore import QModelIndex
 from styles import *
+from data import MeshTreeData, MeshTreeDict, MESH_TREE_OBJECT_TYPES
+from util.vtk_helpers import create_polydata_from_arrays, create_vtk_cell_array, create_vtk_points
+from util.gmsh_session import GmshSession
+from .lazy_mesh_tree_model import LazyMeshTreeModel
+
+
+MESH_TREE_GMSH_MODEL = 'mesh_tree'  # Model of the Gmsh session the mesh files are read into
 
 
 class MeshTreeManager:
     
     @staticmethod
-    def get_tree_dict(mesh_filename: str = None, obj_type: str = 'volume') -> dict:
+    def get_mesh_tree(mesh_filename: str = None, obj_type: str = 'volume') -> MeshTreeData:
         """
-        Extracts the data from Gmsh and returns it in a structured format.
+        Extracts the data from Gmsh into the arrays: node tags and coordinates are read once,
+        and the elements of each entity are mapped to the node rows with `np.searchsorted`.
 
         Parameters:
         mesh_filename (str): The filename of the Gmsh mesh file to read.
         obj_type (str): The type of object to extract ('point', 'line', 'surface', 'volume').
 
         Returns:
-        dict: A dictionary representing the object map.
+        MeshTreeData: Array-backed mesh data.
 
         Raises:
         ValueError: If the obj_type is invalid.
         RuntimeError: If there is an error opening the mesh file or processing the Gmsh data.
         """
+        if obj_type not in MESH_TREE_OBJECT_TYPES:
+            raise ValueError(f"Invalid obj_type. Must be one of {', '.join(map(repr, MESH_TREE_OBJECT_TYPES))}.")
+        
         try:
-            if mesh_filename:
-                gmsh.open(mesh_filename)
-
-            gmsh.model.occ.synchronize()
-
-            # Getting all the nodes and their coordinates
-            all_node_tags, all_node_coords, _ = gmsh.model.mesh.getNodes()
-            node_coords_map = {
-                tag: (all_node_coords[i * 3], all_node_coords[i * 3 + 1],
-                    all_node_coords[i * 3 + 2])
-                for i, tag in enumerate(all_node_tags)
-            }
-
-            if obj_type == 'point':
-                point_map = {
-                    f'Point[{tag}]': coords
-                    for tag, coords in node_coords_map.items()
-                }
-                return point_map
-
-            if obj_type == 'line':
-                lines = gmsh.model.getEntities(dim=1)
-                line_map = {}
-
-                for line_dim, line_tag in lines:
-                    element_types, element_tags, node_tags = gmsh.model.mesh.getElements(
-                        line_dim, line_tag)
-
-                    for elem_type, elem_tags, elem_node_tags in zip(
-                            element_types, element_tags, node_tags):
-                        if elem_type == 1:  # 1st type for lines
-                            for i in range(len(elem_tags)):
-                                node_indices = elem_node_tags[i * 2:(i + 1) * 2]
-                                line = [(node_indices[0],
-                                        node_coords_map[node_indices[0]]),
-                                        (node_indices[1],
-                                        node_coords_map[node_indices[1]])]
-                                line_map[f'Line[{elem_tags[i]}]'] = line
-                return line_map
-
-            if obj_type == 'surface':
-                surfaces = gmsh.model.getEntities(dim=2)
-                surface_map = {}
-
-                for surf_dim, surf_tag in surfaces:
-                    element_types, element_tags, node_tags = gmsh.model.mesh.getElements(
-                        surf_dim, surf_tag)
-
-                    triangles = []
-                    for elem_type, elem_tags, elem_node_tags in zip(
-                            element_types, element_tags, node_tags):
-                        if elem_type == 2:  # 2nd type for the triangles
-                            for i in range(len(elem_tags)):
-                                node_indices = elem_node_tags[i * 3:(i + 1) * 3]
-                                triangle = [(node_indices[0],
-                                            node_coords_map[node_indices[0]]),
-                                            (node_indices[1],
-                                            node_coords_map[node_indices[1]]),
-                                            (node_indices[2],
-                                            node_coords_map[node_indices[2]])]
-                                triangles.append((elem_tags[i], triangle))
-                    surface_map[surf_tag] = triangles
-                return surface_map
-
-            if obj_type == 'volume':
-                volumes = gmsh.model.getEntities(dim=3)
-                treedict = {}
-
-                entities = volumes if volumes else gmsh.model.getEntities(dim=2)
-
-                for dim, tag in entities:
-                    surfaces = gmsh.model.getBoundary([(dim, tag)], oriented=False, recursive=False) if volumes else [(dim, tag)]
-
-                    surface_map = {}
-                    for surf_dim, surf_tag in surfaces:
-                        element_types, element_tags, node_tags = gmsh.model.mesh.getElements(
-                            surf_dim, surf_tag)
-
-                        triangles = []
-                        for elem_type, elem_tags, elem_node_tags in zip(
-                                element_types, element_tags, node_tags):
-                            if elem_type == 2:  # 2nd type for the triangles
-                                for i in range(len(elem_tags)):
-                                    node_indices = elem_node_tags[i * 3:(i + 1) * 3]
-                                    triangle = [(node_indices[0],
-                                                node_coords_map[node_indices[0]]),
-                                                (node_indices[1],
-                                                node_coords_map[node_indices[1]]),
-                                                (node_indices[2],
-                                                node_coords_map[node_indices[2]])]
-                                    triangles.append((elem_tags[i], triangle))
-                        surface_map[surf_tag] = triangles
-                    treedict[tag] = surface_map
-                return treedict
-
-            raise ValueError("Invalid obj_type. Must be one of 'point', 'line', 'surface', 'volume'.")
+            # Mesh file is read into its own model of the session, otherwise the current model is used
+            with GmshSession.use_model(MESH_TREE_GMSH_MODEL) if mesh_filename else nullcontext():
+                if mesh_filename:
+                    gmsh.merge(mesh_filename)
+                gmsh.model.occ.synchronize()
+
+                # Getting all the nodes and their coordinates
+                all_node_tags, all_node_coords, _ = gmsh.model.mesh.getNodes()
+                mesh_tree = MeshTreeData(obj_type, all_node_tags, all_node_coords)
+
+                if obj_type == 'line':
+                    line_tags, line_node_tags = [], []
+                    for line_dim, line_tag in gmsh.model.getEntities(dim=1):
+                        element_types, element_tags, node_tags = gmsh.model.mesh.getElements(line_dim, line_tag)
+                        for elem_type, elem_tags, elem_node_tags in zip(element_types, element_tags, node_tags):
+                            if elem_type == 1:  # 1st type for lines
+                                line_tags.append(elem_tags)
+                                line_node_tags.append(elem_node_tags)
+                    if line_tags:
+                        mesh_tree.set_lines(np.concatenate(line_tags), np.concatenate(line_node_tags))
+
+                elif obj_type in ('surface', 'volume'):
+                    volumes = gmsh.model.getEntities(dim=3) if obj_type == 'volume' else []
+                    entities = volumes if volumes else gmsh.model.getEntities(dim=2)
+
+                    for dim, tag in entities:
+                        surfaces = gmsh.model.getBoundary([(dim, tag)], oriented=False, recursive=False) if volumes else [(dim, tag)]
+                        mesh_tree.volumes[tag] = [surf_tag for _, surf_tag in surfaces]
+
+                        for surf_dim, surf_tag in surfaces:
+                            if surf_tag in mesh_tree.surfaces:
+                                continue
+
+                            triangle_tags, triangle_node_tags = [], []
+                            element_types, element_tags, node_tags = gmsh.model.mesh.getElements(surf_dim, surf_tag)
+                            for elem_type, elem_tags, elem_node_tags in zip(element_types, element_tags, node_tags):
+                                if elem_type == 2:  # 2nd type for the triangles
+                                    triangle_tags.append(elem_tags)
+                                    triangle_node_tags.append(elem_node_tags)
+
+                            if triangle_tags:
+                                mesh_tree.add_surface(surf_tag, np.concatenate(triangle_tags), np.concatenate(triangle_node_tags))
+                            else:
+                                mesh_tree.add_surface(surf_tag, [], [])
+
+                return mesh_tree
 
         except Exception as e:
             raise RuntimeError(f"An error occurred while processing the Gmsh data: {e}")
+    
+    @staticmethod
+    def get_tree_dict(mesh_filename: str = None, obj_type: str = 'volume') -> MeshTreeDict:
+        """
+        Extracts the data from Gmsh and returns it in a structured format.
+
+        Parameters:
+        mesh_filename (str): The filename of the Gmsh mesh file to read.
+        obj_type (str): The type of object to extract ('point', 'line', 'surface', 'volume').
+
+        Returns:
+        MeshTreeDict: A lazy read-only dictionary representing the object map, backed by `MeshTreeData`
+                      (available as its `mesh_tree` attribute).
+
+        Raises:
+        ValueError: If the obj_type is invalid.
+        RuntimeError: If there is an error opening the mesh file or processing the Gmsh data.
+        """
+        return MeshTreeManager.get_mesh_tree(mesh_filename, obj_type).tree_dict()
 
     @staticmethod
-    def write_treedict_to_vtk(treedict: dict, filename: str) -> bool:
+    def create_unstructured_grid(mesh_tree: MeshTreeData) -> vtkUnstructuredGrid:
+        """
+        Builds the triangle grid of all the surfaces from the arrays. Nodes shared by the surfaces
+        are written once, nodes that aren't used by any triangle are skipped.
+        """
+        surface_tags = [surface_tag for surfaces in mesh_tree.volumes.values() for surface_tag in surfaces]
+        triangles = [mesh_tree.surfaces[surface_tag][1] for surface_tag in surface_tags]
+        triangles = np.concatenate(triangles) if triangles else np.empty((0, 3), dtype=np.int64)
+        used_rows, local_rows = np.unique(triangles.reshape(-1), return_inverse=True)
+
+        ugrid = vtkUnstructuredGrid()
+        ugrid.SetPoints(create_vtk_points(mesh_tree.node_coords[used_rows]))
+        ugrid.SetCells(VTK_TRIANGLE, create_vtk_cell_array(local_rows.reshape(-1, 3)))
+        return ugrid
+
+    @staticmethod
+    def write_treedict_to_vtk(treedict: dict, filename: str, compressor: str = 'zlib', appended: bool = False) -> tuple:
         """
         Writes the object map to a VTK file.
 
+        Files with the '.vtu' extension are written as the binary XML unstructured grid,
+        all the others as the legacy binary VTK ('.vtk' is added if it's missing).
+
         Args:
             treedict (dict): The object map containing mesh data.
             filename (str): The filename to write the VTK file to.
+            compressor (str): Compression of the '.vtu' data: 'zlib', 'lz4', 'lzma' or None.
+            appended (bool): Write the '.vtu' data as one raw appended block instead of the inline base64 arrays.
 
         Returns:
-            bool: True if the file was successfully written, False otherwise.
+            tuple: (True if the file was successfully written, the filename).
         """
         try:
-            if not filename.endswith('.vtk'):
+            is_xml = filename.endswith('.vtu')
+            if not is_xml and not filename.endswith('.vtk'):
                 filename += '.vtk'
 
-            points = vtkPoints()
-            points.SetDataTypeToDouble()
-            triangles = vtkCellArray()
-            ugrid = vtkUnstructuredGrid()
-
-            point_index_map = {}
-            current_index = 0
-
-            for volume_id, surfaces in treedict.items():
-                for surface_id, triangle_data in surfaces.items():
-                    for triangle_id, triangle in triangle_data:
-                        pts = []
-                        for node_id, point in triangle:
-                            if node_id not in point_index_map:
-                                points.InsertNextPoint(point)
-                                point_index_map[node_id] = current_index
-                                current_index += 1
-                            pts.append(point_index_map[node_id])
-                        triangle_cell = vtkTriangle()
-                        triangle_cell.GetPointIds().SetId(0, pts[0])
-                        triangle_cell.GetPointIds().SetId(1, pts[1])
-                        triangle_cell.GetPointIds().SetId(2, pts[2])
-                        triangles.InsertNextCell(triangle_cell)
-
-            ugrid.SetPoints(points)
-            ugrid.SetCells(VTK_TRIANGLE, triangles)
-
-            writer = vtkUnstructuredGridWriter()
+            ugrid = MeshTreeManager.create_unstructured_grid(MeshTreeData.from_tree_dict(treedict, 'volume'))
+
+            if is_xml:
+                writer = vtkXMLUnstructuredGridWriter()
+                writer.SetDataModeToBinary()
+                if appended:
+                    writer.SetDataModeToAppended()
+                    writer.EncodeAppendedDataOff()
+
+                if compressor == 'zlib':
+                    writer.SetCompressorTypeToZLib()
+                elif compressor == 'lz4':
+                    writer.SetCompressorTypeToLZ4()
+                elif compressor == 'lzma':
+                    writer.SetCompressorTypeToLZMA()
+                elif compressor is None:
+                    writer.SetCompressorTypeToNone()
+                else:
+                    raise ValueError(f"Unknown compressor '{compressor}'. Must be one of 'zlib', 'lz4', 'lzma' or None.")
+            else:
+                writer = vtkUnstructuredGridWriter()
+                writer.SetFileTypeToBinary()
+
             writer.SetFileName(filename)
             writer.SetInputData(ugrid)
 
-            writer.Write()
+            if not writer.Write():
+                raise RuntimeError(f"VTK writer failed to write {filename}")
             return True, filename
 
         except Exception as e:
             print(f"Error writing VTK file: {e}")
             return False, filename
 
+    @staticmethod
+    def create_actor(poly_data) -> vtkActor:
+        mapper = vtkPolyDataMapper()
+        mapper.SetInputData(poly_data)
+
+        actor = vtkActor()
+        actor.SetMapper(mapper)
+        actor.GetProperty().SetColor(DEFAULT_ACTOR_COLOR)
+        return actor
+
     @staticmethod
     def create_actors_from_tree_dict(treedict: dict, objType: str) -> list:
         """
         Create VTK actors for each surface, volume, or line in the object map.
 
+        Surfaces are built in bulk from the connectivity arrays: node rows are remapped to the local point
+        indices with NumPy and passed to VTK without per-point/per-cell calls. Remapping of the separate
+        surfaces runs in a thread pool, VTK objects are created in the calling thread.
+
         Parameters:
         treedict (dict): The object map generated by the getTreeDict function, which contains volumes,
                         surfaces, triangles, and their nodes with coordinates.
@@ -197,127 +211,37 @@ class MeshTreeManager:
         Returns:
         list: List of the VTK actors.
         """
+        mesh_tree = MeshTreeData.from_tree_dict(treedict, objType)
         actors = []
 
-        if objType == 'volume':
-            for _, surfaces in treedict.items():
-                for surface_tag, triangles in surfaces.items():
-                    points = vtkPoints()
-                    triangles_array = vtkCellArray()
-
-                    # Dictionary to map node tags to point IDs in vtkPoints
-                    point_id_map = {}
-
-                    for triangle_tag, nodes in triangles:
-                        point_ids = []
-                        for node_tag, coords in nodes:
-                            if node_tag not in point_id_map:
-                                point_id = points.InsertNextPoint(coords)
-                                point_id_map[node_tag] = point_id
-                            else:
-                                point_id = point_id_map[node_tag]
-                            point_ids.append(point_id)
-
-                        # Create a VTK triangle and add it to the vtkCellArray
-                        triangle = vtkTriangle()
-                        for i, point_id in enumerate(point_ids):
-                            triangle.GetPointIds().SetId(i, point_id)
-                        triangles_array.InsertNextCell(triangle)
-
-                    poly_data = vtkPolyData()
-                    poly_data.SetPoints(points)
-                    poly_data.SetPolys(triangles_array)
-                    mapper = vtkPolyDataMapper()
-                    mapper.SetInputData(poly_data)
-
-                    # Create a vtkActor to represent the surface in the scene
-                    actor = vtkActor()
-                    actor.SetMapper(mapper)
-                    actor.GetProperty().SetColor(DEFAULT_ACTOR_COLOR)
-
-                    # Add the actor to the list
-                    actors.append(actor)
-
-        elif objType == 'surface':
-            for surface_tag, triangles in treedict.items():
-                points = vtkPoints()
-                triangles_array = vtkCellArray()
-
-                # Dictionary to map node tags to point IDs in vtkPoints
-                point_id_map = {}
-
-                for triangle_tag, nodes in triangles:
-                    point_ids = []
-                    for node_tag, coords in nodes:
-                        if node_tag not in point_id_map:
-                            point_id = points.InsertNextPoint(coords)
-                            point_id_map[node_tag] = point_id
-                        else:
-                            point_id = point_id_map[node_tag]
-                        point_ids.append(point_id)
-
-                    # Create a VTK triangle and add it to the vtkCellArray
-                    triangle = vtkTriangle()
-                    for i, point_id in enumerate(point_ids):
-                        triangle.GetPointIds().SetId(i, point_id)
-                    triangles_array.InsertNextCell(triangle)
-
-                poly_data = vtkPolyData()
-                poly_data.SetPoints(points)
-                poly_data.SetPolys(triangles_array)
-                mapper = vtkPolyDataMapper()
-                mapper.SetInputData(poly_data)
+        if objType in ('volume', 'surface'):
+            if objType == 'volume':
+                surface_tags = [surface_tag for surfaces in mesh_tree.volumes.values() for surface_tag in surfaces]
+            else:
+                surface_tags = list(mesh_tree.surfaces)
 
-                # Create a vtkActor to represent the surface in the scene
-                actor = vtkActor()
-                actor.SetMapper(mapper)
-                actor.GetProperty().SetColor(DEFAULT_ACTOR_COLOR)
+            if len(surface_tags) > 1:
+                with ThreadPoolExecutor() as executor:
+                    surface_arrays = list(executor.map(mesh_tree.surface_arrays, surface_tags))
+            else:
+                surface_arrays = [mesh_tree.surface_arrays(surface_tag) for surface_tag in surface_tags]
 
-                # Add the actor to the list
-                actors.append(actor)
+            for points, triangles in surface_arrays:
+                actors.append(MeshTreeManager.create_actor(create_polydata_from_arrays(points, triangles)))
 
         elif objType == 'line':
-            for line_tag, points in treedict.items():
-                vtk_points = vtkPoints()
-                poly_line = vtkPolyLine()
-                poly_line.GetPointIds().SetNumberOfIds(len(points))
-
-                # Dictionary to map node tags to point IDs in vtkPoints
-                point_id_map = {}
-
-                for i, (node_tag, coords) in enumerate(points):
-                    if node_tag not in point_id_map:
-                        point_id = vtk_points.InsertNextPoint(coords)
-                        point_id_map[node_tag] = point_id
-                    else:
-                        point_id = point_id_map[node_tag]
-
-                    poly_line.GetPointIds().SetId(i, point_id)
-
-                lines_array = vtkCellArray()
-                lines_array.InsertNextCell(poly_line)
-
+            # Each line element is a separate actor with 2 points
+            line_cell = create_vtk_cell_array(np.array([[0, 1]]))
+            for nodes in mesh_tree.lines:
                 poly_data = vtkPolyData()
-                poly_data.SetPoints(vtk_points)
-                poly_data.SetLines(lines_array)
-                mapper = vtkPolyDataMapper()
-                mapper.SetInputData(poly_data)
-
-                # Create a vtkActor to represent the line in the scene
-                actor = vtkActor()
-                actor.SetMapper(mapper)
-                actor.GetProperty().SetColor(DEFAULT_ACTOR_COLOR)
-
-                # Add the actor to the list
-                actors.append(actor)
+                poly_data.SetPoints(create_vtk_points(mesh_tree.node_coords[nodes]))
+                poly_data.SetLines(line_cell)
+                actors.append(MeshTreeManager.create_actor(poly_data))
 
         elif objType == 'point':
-            for point_tag, coords in treedict.items():
-                vtk_points = vtkPoints()
-                vtk_points.InsertNextPoint(coords)
-
+            for row in range(len(mesh_tree.node_tags)):
                 poly_data = vtkPolyData()
-                poly_data.SetPoints(vtk_points)
+                poly_data.SetPoints(create_vtk_points(mesh_tree.node_coords[row:row + 1]))
 
                 glyph_filter = vtkVertexGlyphFilter()
                 glyph_filter.SetInputData(poly_data)
@@ -346,7 +270,8 @@ class MeshTreeManager:
         treedict (dict): The object map generated by the getTreeDict function, which contains volumes,
                         surfaces, triangles, and their nodes with coordinates.
         object_idx (int): Index of the object.
-        tree_model (QStandardItemModel): The QStandardItemModel where the hierarchical data will be inserted.
+        tree_model (QStandardItemModel): The model where the hierarchical data will be inserted. Surfaces get their
+                                         triangles on demand if it is a LazyMeshTreeModel.
         tree_view (QTreeView): The QTreeView where the tree model will be displayed.
         type (str): The type of the object, which can be 'volume', 'surface', or 'line'.
 
@@ -358,7 +283,8 @@ class MeshTreeManager:
 
         if type == 'volume':
             # Case when treedict contains volumes
-            for _, surfaces in treedict.items():
+            mesh_tree = MeshTreeData.from_tree_dict(treedict, type)
+            for _, surface_tags in mesh_tree.volumes.items():
                 # Add the volume node to the tree model
                 volume_item = QStandardItem(f'Volume[{object_idx}]')
                 tree_model.appendRow(volume_item)
@@ -367,66 +293,22 @@ class MeshTreeManager:
                 volume_index = tree_model.indexFromItem(volume_item)
                 root_row_index = volume_index.row()
 
-                for surface_tag, triangles in surfaces.items():
-                    # Add the surface node to the tree model under the volume node
-                    surface_item = QStandardItem(f'Surface[{surface_tag}]')
-                    volume_item.appendRow(surface_item)
-
-                    for triangle_tag, nodes in triangles:
-                        # Add the triangle node to the tree model under the surface node
-                        triangle_item = QStandardItem(f'Triangle[{triangle_tag}]')
-                        surface_item.appendRow(triangle_item)
-
-                        # Generate lines for the triangle
-                        lines = [(nodes[0], nodes[1]), (nodes[1], nodes[2]),
-                                (nodes[2], nodes[0])]
-
-                        for line_idx, (start, end) in enumerate(lines, start=1):
-                            # Add the line node under the triangle node
-                            line_item = QStandardItem(f'Line[{line_idx}]')
-                            triangle_item.appendRow(line_item)
-
-                            # Add the point data under the line node
-                            start_str = f'Point[{start[0]}]: {start[1]}'
-                            end_str = f'Point[{end[0]}]: {end[1]}'
-                            start_item = QStandardItem(start_str)
-                            end_item = QStandardItem(end_str)
-                            line_item.appendRow(start_item)
-                            line_item.appendRow(end_item)
+                # Triangles with their lines and points are created only when the surface is expanded
+                volume_item.appendRows([LazyMeshTreeModel.create_surface_item(f'Surface[{surface_tag}]', mesh_tree, surface_tag)
+                                        for surface_tag in surface_tags])
 
         elif type == 'surface':
             # Case when treedict contains surfaces directly
-            for surface_tag, triangles in treedict.items():
+            mesh_tree = MeshTreeData.from_tree_dict(treedict, type)
+            for surface_tag in mesh_tree.surfaces:
                 # Add the surface node to the tree model
-                surface_item = QStandardItem(f'Surface[{surface_tag}]')
+                surface_item = LazyMeshTreeModel.create_surface_item(f'Surface[{surface_tag}]', mesh_tree, surface_tag)
                 tree_model.appendRow(surface_item)
 
                 # Get the index of the surface item
                 surface_index = tree_model.indexFromItem(surface_item)
                 root_row_index = surface_index.row()
 
-                for triangle_tag, nodes in triangles:
-                    # Add the triangle node to the tree model under the surface node
-                    triangle_item = QStandardItem(f'Triangle[{triangle_tag}]')
-                    surface_item.appendRow(triangle_item)
-
-                    # Generate lines for the triangle
-                    lines = [(nodes[0], nodes[1]), (nodes[1], nodes[2]),
-                            (nodes[2], nodes[0])]
-
-                    for line_idx, (start, end) in enumerate(lines, start=1):
-                        # Add the line node under the triangle node
-                        line_item = QStandardItem(f'Line[{line_idx}]')
-                        triangle_item.appendRow(line_item)
-
-                        # Add the point data under the line node
-                        start_str = f'Point[{start[0]}]: {start[1]}'
-                        end_str = f'Point[{end[0]}]: {end[1]}'
-                        start_item = QStandardItem(start_str)
-                        end_item = QStandardItem(end_str)
-                        line_item.appendRow(start_item)
-                        line_item.appendRow(end_item)
-
         elif type == 'line':
             # Case when treedict contains lines directly
             for line_tag, points in treedict.items():
@@ -459,36 +341,39 @@ class MeshTreeManager:
             return rows
         
     @staticmethod
-    def form_actor_nodes_dictionary(treedict: dict, actor_rows: dict, objType: str):
-        actor_nodes_dict = {}
+    def form_actor_nodes_dictionary(treedict: dict, actors: list, objType: str) -> dict:
+        """
+        Maps the actors created by `create_actors_from_tree_dict` to the tags of their nodes.
+        Actors go in the order of the surfaces (lines, points), so the nodes are taken from the
+        surface <-> node index of the mesh without walking the triangles for each actor.
 
-        for actor, (volume_index, surface_index) in actor_rows.items():
-            if actor not in actor_nodes_dict:
-                actor_nodes_dict[actor] = set()
+        Parameters:
+        treedict (dict): The object map the actors were created from.
+        actors (list): Actors returned by `create_actors_from_tree_dict` for this object map.
+        objType (str): The type of the object, which can be 'volume', 'surface', 'line' or 'point'.
 
-            if objType == 'volume':
-                for volume_tag, surfaces in treedict.items():
-                    for surface_tag, triangles in surfaces.items():
-                        if surface_tag - 1 == surface_index:
-                            for triangle_tag, nodes in triangles:
-                                for node in nodes:
-                                    actor_nodes_dict[actor].add(node[0])
-            elif objType == 'surface':
-                for surface_tag, triangles in treedict.items():
-                    if surface_tag - 1 == surface_index:
-                        for triangle_tag, nodes in triangles:
-                            for node in nodes:
-                                actor_nodes_dict[actor].add(node[0])
-            elif objType == 'line':
-                for line_tag, line_nodes in treedict.items():
-                    if surface_index == int(line_tag.split('[')[1][:-1]):
-                        for node in line_nodes:
-                            actor_nodes_dict[actor].add(node[0])
-            elif objType == 'point':
-                if f'Point[{surface_index}]' in treedict:
-                    actor_nodes_dict[actor].add(surface_index)
-
-        return actor_nodes_dict
+        Returns:
+        dict: Actor -> sorted unique node tags (np.ndarray).
+        """
+        mesh_tree = MeshTreeData.from_tree_dict(treedict, objType)
+
+        if objType in ('volume', 'surface'):
+            node_index = mesh_tree.node_index()
+            return {actor: node_index.surface_nodes(surface_tag) for actor, surface_tag in zip(actors, mesh_tree.surface_tags())}
+        if objType == 'line':
+            return {actor: np.unique(mesh_tree.node_tags[nodes]) for actor, nodes in zip(actors, mesh_tree.lines)}
+        return {actor: mesh_tree.node_tags[row:row + 1] for actor, row in zip(actors, range(len(mesh_tree.node_tags)))}
+
+    @staticmethod
+    def form_surface_actors_dictionary(treedict: dict, actors: list, objType: str):
+        """
+        Returns:
+        tuple: (MeshNodeIndex, dict of surface tag -> actor) for the surface meshes, None for the lines and points.
+        """
+        if objType not in ('volume', 'surface'):
+            return None
+        mesh_tree = MeshTreeData.from_tree_dict(treedict, objType)
+        return mesh_tree.node_index(), dict(zip(mesh_tree.surface_tags(), actors))
     
     @staticmethod
     def copy_children(source_item, target_item):
@@ -536,12 +421,13 @@ class MeshTreeManager:
         MeshTreeManager.rename_first_selected_row(model, volume_row, surface_indices)
         parent_index = model.index(volume_row, 0)
 
-        # Copying the hierarchy from the rest of the selected rows to the first selected row
-        for surface_index in surface_indices[1:]:
-            child_index = model.index(surface_index, 0, parent_index)
-            child_item = model.itemFromIndex(child_index)
-            MeshTreeManager.copy_children(child_item, model.itemFromIndex(
-                model.index(surface_indices[0], 0, parent_index)))
+        # Copying the hierarchy from the rest of the selected rows to the first selected row,
+        # lazy surfaces just take over the sources of the triangles
+        first_item = model.itemFromIndex(model.index(surface_indices[0], 0, parent_index))
+        child_items = [model.itemFromIndex(model.index(surface_index, 0, parent_index)) for surface_index in surface_indices[1:]]
+        if not LazyMeshTreeModel.merge_lazy_items(first_item, child_items):
+            for child_item in child_items:
+                MeshTreeManager.copy_children(child_item, first_item)
 
         # Deleting the rest of the selected rows from the tree view
         for surface_index in surface_indices[1:][::-1]:
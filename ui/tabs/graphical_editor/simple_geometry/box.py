@@ -1,7 +1,5 @@
-from gmsh import initialize, finalize, model, isInitialized
 from vtk import vtkCubeSource, vtkPolyDataMapper, vtkActor, vtkTriangleFilter, vtkLinearSubdivisionFilter
 from logger import LogConsole
-from util import get_cur_datetime
 
 
 class Box:
@@ -29,8 +27,6 @@ class Box:
     -------
     create_box_with_vtk():
         Creates the box using VTK and returns the actor.
-    create_box_with_gmsh():
-        Creates the box using Gmsh.
     __repr__():
         Returns a string representation of the box.
     """
@@ -109,24 +105,6 @@ class Box:
             self.log_console.printError(f"An error occurred while creating the box with VTK: {e}")
             return None
 
-    def create_box_with_gmsh(self):
-        """
-        Creates the box using Gmsh.
-        """
-        try:
-            if not isInitialized():
-                initialize()
-
-            model.add(f"box_{get_cur_datetime()}")
-            model.occ.addBox(self.x, self.y, self.z, self.length, self.width, self.height)
-            model.occ.synchronize()
-        
-        except Exception as e:
-            self.log_console.printError(f"An error occurred while creating the box with Gmsh: {e}")
-        finally:
-            if isInitialized():
-                finalize()
-
     def __repr__(self):
         """
         Returns a string representation of the box.
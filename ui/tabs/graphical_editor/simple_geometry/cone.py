@@ -1,7 +1,5 @@
-from gmsh import initialize, finalize, model, isInitialized
 from vtk import vtkConeSource, vtkActor, vtkPolyDataMapper, vtkTriangleFilter, vtkLinearSubdivisionFilter
 from logger import LogConsole
-from util import get_cur_datetime
 
 class Cone:
     """
@@ -30,8 +28,6 @@ class Cone:
     -------
     create_cone_with_vtk():
         Creates the cone using VTK and returns the actor.
-    create_cone_with_gmsh():
-        Creates the cone using Gmsh.
     __repr__():
         Returns a string representation of the cone.
     """
@@ -110,24 +106,6 @@ class Cone:
             self.log_console.printError(f"An error occurred while creating the cone with VTK: {e}")
             return None
 
-    def create_cone_with_gmsh(self):
-        """
-        Creates the cone using Gmsh.
-        """
-        try:
-            if not isInitialized():
-                initialize()
-
-            model.add(f"cone_{get_cur_datetime()}")
-            model.occ.addCone(self.x, self.y, self.z, self.dx, self.dy, self.dz, self.r, 0)
-            model.occ.synchronize()
-        
-        except Exception as e:
-            self.log_console.printError(f"An error occurred while creating the cone with Gmsh: {e}")
-        finally:
-            if isInitialized():
-                finalize()
-
     def __repr__(self):
         """
         Returns a string representation of the cone.
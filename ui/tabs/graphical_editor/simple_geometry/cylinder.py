@@ -1,7 +1,5 @@
-from gmsh import initialize, finalize, model, isInitialized
 from vtk import vtkCylinderSource, vtkPolyDataMapper, vtkActor, vtkTriangleFilter, vtkLinearSubdivisionFilter
 from logger import LogConsole
-from util import get_cur_datetime
 from .simple_geometry_constants import DEFAULT_CYLINDER_RESOLUTION
 
 
@@ -34,8 +32,6 @@ class Cylinder:
     -------
     create_cylinder_with_vtk():
         Creates the cylinder using VTK and returns the actor.
-    create_cylinder_with_gmsh():
-        Creates the cylinder using 
     __repr__():
         Returns a string representation of the cylinder.
     """
@@ -124,27 +120,6 @@ class Cylinder:
             self.log_console.printError(
                 f"An error occurred while creating the cylinder with VTK: {e}")
 
-    def create_cylinder_with_gmsh(self):
-        """
-        Creates the cylinder using Gmsh.
-        """
-        try:
-            if not isInitialized():
-                initialize()
-
-            model.add(f"cylinder_{get_cur_datetime()}")
-            model.occ.addCylinder(self.x, self.y, self.z, self.dx, self.dy, self.dz, self.radius)
-            model.occ.synchronize()
-
-            finalize()
-        except Exception as e:
-            self.log_console.printError(
-                f"An error occurred while creating the cylinder with Gmsh: {e}"
-            )
-        finally:
-            if isInitialized():
-                finalize()
-
     def __repr__(self):
         """
         Returns a string representation of the cylinder.
@@ -1,7 +1,5 @@
-from gmsh import initialize, finalize, model, isInitialized
 from vtk import vtkPoints, vtkPolyLine, vtkCellArray, vtkPolyData, vtkPolyDataMapper, vtkActor
 from logger import LogConsole
-from util import get_cur_datetime
 
 
 class Line:
@@ -19,8 +17,6 @@ class Line:
     -------
     create_line_with_vtk():
         Creates the line using VTK and returns the actor.
-    create_line_with_gmsh():
-        Creates the line using 
     can_create_line():
         Checks if the line can be created with the specified points.
     __repr__():
@@ -81,29 +77,6 @@ class Line:
             self.log_console.printError(
                 f"An error occurred while creating the line with VTK: {e}")
 
-    def create_line_with_gmsh(self):
-        """
-        Creates the line using Gmsh.
-        """
-        try:
-            if not isInitialized():
-                initialize()
-
-            model.add(f"line_{get_cur_datetime()}")
-            for idx, (x, y, z) in enumerate(self.points, start=1):
-                model.occ.addPoint(x, y, z)
-            for i in range(len(self.points) - 1):
-                model.occ.addLine(i + 1, i + 2)
-            model.occ.synchronize()
-
-            finalize()
-        except Exception as e:
-            self.log_console.printError(
-                f"An error occurred while creating the line with Gmsh: {e}")
-        finally:
-            if isInitialized():
-                finalize()
-
     def __repr__(self):
         """
         Returns a string representation of the line.
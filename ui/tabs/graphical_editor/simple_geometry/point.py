@@ -1,7 +1,5 @@
-from gmsh import initialize, finalize, model, isInitialized
 from vtk import vtkPoints, vtkVertexGlyphFilter, vtkPolyData, vtkPolyDataMapper, vtkActor, vtkCellArray
 from logger import LogConsole
-from util import get_cur_datetime
 
 
 class Point:
@@ -23,8 +21,6 @@ class Point:
     -------
     create_point_with_vtk():
         Creates the point using VTK and returns the actor.
-    create_point_with_gmsh():
-        Creates the point using Gmsh.
     __repr__():
         Returns a string representation of the point.
     """
@@ -81,26 +77,6 @@ class Point:
             self.log_console.printError(
                 f"An error occurred while creating the point with VTK: {e}")
 
-    def create_point_with_gmsh(self):
-        """
-        Creates the point using Gmsh.
-        """
-        try:
-            if not isInitialized():
-                initialize()
-
-            model.add(f"point_{get_cur_datetime()}")
-            model.occ.addPoint(self.x, self.y, self.z)
-            model.occ.synchronize()
-
-            finalize()
-        except Exception as e:
-            self.log_console.printError(
-                f"An error occurred while creating the point with Gmsh: {e}")
-        finally:
-            if isInitialized():
-                finalize()
-
     def __repr__(self):
         """
         Returns a string representation of the point.
@@ -1,9 +1,9 @@
-from gmsh import initialize, finalize, isInitialized, model, option, write
+from gmsh import model, option, write
 from . import *
 from vtk import vtkActor
 from logger import LogConsole, InternalLogger
 from styles import DEFAULT_ACTOR_COLOR
-from util import get_cur_datetime
+from util import get_cur_datetime, GmshSession
 
 POINT_OBJ_STR = 'point'
 LINE_OBJ_STR = 'line'
@@ -71,7 +71,6 @@ class SimpleGeometryManager:
         try:
             point = Point(log_console, x, y, z)
             point_data_str = repr(point)
-            point.create_point_with_gmsh()
             point_actor = point.create_point_with_vtk()
 
             SimpleGeometryManager.simple_geometry_objects.append((POINT_OBJ_STR, (x, y, z)))
@@ -92,7 +91,6 @@ class SimpleGeometryManager:
         try:
             line = Line(log_console, points)
             line_data_str = repr(line)
-            line.create_line_with_gmsh()
             line_actor = line.create_line_with_vtk()
             
             SimpleGeometryManager.simple_geometry_objects.append((LINE_OBJ_STR, points))
@@ -113,7 +111,6 @@ class SimpleGeometryManager:
         try:
             surface = Surface(log_console, points)
             surface_data_str = repr(surface)
-            surface.create_surface_with_gmsh()
             surface_actor = surface.create_surface_with_vtk()
             
             SimpleGeometryManager.simple_geometry_objects.append((SURFACE_OBJ_STR, points))
@@ -140,7 +137,6 @@ class SimpleGeometryManager:
         try:
             sphere = Sphere(log_console, x, y, z, radius, mesh_resolution, phi_resolution, theta_resolution)
             sphere_data_str = repr(sphere)
-            sphere.create_sphere_with_gmsh()
             sphere_actor = sphere.create_sphere_with_vtk()
             
             SimpleGeometryManager.simple_geometry_objects.append((SPHERE_OBJ_STR, (x, y, z, radius, phi_resolution, theta_resolution)))
@@ -167,7 +163,6 @@ class SimpleGeometryManager:
         try:
             box = Box(log_console, x, y, z, length, width, height, mesh_resolution)
             box_data_str = repr(box)
-            box.create_box_with_gmsh()
             box_actor = box.create_box_with_vtk()
             
             SimpleGeometryManager.simple_geometry_objects.append((BOX_OBJ_STR, (x, y, z, length, width, height)))
@@ -186,7 +181,6 @@ class SimpleGeometryManager:
         try:
             cone = Cone(log_console, x, y, z, dx, dy, dz, height, r, resolution, mesh_resolution)
             cone_data_str = repr(cone)
-            cone.create_cone_with_gmsh()
             cone_actor = cone.create_cone_with_vtk()
             
             SimpleGeometryManager.simple_geometry_objects.append((CONE_OBJ_STR, (x, y, z, dx, dy, dz, r, mesh_resolution)))
@@ -216,7 +210,6 @@ class SimpleGeometryManager:
             cylinder = Cylinder(log_console, x, y, z, radius, dx, dy, dz, mesh_resolution, resolution)
 
             cylinder_data_str = repr(cylinder)
-            cylinder.create_cylinder_with_gmsh()
             cylinder_actor = cylinder.create_cylinder_with_vtk()
             
             SimpleGeometryManager.simple_geometry_objects.append((CYLINDER_OBJ_STR, (x, y, z, radius, dx, dy, dz)))
@@ -276,60 +269,52 @@ class SimpleGeometryManager:
     def save_and_mesh_objects(log_console: LogConsole, mesh_filename: str,
                               mesh_size: float, mesh_dim: int):
         try:
-            if not isInitialized():
-                initialize()
-
-            model.add(f"merged_{'_'.join(obj_name for obj_name, obj_params in SimpleGeometryManager.simple_geometry_objects)}_{get_cur_datetime()}")
-
-            for obj_name, params in SimpleGeometryManager.simple_geometry_objects:
-                if obj_name == POINT_OBJ_STR:
-                    model.occ.addPoint(*params, mesh_size)
-                elif obj_name == LINE_OBJ_STR:
-                    point_ids = []
-                    for point in params:
-                        point_id = model.occ.addPoint(*point, mesh_size)
-                        point_ids.append(point_id)
-                    for i in range(len(point_ids) - 1):
-                        model.occ.addLine(point_ids[i], point_ids[i + 1])
-                elif obj_name == SURFACE_OBJ_STR:
-                    point_ids = []
-                    for point in params:
-                        point_id = model.occ.addPoint(*point, mesh_size)
-                        point_ids.append(point_id)
-                    line_loop = model.occ.addWire(point_ids)
-                    model.occ.addPlaneSurface([line_loop])
-                elif obj_name == SPHERE_OBJ_STR:
-                    x, y, z, radius, phi_resolution, theta_resolution = params
-                    model.occ.addSphere(x, y, z, radius)
-                elif obj_name == BOX_OBJ_STR:
-                    x, y, z, length, width, height = params
-                    model.occ.addBox(x, y, z, length, width, height)
-                elif obj_name == CYLINDER_OBJ_STR:
-                    x, y, z, radius, dx, dy, dz = params
-                    model.occ.addCylinder(x, y, z, radius, dx, dy, dz)
-
-            option.setNumber("Mesh.MeshSizeMin", mesh_size)
-            option.setNumber("Mesh.MeshSizeMax", mesh_size)
-
-            model.occ.synchronize()
-            model.mesh.generate(mesh_dim)
-            
-            write(mesh_filename)
-
-            obj_names = '; '.join(
-                obj_name for obj_name, obj_params in
-                SimpleGeometryManager.simple_geometry_objects)
-            log_console.printInfo(f"Successfully saved and meshed created objects: {obj_names} to the file '{mesh_filename}'")
-            return True
+            with GmshSession.use_model(f"merged_{'_'.join(obj_name for obj_name, obj_params in SimpleGeometryManager.simple_geometry_objects)}_{get_cur_datetime()}"):
+                for obj_name, params in SimpleGeometryManager.simple_geometry_objects:
+                    if obj_name == POINT_OBJ_STR:
+                        model.occ.addPoint(*params, mesh_size)
+                    elif obj_name == LINE_OBJ_STR:
+                        point_ids = []
+                        for point in params:
+                            point_id = model.occ.addPoint(*point, mesh_size)
+                            point_ids.append(point_id)
+                        for i in range(len(point_ids) - 1):
+                            model.occ.addLine(point_ids[i], point_ids[i + 1])
+                    elif obj_name == SURFACE_OBJ_STR:
+                        point_ids = []
+                        for point in params:
+                            point_id = model.occ.addPoint(*point, mesh_size)
+                            point_ids.append(point_id)
+                        line_loop = model.occ.addWire(point_ids)
+                        model.occ.addPlaneSurface([line_loop])
+                    elif obj_name == SPHERE_OBJ_STR:
+                        x, y, z, radius, phi_resolution, theta_resolution = params
+                        model.occ.addSphere(x, y, z, radius)
+                    elif obj_name == BOX_OBJ_STR:
+                        x, y, z, length, width, height = params
+                        model.occ.addBox(x, y, z, length, width, height)
+                    elif obj_name == CYLINDER_OBJ_STR:
+                        x, y, z, radius, dx, dy, dz = params
+                        model.occ.addCylinder(x, y, z, radius, dx, dy, dz)
+
+                option.setNumber("Mesh.MeshSizeMin", mesh_size)
+                option.setNumber("Mesh.MeshSizeMax", mesh_size)
+
+                model.occ.synchronize()
+                model.mesh.generate(mesh_dim)
+
+                write(mesh_filename)
+
+                obj_names = '; '.join(
+                    obj_name for obj_name, obj_params in
+                    SimpleGeometryManager.simple_geometry_objects)
+                log_console.printInfo(f"Successfully saved and meshed created objects: {obj_names} to the file '{mesh_filename}'")
+                return True
 
         except Exception as e:
             log_console.printError(f"Can't save and mesh created objects: {e}")
             return False
 
-        finally:
-            if isInitialized():
-                finalize()
-                
     @staticmethod
     def clear_geometry_objects():
         """
@@ -1,7 +1,5 @@
-from gmsh import initialize, finalize, model, isInitialized
 from vtk import vtkSphereSource, vtkPolyDataMapper, vtkActor, vtkTriangleFilter, vtkLinearSubdivisionFilter
 from logger import LogConsole
-from util import get_cur_datetime
 from .simple_geometry_constants import *
 
 
@@ -32,8 +30,6 @@ class Sphere:
     -------
     create_sphere_with_vtk():
         Creates the sphere using VTK and returns the actor.
-    create_sphere_with_gmsh():
-        Creates the sphere using 
     __repr__():
         Returns a string representation of the sphere.
     """
@@ -115,26 +111,6 @@ class Sphere:
             self.log_console.printError(
                 f"An error occurred while creating the sphere with VTK: {e}")
 
-    def create_sphere_with_gmsh(self):
-        """
-        Creates the sphere using Gmsh.
-        """
-        try:
-            if not isInitialized():
-                initialize()
-
-            model.add(f"sphere_{get_cur_datetime()}")
-            model.occ.addSphere(self.x, self.y, self.z, self.radius)
-            model.occ.synchronize()
-
-            finalize()
-        except Exception as e:
-            self.log_console.printError(
-                f"An error occurred while creating the sphere with Gmsh: {e}")
-        finally:
-            if isInitialized():
-                finalize()
-
     def __repr__(self):
         """
         Returns a string representation of the sphere.
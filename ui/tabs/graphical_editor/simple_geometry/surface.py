@@ -1,7 +1,5 @@
-from gmsh import initialize, finalize, model, isInitialized
 from vtk import vtkPoints, vtkPolygon, vtkCellArray, vtkPolyData, vtkPolyDataMapper, vtkActor, vtkDelaunay2D
 from logger import LogConsole
-from util import get_cur_datetime
 
 
 class Surface:
@@ -19,8 +17,6 @@ class Surface:
     -------
     create_surface_with_vtk():
         Creates the surface using VTK and returns the actor.
-    create_surface_with_gmsh():
-        Creates the surface using Gmsh.
     can_create_surface():
         Checks if the surface can be created with the specified points.
     __repr__():
@@ -81,32 +77,6 @@ class Surface:
             self.log_console.printError(
                 f"An error occurred while creating the surface with VTK: {e}")
 
-    def create_surface_with_gmsh(self):
-        """
-        Creates the surface using Gmsh.
-        """
-        try:
-            if not isInitialized():
-                initialize()
-
-            model.add(f"surface_{get_cur_datetime()}")
-
-            for idx, (x, y, z) in enumerate(self.points, start=1):
-                model.geo.addPoint(x, y, z, tag=idx)
-            for i in range(len(self.points)):
-                model.geo.addLine(i + 1, ((i + 1) % len(self.points)) + 1)
-            loop = model.geo.addCurveLoop(list(range(1, len(self.points) + 1)))
-            model.geo.addPlaneSurface([loop])
-            model.geo.synchronize()
-
-            finalize()
-        except Exception as e:
-            self.log_console.printError(
-                f"An error occurred while creating the surface with Gmsh: {e}")
-        finally:
-            if isInitialized():
-                finalize()
-
     def __repr__(self):
         """
         Returns a string representation of the surface.
@@ -1,3 +1,5 @@
 from .colorbar_manager import *
 from .mesh_visualizer import MeshVisualizer
 from .particle_animator import ParticleAnimator
+from .geometry_cache import GeometryCache
+from .results_loader import ResultsLoader
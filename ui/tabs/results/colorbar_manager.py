@@ -1,9 +1,10 @@
 from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
-from vtk import vtkRenderer, vtkScalarBarActor, vtkLookupTable, vtkFloatArray, vtkStringArray, vtkActor
+from vtk import vtkRenderer, vtkScalarBarActor, vtkFloatArray, vtkStringArray, vtkActor
+from data import MeshData
 
 
 class ColorbarManager:
-    def __init__(self, vtkWidget: QVTKRenderWindowInteractor, renderer: vtkRenderer, mesh_data, actor: vtkActor):
+    def __init__(self, vtkWidget: QVTKRenderWindowInteractor, renderer: vtkRenderer, mesh_data: MeshData, actor: vtkActor):
         self.scalarBar = vtkScalarBarActor()
         self.mesh_data = mesh_data
         self.actor = actor
@@ -32,34 +33,27 @@ class ColorbarManager:
         title_text_property.SetColor(0, 0, 0)
 
     def setup_colormap(self):
-        self.max_count = max(triangle[5] for triangle in self.mesh_data)
+        self.stats = self.mesh_data.counter_stats()
+        self.max_count = self.stats.max
         self.setup_lookup_table()
         self.set_annotations(self.default_num_labels)
         
+    def update_counters(self):
+        # Counters of the mesh data have been swapped: refreshing the cached statistics and the labels
+        self.stats = self.mesh_data.counter_stats()
+        self.max_count = self.stats.max
+        self.set_annotations(self.scalarBar.GetNumberOfLabels())
+        
     def setup_lookup_table(self):
-        self.lookup_table = vtkLookupTable()
-        self.lookup_table.SetNumberOfTableValues(256)
-        self.lookup_table.SetRange(0, self.max_count)
-        for i in range(256):
-            ratio = i / 255.0
-            self.lookup_table.SetTableValue(i, ratio, 0, 1 - ratio)
-        self.lookup_table.Build()
+        # Sharing the lookup table of the mesh actor instead of building another one
+        self.lookup_table = self.actor.GetMapper().GetLookupTable()
 
     def set_annotations(self, num_labels=5):
-        from numpy import round, linspace
-        
         valuesArray = vtkFloatArray()
         annotationsArray = vtkStringArray()
-        unique_values = sorted(set(triangle[5] for triangle in self.mesh_data))
-
-        # Function to pick N evenly spaced elements including the first and the last
-        def pick_n_uniformly(lst, n):
-            if n >= len(lst):
-                return lst
-            indeces = round(linspace(0, len(lst) - 1, n)).astype(int)
-            return [lst[index] for index in indeces]
 
-        uniform_values = pick_n_uniformly(unique_values, num_labels)
+        # N evenly spaced elements (including the first and the last) from the cached unique values
+        uniform_values = self.stats.pick_uniformly(num_labels).tolist()
         for value in uniform_values:
             valuesArray.InsertNextValue(value)
             annotationsArray.InsertNextValue(f"{value}")
@@ -71,9 +65,9 @@ class ColorbarManager:
         self.scalarBar.SetNumberOfLabels(self.default_num_labels)
 
         if range:
-            self.actor.GetMapper().GetLookupTable().SetRange(range[0], range[1])
+            self.lookup_table.SetRange(range[0], range[1])
 
-        self.scalarBar.SetLookupTable(self.actor.GetMapper().GetLookupTable())
+        self.scalarBar.SetLookupTable(self.lookup_table)
         self.renderer.AddActor2D(self.scalarBar)
         
     def apply_scale(self, width: float, height: float):
@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from threading import Thread, Condition
+from data import TrajectoryData
+
+
+class FrameCache:
+    """
+    Bounded LRU cache of the interpolated animation frames.
+
+    Frames are addressed by the global iteration (time step * FPS + frame within the step). Missing frames
+    are computed on demand, and a worker thread precomputes frames ahead of the playhead, so playback and
+    scrubbing mostly copy ready frames into the VTK buffer.
+    """
+
+    def __init__(self, trajectories: TrajectoryData, fps: int, max_bytes: int):
+        self.trajectories = trajectories
+        self.fps = fps
+        self.total_frames = trajectories.max_length() * fps
+
+        frame_bytes = max(len(trajectories) * 3 * 4, 1)
+        self.capacity = max(int(max_bytes // frame_bytes), 2)
+        self.lookahead = self.capacity // 2  # Other half keeps the recently shown frames for scrubbing back
+
+        self.frames = OrderedDict()
+        self.step_cache = {}
+        self.condition = Condition()
+        self.playhead = 0
+        self.scan_from = 1  # Frames in [playhead + 1, scan_from) are already precomputed
+        self.running = True
+        self.worker = Thread(target=self.precompute_frames, daemon=True)
+        self.worker.start()
+
+    def compute_frame(self, iteration, step_cache):
+        """
+        Interpolates positions of all the particles for the specified iteration.
+
+        Args:
+            iteration (int): Global index of the frame.
+            step_cache (dict): Cache of the `step_positions` results of the calling thread.
+
+        Returns:
+            np.ndarray: Positions of the particles, shape (P, 3), float32.
+        """
+        time_step, frame_within_step = divmod(iteration, self.fps)
+        t = 0 if self.fps == 1 else frame_within_step / (self.fps - 1)
+
+        step = step_cache.get(time_step)
+        if step is None:
+            step_cache.clear()
+            step = step_cache[time_step] = self.trajectories.step_positions(time_step)
+        return self.trajectories.interpolate(time_step, t, step=step)
+
+    def store(self, iteration, frame):
+        with self.condition:
+            self.frames[iteration] = frame
+            self.frames.move_to_end(iteration)
+            while len(self.frames) > self.capacity:
+                self.frames.popitem(last=False)
+
+    def frame(self, iteration):
+        """
+        Returns the frame from the cache or computes it right away, and moves the playhead to it,
+        so that the worker starts precomputing the next frames.
+
+        Args:
+            iteration (int): Global index of the frame.
+
+        Returns:
+            np.ndarray: Positions of the particles, shape (P, 3), float32. Must not be modified.
+        """
+        with self.condition:
+            frame = self.frames.get(iteration)
+            if frame is not None:
+                self.frames.move_to_end(iteration)
+            self.move_playhead(iteration)
+
+        if frame is None:
+            frame = self.compute_frame(iteration, self.step_cache)
+            self.store(iteration, frame)
+        return frame
+
+    def precompute_frames(self):
+        step_cache = {}
+        while True:
+            with self.condition:
+                next_iteration = self.next_missing_frame()
+                while self.running and next_iteration is None:
+                    self.condition.wait()
+                    next_iteration = self.next_missing_frame()
+                if not self.running:
+                    return
+
+            self.store(next_iteration, self.compute_frame(next_iteration, step_cache))
+
+    def move_playhead(self, iteration):
+        """
+        Moves the playhead and wakes up the worker. Must be called under the lock.
+        """
+        # Playing forward keeps the already scanned part of the window, seeking elsewhere rescans it
+        if not self.playhead <= iteration < self.scan_from:
+            self.scan_from = iteration + 1
+        self.playhead = iteration
+        self.condition.notify()
+
+    def next_missing_frame(self):
+        """
+        Returns the first frame after the playhead that is not cached yet, or None if the whole lookahead window is ready.
+        Must be called under the lock.
+        """
+        end = min(self.playhead + 1 + self.lookahead, self.total_frames)
+        while self.scan_from < end:
+            if self.scan_from not in self.frames:
+                return self.scan_from
+            self.scan_from += 1
+        return None
+
+    def stop(self):
+        """
+        Stops the worker thread and drops all the cached frames.
+        """
+        with self.condition:
+            self.running = False
+            self.frames.clear()
+            self.condition.notify()
+        self.worker.join()
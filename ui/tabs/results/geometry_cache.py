@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from os.path import abspath
+from threading import Lock
+from data import HDF5Handler, MeshData
+
+
+class GeometryCache:
+    """
+    LRU cache of the built mesh geometry keyed by the result file and the geometry hash stored in it.
+
+    Runs on the same mesh (e.g. parameter sweeps) produce files with the same hash, so only their
+    counters have to be read: triangle arrays and the welded vtkPolyData topology are reused.
+    The cache is shared between the loader threads, so all the accesses are locked.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    @staticmethod
+    def key(handler: HDF5Handler):
+        """
+        Returns:
+            tuple or None: (absolute path of the file, geometry hash) or None if the file has no hash.
+        """
+        geometry_hash = handler.geometry_hash()
+        if geometry_hash is None:
+            return None
+        return abspath(handler.filename), geometry_hash
+
+    def get(self, key):
+        """
+        Returns:
+            tuple or None: (MeshData with the cached triangles, topology vtkPolyData without scalars).
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, mesh_data: MeshData, topology):
+        with self.lock:
+            self.entries[key] = (mesh_data, topology)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
@@ -1,14 +1,16 @@
 from vtk import (
     vtkRenderer, vtkRenderWindowInteractor,
-    vtkPoints, vtkPolyData, vtkCellArray, vtkTriangle,
-    vtkFloatArray, vtkPolyDataMapper, vtkActor, vtkLookupTable
+    vtkPolyDataMapper, vtkActor
 )
+from data import MeshData
+from util.vtk_helpers import weld_vertices, create_polydata_from_arrays, create_blue_red_lookup_table
 
 
 class MeshVisualizer:
-    def __init__(self, renderer: vtkRenderer, mesh_data):
+    def __init__(self, renderer: vtkRenderer, mesh_data: MeshData):
         self.mesh_data = mesh_data
-        self.max_count = max(triangle[5] for triangle in self.mesh_data)
+        self.stats = mesh_data.counter_stats()
+        self.max_count = self.stats.max
         
         self.setup_ui(renderer)
     
@@ -25,40 +27,45 @@ class MeshVisualizer:
         self.interactor.SetRenderWindow(self.renderer.GetRenderWindow())
         
     def setup_lookup_table(self):
-        self.lookup_table = vtkLookupTable()
-        self.lookup_table.SetNumberOfTableValues(256)
-        self.lookup_table.SetRange(0, self.max_count)
-        for i in range(256):
-            ratio = i / 255.0
-            self.lookup_table.SetTableValue(i, ratio, 0, 1 - ratio)
-        self.lookup_table.Build()
+        self.lookup_table = create_blue_red_lookup_table(self.max_count)
     
-    def render_mesh(self):
-        points = vtkPoints()
-        cells = vtkCellArray()
-        scalars = vtkFloatArray()
-        scalars.SetNumberOfComponents(1)
-
-        for meshTriangle in self.mesh_data:
-            point_ids = []
-            for vertex in meshTriangle[1:4]:
-                point_id = points.InsertNextPoint(vertex)
-                point_ids.append(point_id)
-
-            # Create a triangle cell
-            triangle = vtkTriangle()
-            triangle.GetPointIds().SetId(0, point_ids[0])
-            triangle.GetPointIds().SetId(1, point_ids[1])
-            triangle.GetPointIds().SetId(2, point_ids[2])
-            cells.InsertNextCell(triangle)
-
-            # Add the scalar value for the triangle
-            scalars.InsertNextValue(meshTriangle[5])
-
+    @staticmethod
+    def build_topology(mesh_data: MeshData):
+        """
+        Builds the triangle polydata without scalars. It doesn't touch the renderer,
+        so it can be called from a worker thread.
+        """
+        # Welding coincident vertices of the adjacent triangles
+        points, inverse = weld_vertices(mesh_data.coordinates.reshape(-1, 3))
+        return create_polydata_from_arrays(points, inverse.reshape(-1, 3))
+    
+    @staticmethod
+    def attach_counters(topology, counters):
+        """
+        Creates polydata that shares points and cells with `topology` and has the counters as cell scalars.
+        """
+        from numpy import float32
+        from vtk import vtkPolyData
+        from vtkmodules.util.numpy_support import numpy_to_vtk
+        
         polyData = vtkPolyData()
-        polyData.SetPoints(points)
-        polyData.SetPolys(cells)
+        polyData.ShallowCopy(topology)
+
+        # Scalar value for each triangle
+        scalars = numpy_to_vtk(counters.astype(float32), deep=False)
         polyData.GetCellData().SetScalars(scalars)
+        return polyData
+    
+    @staticmethod
+    def build_polydata(mesh_data: MeshData):
+        """
+        Builds the triangle polydata with the counters as cell scalars.
+        """
+        return MeshVisualizer.attach_counters(MeshVisualizer.build_topology(mesh_data), mesh_data.counters)
+    
+    def render_mesh(self, polyData=None):
+        if polyData is None:
+            polyData = self.build_polydata(self.mesh_data)
 
         mapper = vtkPolyDataMapper()
         mapper.SetInputData(polyData)
@@ -69,4 +76,28 @@ class MeshVisualizer:
         actor.SetMapper(mapper)
         self.renderer.AddActor(actor)
         
+        self.polyData = polyData
+        self.mapper = mapper
         return actor
+    
+    def update_counters(self, counters):
+        """
+        Swaps the counters of the rendered mesh without rebuilding the geometry.
+
+        Args:
+            counters (np.ndarray): New counters in the order of `mesh_data` triangles.
+        """
+        from numpy import copyto
+        from vtkmodules.util.numpy_support import vtk_to_numpy
+        
+        self.mesh_data.set_counters(counters)
+        self.stats = self.mesh_data.counter_stats()
+        self.max_count = self.stats.max
+        
+        # Scalars share the buffer with NumPy, so the new values are written straight into it
+        scalars = self.polyData.GetCellData().GetScalars()
+        copyto(vtk_to_numpy(scalars), counters, casting='unsafe')
+        scalars.Modified()
+        
+        self.lookup_table.SetRange(0, self.max_count)
+        self.mapper.SetScalarRange(0, self.max_count)
@@ -1,9 +1,16 @@
 from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QDialog, QInputDialog
-from vtk import vtkPoints, vtkPolyDataMapper, vtkActor, vtkVertexGlyphFilter, vtkPolyData
+from vtk import vtkPolyDataMapper, vtkActor, vtkVertexGlyphFilter, vtkPolyData
 from styles import DEFAULT_PARTICLE_ACTOR_COLOR, DEFAULT_PARTICLE_ACTOR_SIZE
 from logger import LogConsole
+from data import TrajectoryData
+from util.vtk_helpers import create_vtk_points, create_vtk_cell_array
+from constants import (
+    DEFAULT_PARTICLE_MOVEMENTS_FILE, DEFAULT_LEGACY_PARTICLE_MOVEMENTS_FILE, DEFAULT_ANIMATION_FRAME_CACHE_BYTES,
+    DEFAULT_ANIMATION_LOD_PARTICLE_BUDGET
+)
 from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
+from .frame_cache import FrameCache
 
 
 class ParticleAnimator:
@@ -23,13 +30,20 @@ class ParticleAnimator:
         self.repeat_count = 0
         self.max_repeats = 1
         
+        self.frame_cache = None
+        self.frame_changed_callback = None  # Called with (iteration, total frames) after showing each frame
+        
+        # Level of detail: only a subset of the particles is drawn while the camera moves
+        self.lod_indices = None
+        self.lod_active = False
+        interactor_style = self.vtkWidget.GetRenderWindow().GetInteractor().GetInteractorStyle()
+        if interactor_style:
+            interactor_style.AddObserver('StartInteractionEvent', self.on_interaction_start)
+            interactor_style.AddObserver('EndInteractionEvent', self.on_interaction_end)
+        
     def create_particle_actor(self, points):
-        points_vtk = vtkPoints()
-        for point in points:
-            points_vtk.InsertNextPoint(point.x, point.y, point.z)
-
         polydata = vtkPolyData()
-        polydata.SetPoints(points_vtk)
+        polydata.SetPoints(create_vtk_points(points))
 
         vertex_filter = vtkVertexGlyphFilter()
         vertex_filter.SetInputData(polydata)
@@ -45,35 +59,25 @@ class ParticleAnimator:
 
         return actor
 
-    def animate_particle_movements(self, particles_movement):
+    def animate_particle_movements(self, particles_movement: TrajectoryData):
+        from numpy import zeros, float32
+        
         self.particles_movement = particles_movement
         self.current_iteration = 0
         self.repeat_count = 0
-        self.settled_actors = {}
 
         # Determine the maximum number of iterations
-        self.max_iterations = max(len(movements)
-                                  for movements in particles_movement.values())
-
-        # Initialize vtkPoints with the correct number of points
-        num_particles = len(particles_movement)
-        self.particle_points = vtkPoints()
-        self.particle_points.SetNumberOfPoints(num_particles)
+        self.max_iterations = particles_movement.max_length()
+        self.reset_frame_cache()
 
-        # Initialize points to a default position
-        for i in range(num_particles):
-            self.particle_points.SetPoint(i, [0.0, 0.0, 0.0])
+        # Positions of the current frame, VTK points share this buffer
+        self.frame_positions = zeros((len(particles_movement), 3), dtype=float32)
+        self.particle_polydata = self.create_points_polydata(self.frame_positions)
+        self.setup_lod()
 
         # Create an actor for the points
-        self.particle_polydata = vtkPolyData()
-        self.particle_polydata.SetPoints(self.particle_points)
-
-        self.vertex_filter = vtkVertexGlyphFilter()
-        self.vertex_filter.SetInputData(self.particle_polydata)
-        self.vertex_filter.Update()
-
         self.particle_mapper = vtkPolyDataMapper()
-        self.particle_mapper.SetInputConnection(self.vertex_filter.GetOutputPort())
+        self.particle_mapper.SetInputData(self.particle_polydata)
 
         self.particle_actor = vtkActor()
         self.particle_actor.SetMapper(self.particle_mapper)
@@ -84,67 +88,147 @@ class ParticleAnimator:
 
         # Set the timer to update every 1/FPS second
         self.animation_timer.start(1000 / self.FPS)
+        
+    def create_points_polydata(self, positions):
+        """
+        Creates polydata with one vertex cell per point. Points share the buffer with `positions`,
+        and the vertex cells never change, so updating a frame doesn't rebuild any cells.
+        """
+        from numpy import arange
+        
+        polydata = vtkPolyData()
+        polydata.SetPoints(create_vtk_points(positions))
+        polydata.SetVerts(create_vtk_cell_array(arange(len(positions)).reshape(-1, 1)))
+        return polydata
+    
+    def mark_points_modified(self, polydata):
+        points = polydata.GetPoints()
+        points.GetData().Modified()
+        points.Modified()
+        polydata.Modified()
+        
+    def setup_lod(self):
+        # There is no sense to draw more points than the window has pixels
+        width, height = self.vtkWidget.GetRenderWindow().GetSize()
+        budget = min(DEFAULT_ANIMATION_LOD_PARTICLE_BUDGET, max(width * height, 1))
+        
+        self.lod_active = False
+        self.lod_indices = None
+        if len(self.particles_movement) > budget:
+            self.lod_indices = self.particles_movement.lod_subset(budget)
+            self.lod_positions = self.frame_positions[self.lod_indices]
+            self.lod_polydata = self.create_points_polydata(self.lod_positions)
+            
+    def update_lod_positions(self):
+        from numpy import take
+        
+        take(self.frame_positions, self.lod_indices, axis=0, out=self.lod_positions)
+        self.mark_points_modified(self.lod_polydata)
+            
+    def on_interaction_start(self, obj, event):
+        if self.lod_indices is None or self.frame_cache is None:
+            return
+        self.update_lod_positions()
+        self.particle_mapper.SetInputData(self.lod_polydata)
+        self.lod_active = True
+        
+    def on_interaction_end(self, obj, event):
+        if not self.lod_active:
+            return
+        self.particle_mapper.SetInputData(self.particle_polydata)
+        self.lod_active = False
+        self.vtkWidget.GetRenderWindow().Render()
 
     def update_animation(self):
-        if self.current_iteration >= self.max_iterations * self.FPS:
+        if self.current_iteration >= self.total_frames():
             self.repeat_count += 1
             if self.repeat_count >= self.max_repeats:
-                self.stop_animation()
+                # Keeping the last frame and the frame cache, so the timeline still can seek and replay
+                self.pause()
                 return
             self.current_iteration = 0   # Reset iteration to start over
             self.remove_all_particles()  # Clear all particles and stop the animation
 
-        # Calculate frame within the current time step
-        time_step = self.current_iteration // self.FPS
-        frame_within_step = self.current_iteration % self.FPS
-
-        # Interpolation factor
-        t = 0 if self.FPS == 1 else frame_within_step / (self.FPS - 1)
-
-        # Move or create particle actors
-        for i, (particle_id, movements) in enumerate(self.particles_movement.items()):
-            if time_step < len(movements) - 1:
-                pos1 = movements[time_step]
-                pos2 = movements[time_step + 1]
-
-                # Calculate the new interpolated position
-                new_position = [
-                    pos1.x + t * (pos2.x - pos1.x),
-                    pos1.y + t * (pos2.y - pos1.y),
-                    pos1.z + t * (pos2.z - pos1.z)
-                ]
-
-                # Update the position of the particle in vtkPoints
-                self.particle_points.SetPoint(i, new_position)
-
-            else:
-                if particle_id not in self.settled_actors:
-                    settled_position = [
-                        movements[-1].x,
-                        movements[-1].y,
-                        movements[-1].z
-                    ]
-                    self.particle_points.SetPoint(i, settled_position)
-                    self.settled_actors[particle_id] = True
-
-        self.particle_points.Modified()
-        self.particle_polydata.Modified()
-        self.vtkWidget.GetRenderWindow().Render()
+        self.show_frame(self.current_iteration)
         self.current_iteration += 1
+        
+    def show_frame(self, iteration):
+        from numpy import copyto
+        
+        # VTK sees the new positions through the shared buffer
+        copyto(self.frame_positions, self.frame_cache.frame(iteration))
+        self.mark_points_modified(self.particle_polydata)
+        if self.lod_active:
+            self.update_lod_positions()
+
+        # Particles could be hidden by `remove_all_particles`
+        self.particle_actor.VisibilityOn()
+        self.vtkWidget.GetRenderWindow().Render()
+        
+        if self.frame_changed_callback:
+            self.frame_changed_callback(iteration, self.total_frames())
+            
+    def total_frames(self):
+        return self.max_iterations * self.FPS
+    
+    def reset_frame_cache(self):
+        self.stop_frame_cache()
+        self.frame_cache = FrameCache(self.particles_movement, self.FPS, DEFAULT_ANIMATION_FRAME_CACHE_BYTES)
+        
+    def stop_frame_cache(self):
+        if self.frame_cache is not None:
+            self.frame_cache.stop()
+            self.frame_cache = None
+            
+    def is_playing(self):
+        return self.animation_timer.isActive()
+    
+    def pause(self):
+        self.animation_timer.stop()
+        if self.frame_cache is not None and self.frame_changed_callback:
+            self.frame_changed_callback(max(self.current_iteration - 1, 0), self.total_frames())
+        
+    def resume(self):
+        if self.frame_cache is None:
+            return
+        if self.current_iteration >= self.total_frames():
+            self.current_iteration = 0
+            self.repeat_count = 0
+        self.animation_timer.start(1000 / self.FPS)
+        
+    def toggle_pause(self):
+        if self.is_playing():
+            self.pause()
+        else:
+            self.resume()
+            
+    def seek(self, iteration):
+        """
+        Shows the specified frame right away, playback (if any) continues from it.
+
+        :param iteration: Global index of the frame, it's clamped to the animation range.
+        """
+        if self.frame_cache is None or self.total_frames() == 0:
+            return
+        iteration = min(max(iteration, 0), self.total_frames() - 1)
+        self.show_frame(iteration)
+        self.current_iteration = iteration + 1
+        
+    def step(self, frames=1):
+        """
+        Pauses the animation and moves it by the specified count of frames (negative - backwards).
+        """
+        self.pause()
+        self.seek(self.current_iteration - 1 + frames)
 
     def remove_all_particles(self):
-        if hasattr(self, 'particle_points') and self.particle_points is not None:
-            self.particle_points.Reset()
-        if hasattr(self, 'particle_polydata') and self.particle_polydata is not None:
-            self.particle_polydata.Modified()
-        if hasattr(self, 'vertex_filter') and self.vertex_filter is not None:
-            self.vertex_filter.Update()
-        if hasattr(self, 'particle_mapper') and self.particle_mapper is not None:
-            self.particle_mapper.Update()
+        if hasattr(self, 'particle_actor') and self.particle_actor is not None:
+            self.particle_actor.VisibilityOff()
         self.vtkWidget.GetRenderWindow().Render()
 
     def stop_animation(self):
         self.animation_timer.stop()
+        self.stop_frame_cache()
         self.remove_all_particles()
 
     def show_animation(self):        
@@ -164,38 +248,40 @@ class ParticleAnimator:
         fps_dialog.setWindowTitle("Set FPS")
 
         if fps_dialog.exec_() == QDialog.Accepted:
+            if self.frame_cache is None:
+                self.FPS = fps_dialog.intValue()
+                return
+            
+            # Frames depend on FPS: keeping the position within the animation and recomputing them
+            progress = self.current_iteration / max(self.total_frames(), 1)
             self.FPS = fps_dialog.intValue()
+            self.current_iteration = int(progress * self.total_frames())
+            self.reset_frame_cache()
+            if self.is_playing():
+                self.animation_timer.start(1000 / self.FPS)
 
-    def load_particle_movements(self, filename="particles_movements.json"):
+    def load_particle_movements(self, filename=DEFAULT_PARTICLE_MOVEMENTS_FILE):
         """
-        Load particle movements from a JSON file.
+        Load particle movements from the HDF5 file written by the backend.
+        Falls back to the legacy JSON file if there is no HDF5 file (results of the older runs).
 
-        :param filename: Path to the JSON file.
-        :return: Dictionary with particle ID as keys and list of Point objects as values.
+        :param filename: Path to the HDF5 file.
+        :return: TrajectoryData with ragged positions of all the particles or None if loading failed.
         """
-        from json import load, JSONDecodeError
+        from os.path import exists
+        from json import JSONDecodeError
+        
+        if not exists(filename) and exists(DEFAULT_LEGACY_PARTICLE_MOVEMENTS_FILE):
+            filename = DEFAULT_LEGACY_PARTICLE_MOVEMENTS_FILE
         
         try:
-            class PointForTracking:
-                def __init__(self, x, y, z):
-                    self.x = x
-                    self.y = y
-                    self.z = z
-                def __repr__(self):
-                    return f"Point(x={self.x}, y={self.y}, z={self.z})"
-            
-            with open(filename, 'r') as file:
-                data = load(file)
-
-            particles_movement = {}
-            for particle_id, movements in data.items():
-                particle_id = int(particle_id)
-                particles_movement[particle_id] = [PointForTracking(movement['x'], movement['y'], movement['z']) for movement in movements]
-            return particles_movement
+            if filename.endswith('.json'):
+                return TrajectoryData.from_json(filename)
+            return TrajectoryData.from_hdf5(filename)
 
         except FileNotFoundError:
             self.log_console.printError(f"The file {filename} was not found.")
         except JSONDecodeError:
             self.log_console.printError("Error: The file is not a valid JSON.")
         except Exception as e:
-            self.log_console.printError(f"Unexpected error: {e}")
\ No newline at end of file
+            self.log_console.printError(f"Unexpected error: {e}")
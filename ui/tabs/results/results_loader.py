@@ -0,0 +1,99 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from data import HDF5Handler, MeshData
+from constants import DEFAULT_RESULTS_MAX_TRIANGLES_IN_MEMORY
+from .mesh_visualizer import MeshVisualizer
+from .geometry_cache import GeometryCache
+
+
+class ResultsLoaderSignals(QObject):
+    progress = pyqtSignal(int)     # Percent of the loading
+    warning = pyqtSignal(str)
+    finished = pyqtSignal(object)  # (HDF5Handler, MeshData, vtkPolyData)
+    failed = pyqtSignal(str)
+
+
+class ResultsLoader(QRunnable):
+    """
+    Reads the result file and builds the mesh polydata on a thread pool thread.
+
+    Nothing here touches the renderer: the GUI thread receives the finished polydata through
+    the `finished` signal and only creates and adds the actor.
+    """
+
+    READING_PROGRESS = 80  # Part of the progress taken by reading the file, the rest is for building the polydata
+
+    def __init__(self, hdf5_filename: str, swmr: bool = False, geometry_cache: GeometryCache = None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.hdf5_filename = hdf5_filename
+        self.swmr = swmr
+        self.geometry_cache = geometry_cache
+        self.signals = ResultsLoaderSignals()
+
+    def run(self):
+        try:
+            handler = HDF5Handler(self.hdf5_filename, swmr=self.swmr)
+            mesh_data, polydata = self.load_cached_geometry(handler)
+            if mesh_data is None:
+                mesh_data = self.read_mesh_data(handler)
+                self.signals.progress.emit(self.READING_PROGRESS)
+
+                topology = MeshVisualizer.build_topology(mesh_data)
+                polydata = MeshVisualizer.attach_counters(topology, mesh_data.counters)
+                self.cache_geometry(handler, mesh_data, topology)
+
+            mesh_data.counter_stats()
+            self.signals.progress.emit(100)
+            self.signals.finished.emit((handler, mesh_data, polydata))
+
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+    def load_cached_geometry(self, handler: HDF5Handler):
+        """
+        Reads only the counters if the geometry of the file is in the cache.
+
+        Returns:
+            tuple: (MeshData, vtkPolyData) or (None, None) on the cache miss.
+        """
+        key = GeometryCache.key(handler) if self.geometry_cache else None
+        cached = self.geometry_cache.get(key) if key else None
+        if cached is None or len(cached[0]) != len(handler.ids):
+            return None, None
+
+        geometry, topology = cached
+        counters = handler.read_counters(0, len(handler.ids))
+        mesh_data = MeshData(geometry.ids, geometry.coordinates, geometry.areas, counters)
+        return mesh_data, MeshVisualizer.attach_counters(topology, counters)
+
+    def cache_geometry(self, handler: HDF5Handler, mesh_data: MeshData, topology):
+        # Partially loaded (huge) meshes depend on the counters, so they aren't cached
+        key = GeometryCache.key(handler) if self.geometry_cache else None
+        if key and len(mesh_data) == len(handler.ids):
+            self.geometry_cache.put(key, mesh_data, topology)
+
+    def read_mesh_data(self, handler: HDF5Handler) -> MeshData:
+        """
+        Reads the mesh block by block reporting the progress. Huge meshes are read lazily, keeping at most
+        `DEFAULT_RESULTS_MAX_TRIANGLES_IN_MEMORY` triangles with the most settled particles, so peak memory stays bounded.
+
+        In the live (SWMR) mode the whole geometry is read once: counters are still zero while the simulation
+        runs, and the live refresh re-reads only the counters of the loaded triangles.
+        """
+        lazy_mesh = handler.lazy_mesh()
+        if len(lazy_mesh) > DEFAULT_RESULTS_MAX_TRIANGLES_IN_MEMORY and not self.swmr:
+            threshold, settled_count = lazy_mesh.counter_threshold(DEFAULT_RESULTS_MAX_TRIANGLES_IN_MEMORY)
+            mesh_data = lazy_mesh.by_counter_threshold(threshold, DEFAULT_RESULTS_MAX_TRIANGLES_IN_MEMORY)
+            self.signals.warning.emit(
+                f"Mesh contains {len(lazy_mesh)} triangles (more than {DEFAULT_RESULTS_MAX_TRIANGLES_IN_MEMORY}), "
+                f"showing only {len(mesh_data)} triangles with at least {threshold} settled particles: "
+                f"{len(lazy_mesh) - len(mesh_data)} triangles are dropped "
+                f"({settled_count - len(mesh_data)} of them with settled particles)")
+            return mesh_data
+
+        blocks, read_count = [], 0
+        for block in lazy_mesh.iter_blocks():
+            blocks.append(block)
+            read_count += len(block)
+            self.signals.progress.emit(self.READING_PROGRESS * read_count // len(lazy_mesh))
+        return MeshData.concatenate(blocks)
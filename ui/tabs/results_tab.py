@@ -5,26 +5,40 @@ from vtk import (
 from PyQt5.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QSpacerItem,
     QSizePolicy, QMenu, QAction, QFontDialog, QDialog, QLabel,
-    QLineEdit, QMessageBox, QColorDialog, QFileDialog
+    QLineEdit, QMessageBox, QColorDialog, QFileDialog, QSlider
 )
-from PyQt5.QtCore import QSize
+from PyQt5.QtCore import QSize, Qt, QThreadPool, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon
-from tabs import MeshVisualizer, ColorbarManager
-from data import HDF5Handler
+from tabs import MeshVisualizer, ColorbarManager, ResultsLoader, GeometryCache
 from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
 from vtkmodules.vtkInteractionStyle import vtkInteractorStyleTrackballCamera
 from logger.log_console import LogConsole
 from styles import DEFAULT_QLINEEDIT_STYLE
+from constants import DEFAULT_RESULTS_LIVE_REFRESH_INTERVAL_MS, DEFAULT_RESULTS_GEOMETRY_CACHE_SIZE
 from field_validators import CustomIntValidator, CustomDoubleValidator
+from data import HDF5Handler
 from .results import ParticleAnimator
 
 
 class ResultsTab(QWidget):
+    loadingStarted = pyqtSignal()
+    loadingProgress = pyqtSignal(int)
+    loadingFinished = pyqtSignal()
+    
     def __init__(self, log_console: LogConsole, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout()
         self.toolbarLayout = QHBoxLayout()
         self.log_console = log_console
+        self.results_loader = None
+        self.handler = None
+        self.geometry_cache = GeometryCache(DEFAULT_RESULTS_GEOMETRY_CACHE_SIZE)
+        
+        # Live refresh of the counters while the simulation is running
+        self.live_filename = None
+        self.live_file_state = None  # HDF5Handler.probe_file_state of the result file when the live refresh started
+        self.live_timer = QTimer(self)
+        self.live_timer.timeout.connect(self.refresh_live_results)
 
         self.setup_ui()
         self.setup_axes()
@@ -44,8 +58,71 @@ class ResultsTab(QWidget):
 
         self.layout.addLayout(self.toolbarLayout)
         self.layout.addWidget(self.vtkWidget)
+        self.setup_timeline()
         self.setLayout(self.layout)
         
+    def setup_timeline(self):
+        self.timelineLayout = QHBoxLayout()
+        
+        self.stepBackButton = QPushButton('<')
+        self.stepBackButton.setFixedWidth(30)
+        self.stepBackButton.setToolTip('Previous frame')
+        self.stepBackButton.clicked.connect(lambda: self.particle_animator.step(-1))
+        
+        self.playPauseButton = QPushButton('Pause')
+        self.playPauseButton.setFixedWidth(60)
+        self.playPauseButton.setToolTip('Pause/resume the animation')
+        self.playPauseButton.clicked.connect(self.toggle_animation_pause)
+        
+        self.stepForwardButton = QPushButton('>')
+        self.stepForwardButton.setFixedWidth(30)
+        self.stepForwardButton.setToolTip('Next frame')
+        self.stepForwardButton.clicked.connect(lambda: self.particle_animator.step(1))
+        
+        self.timelineSlider = QSlider(Qt.Horizontal)
+        self.timelineSlider.setRange(0, 0)
+        self.timelineSlider.valueChanged.connect(self.on_timeline_value_changed)
+        self.timelineSlider.sliderPressed.connect(self.on_timeline_slider_pressed)
+        self.timelineSlider.sliderReleased.connect(self.on_timeline_slider_released)
+        self.was_playing_before_scrubbing = False
+        
+        self.timelineLabel = QLabel('0 / 0')
+        
+        for widget in (self.stepBackButton, self.playPauseButton, self.stepForwardButton, self.timelineSlider, self.timelineLabel):
+            self.timelineLayout.addWidget(widget)
+        self.set_timeline_enabled(False)
+        self.layout.addLayout(self.timelineLayout)
+        
+    def set_timeline_enabled(self, enabled: bool):
+        for widget in (self.stepBackButton, self.playPauseButton, self.stepForwardButton, self.timelineSlider):
+            widget.setEnabled(enabled)
+            
+    def update_timeline(self, iteration, total_frames):
+        self.timelineSlider.blockSignals(True)
+        self.timelineSlider.setRange(0, max(total_frames - 1, 0))
+        self.timelineSlider.setValue(iteration)
+        self.timelineSlider.blockSignals(False)
+        self.timelineLabel.setText(f'{iteration + 1} / {total_frames}')
+        self.playPauseButton.setText('Pause' if self.particle_animator.is_playing() else 'Play')
+        self.set_timeline_enabled(True)
+        
+    def on_timeline_value_changed(self, value):
+        self.particle_animator.seek(value)
+        
+    def on_timeline_slider_pressed(self):
+        # Scrubbing pauses the playback and resumes it when the slider is released
+        self.was_playing_before_scrubbing = self.particle_animator.is_playing()
+        self.particle_animator.pause()
+        
+    def on_timeline_slider_released(self):
+        if self.was_playing_before_scrubbing:
+            self.particle_animator.resume()
+        self.playPauseButton.setText('Pause' if self.particle_animator.is_playing() else 'Play')
+        
+    def toggle_animation_pause(self):
+        self.particle_animator.toggle_pause()
+        self.playPauseButton.setText('Pause' if self.particle_animator.is_playing() else 'Play')
+        
     def setup_axes(self):
         self.axes_actor = vtkAxesActor()
         self.axes_widget = vtkOrientationMarkerWidget()
@@ -57,6 +134,7 @@ class ResultsTab(QWidget):
         
     def setup_particle_animator(self):
         self.particle_animator = ParticleAnimator(self.vtkWidget, self.log_console, self.renderer, self)
+        self.particle_animator.frame_changed_callback = self.update_timeline
 
     def create_toolbar_button(self, icon_path, tooltip, callback, layout, icon_size=QSize(40, 40), button_size=QSize(40, 40)):
         """
@@ -117,28 +195,121 @@ class ResultsTab(QWidget):
         
     def stop_animation(self):
         self.particle_animator.stop_animation()
+        self.set_timeline_enabled(False)
         
     def edit_fps(self):
         self.particle_animator.edit_fps()
 
-    def update_plot(self, hdf5_filename):
+    def update_plot(self, hdf5_filename, swmr=False):
         # Clear any existing actors from the renderer before updating
         self.clear_plot()
-
-        # Load the mesh data from the HDF5 file
+        self.close_handler()
+
+        # Load the mesh data from the HDF5 file in the background, GUI thread only adds the actor
+        self.results_loader = ResultsLoader(hdf5_filename, swmr, self.geometry_cache)
+        if not swmr:
+            # Progress bar shows the progress of the simulation while it's running
+            self.results_loader.signals.progress.connect(self.loadingProgress)
+        self.results_loader.signals.warning.connect(self.log_console.printWarning)
+        self.results_loader.signals.finished.connect(self.on_results_loaded)
+        self.results_loader.signals.failed.connect(self.on_results_loading_failed)
+        
+        if not swmr:
+            self.loadingStarted.emit()
+        QThreadPool.globalInstance().start(self.results_loader)
+        
+    def close_handler(self):
+        if self.handler is not None:
+            self.handler.close()
+            self.handler = None
+        
+    def is_current_loader(self):
+        # Results of the outdated loading (update_plot was called again) are ignored
+        return self.results_loader is not None and self.sender() is self.results_loader.signals
+        
+    def on_results_loaded(self, result):
+        if not self.is_current_loader():
+            return
+        self.results_loader = None
+        
         try:
-            self.handler = HDF5Handler(hdf5_filename)
-            self.mesh_data = self.handler.read_mesh_from_hdf5()
+            self.handler, self.mesh_data, polydata = result
             self.mesh_visualizer = MeshVisualizer(self.renderer, self.mesh_data)
-            colored_actor = self.mesh_visualizer.render_mesh()
+            colored_actor = self.mesh_visualizer.render_mesh(polydata)
             
             self.colorbar_manger = ColorbarManager(self.vtkWidget, self.renderer, self.mesh_data, colored_actor)
             self.colorbar_manger.add_colorbar('Particle Count')
             
+            if self.live_filename:
+                # Snapshot rows are in the file order, the mesh data is sorted by triangle IDs
+                self.live_rows = self.handler.rows_of_ids(self.mesh_data.ids)
+                self.live_snapshot_count = 0
+                self.refresh_live_results()
+            
         except Exception as e:
             QMessageBox.warning(self, "HDF5 Error", f"Something went wrong while hdf5 processing. Error: {e}")
 
         self.reset_camera()
+        if not self.live_filename:
+            self.loadingFinished.emit()
+        
+    def on_results_loading_failed(self, error):
+        if not self.is_current_loader():
+            return
+        self.results_loader = None
+        
+        # While the simulation is running the file may be not ready yet, loading is retried on the next refresh
+        if not self.live_filename:
+            QMessageBox.warning(self, "HDF5 Error", f"Something went wrong while hdf5 processing. Error: {error}")
+            self.reset_camera()
+            self.loadingFinished.emit()
+        
+    def start_live_refresh(self, hdf5_filename):
+        """
+        Starts following the counter snapshots that the running simulation appends to the result file.
+        The geometry is loaded once as soon as the file appears, then only the counters are swapped.
+        """
+        if not hdf5_filename:
+            return
+        
+        # The simulation recreates the result file: the previous one mustn't be held open
+        self.close_handler()
+        self.clear_plot()
+        self.live_filename = hdf5_filename
+        self.live_file_state = HDF5Handler.probe_file_state(hdf5_filename)  # State of the stale file, if any
+        self.live_timer.start(DEFAULT_RESULTS_LIVE_REFRESH_INTERVAL_MS)
+        
+    def stop_live_refresh(self):
+        self.live_timer.stop()
+        self.live_filename = None
+        self.results_loader = None
+        self.close_handler()
+        
+    def refresh_live_results(self):
+        if not self.live_filename or self.results_loader is not None:
+            return
+        
+        if self.handler is None:
+            # Waiting for the simulation to create the new result file: it's new once its signature differs from
+            # the one at the start or the counter snapshots appear in it
+            file_state = HDF5Handler.probe_file_state(self.live_filename)
+            if file_state is not None and (self.live_file_state is None or file_state[0] != self.live_file_state[0]
+                                           or (file_state[1] and not self.live_file_state[1])):
+                self.update_plot(self.live_filename, swmr=True)
+            return
+        
+        try:
+            snapshot = self.handler.read_latest_counter_snapshot(self.live_snapshot_count)
+        except Exception as e:
+            self.log_console.printWarning(f"Can't read counter snapshot: {e}")
+            return
+        if snapshot is None:
+            return
+        
+        self.live_snapshot_count, _, counters = snapshot
+        self.mesh_visualizer.update_counters(counters[self.live_rows])
+        self.colorbar_manger.update_counters()
+        self.vtkWidget.GetRenderWindow().Render()
 
     def reset_camera(self):
         self.renderer.ResetCamera()
@@ -6,3 +6,4 @@ from .physical_measurement_units_converter import PhysicalMeasurementUnitsConver
 from .project_manager import ProjectManager
 from .util import *
 from .vtk_helpers import *
+from .gmsh_session import GmshSession, GMSH_STP_CONVERSION_MODEL, GMSH_MSH_CONVERSION_MODEL
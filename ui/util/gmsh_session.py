@@ -0,0 +1,93 @@
+from threading import RLock
+from contextlib import contextmanager
+from gmsh import initialize, finalize, isInitialized, model, option
+
+GMSH_STP_CONVERSION_MODEL = 'stp_conversion'
+GMSH_MSH_CONVERSION_MODEL = 'msh_conversion'
+
+
+class GmshSession:
+    """
+    Single Gmsh session of the application.
+
+    Gmsh is initialized on the first use and finalized only with `shutdown` when the application quits, so the
+    operations don't pay the startup cost each time. Each operation works in its own named model: the model is
+    created on the first `acquire` and removed when its last reference is released. Options are restored to
+    their defaults when the last model is released, as it was after `finalize`.
+
+    Gmsh API isn't thread-safe, all the calls are serialized with the session lock.
+    """
+
+    lock = RLock()
+    model_refs = {}  # Key = model name  |  value = count of the references
+
+    @staticmethod
+    def start():
+        with GmshSession.lock:
+            if not isInitialized():
+                initialize()
+
+    @staticmethod
+    def shutdown():
+        """
+        Finalizes Gmsh, all the models are dropped.
+        """
+        with GmshSession.lock:
+            GmshSession.model_refs.clear()
+            if isInitialized():
+                finalize()
+
+    @staticmethod
+    def acquire(name: str) -> str:
+        """
+        Adds the reference to the named model (creates it if there is no such model) and makes it current.
+
+        Returns:
+            str: Name of the model.
+        """
+        with GmshSession.lock:
+            GmshSession.start()
+            if name in GmshSession.model_refs:
+                GmshSession.model_refs[name] += 1
+                model.setCurrent(name)
+            else:
+                model.add(name)
+                GmshSession.model_refs[name] = 1
+            return name
+
+    @staticmethod
+    def release(name: str):
+        """
+        Drops the reference to the named model, the model is removed with its last reference.
+        """
+        with GmshSession.lock:
+            refs = GmshSession.model_refs.get(name)
+            if refs is None:
+                return
+            if refs > 1:
+                GmshSession.model_refs[name] = refs - 1
+                return
+
+            del GmshSession.model_refs[name]
+            if isInitialized():
+                model.setCurrent(name)
+                model.remove()
+                if not GmshSession.model_refs:
+                    option.restoreDefaults()
+
+    @staticmethod
+    @contextmanager
+    def use_model(name: str):
+        """
+        Holds the lock and the reference to the named model while the block runs, the model is current in the block.
+        The previously current model of the session becomes current again after the block.
+        """
+        with GmshSession.lock:
+            previous = model.getCurrent() if GmshSession.model_refs else None
+            GmshSession.acquire(name)
+            try:
+                yield name
+            finally:
+                GmshSession.release(name)
+                if previous is not None and previous != name and previous in GmshSession.model_refs:
+                    model.setCurrent(previous)
@@ -1,36 +1,31 @@
-from gmsh import initialize, finalize, isInitialized, write
+from gmsh import write
 from tempfile import NamedTemporaryFile
 from vtk import (
     vtkUnstructuredGrid, vtkPolyData, vtkPolyDataWriter, vtkActor,
     vtkGeometryFilter, vtkPoints, vtkCellArray, vtkTriangle, vtkTransform,
     vtkAppendPolyData, vtkPolyDataMapper, vtkFeatureEdges, vtkPolyDataConnectivityFilter,
-    VTK_TRIANGLE
+    vtkLookupTable, VTK_TRIANGLE, VTK_ID_TYPE
 )
 from styles import DEFAULT_ACTOR_COLOR
+from .gmsh_session import GmshSession, GMSH_MSH_CONVERSION_MODEL
 
 
 def convert_msh_to_vtk(msh_filename: str):
-    from gmsh import open
+    from gmsh import merge
     
     if not msh_filename.endswith('.msh'):
         return None
 
     try:
-        if not isInitialized():
-            initialize()
-        initialize()
-        
-        vtk_filename = msh_filename.replace('.msh', '.vtk')
-        open(msh_filename)
-        write(vtk_filename)
+        with GmshSession.use_model(GMSH_MSH_CONVERSION_MODEL):
+            vtk_filename = msh_filename.replace('.msh', '.vtk')
+            merge(msh_filename)
+            write(vtk_filename)
         
         return vtk_filename
     except Exception as e:
         print(f"Error converting VTK to Msh: {e}")
         return None
-    finally:
-        if isInitialized():
-            finalize()
 
     
 def get_polydata_from_actor(actor: vtkActor):
@@ -160,6 +155,106 @@ def extract_geometry_data(actor: vtkActor):
 
     return points, cells, boundaries, surfaces
 
+def weld_vertices(vertices):
+    """
+    Merges coincident vertices with a single vectorized unique pass.
+
+    Args:
+        vertices (np.ndarray): Vertices, shape (M, 3).
+
+    Returns:
+        tuple: (points, inverse) - unique points, shape (K, 3), and the index of the unique point for each input vertex, shape (M,).
+    """
+    from numpy import unique
+    
+    points, inverse = unique(vertices, axis=0, return_inverse=True)
+    return points, inverse.reshape(-1)
+
+
+def create_vtk_cell_array(connectivity):
+    """
+    Creates vtkCellArray of equally sized cells straight from the connectivity array (without per-cell calls).
+
+    Args:
+        connectivity (np.ndarray): Point IDs of the cells, shape (N, k).
+
+    Returns:
+        vtkCellArray: Cell array that shares memory with the NumPy offsets/connectivity arrays.
+    """
+    from numpy import arange, ascontiguousarray
+    from vtkmodules.util.numpy_support import numpy_to_vtk, get_vtk_to_numpy_typemap
+    
+    # vtkIdType is 32 or 64 bit depending on the VTK build, its NumPy dtype is taken from VTK itself
+    id_dtype = get_vtk_to_numpy_typemap()[VTK_ID_TYPE]
+    cell_count, cell_size = connectivity.shape
+    offsets = arange(0, (cell_count + 1) * cell_size, cell_size, dtype=id_dtype)
+    connectivity = ascontiguousarray(connectivity.reshape(-1), dtype=id_dtype)
+
+    cells = vtkCellArray()
+    cells.SetData(numpy_to_vtk(offsets, deep=False, array_type=VTK_ID_TYPE),
+                  numpy_to_vtk(connectivity, deep=False, array_type=VTK_ID_TYPE))
+    return cells
+
+
+def create_vtk_points(points):
+    """
+    Creates vtkPoints that shares memory with the NumPy array of the coordinates.
+
+    Args:
+        points (np.ndarray): Coordinates, shape (K, 3).
+
+    Returns:
+        vtkPoints: Points wrapping the (contiguous) NumPy buffer.
+    """
+    from numpy import ascontiguousarray
+    from vtkmodules.util.numpy_support import numpy_to_vtk
+    
+    vtk_points = vtkPoints()
+    vtk_points.SetData(numpy_to_vtk(ascontiguousarray(points), deep=False))
+    return vtk_points
+
+
+def create_polydata_from_arrays(points, polys):
+    """
+    Builds vtkPolyData from NumPy arrays in bulk.
+
+    Args:
+        points (np.ndarray): Coordinates, shape (K, 3).
+        polys (np.ndarray): Point IDs of the polygons, shape (N, k), e.g. k = 3 for triangles.
+
+    Returns:
+        vtkPolyData: Polydata with points and polygons.
+    """
+    poly_data = vtkPolyData()
+    poly_data.SetPoints(create_vtk_points(points))
+    poly_data.SetPolys(create_vtk_cell_array(polys))
+    return poly_data
+
+
+def create_blue_red_lookup_table(max_value, table_size=256):
+    """
+    Creates the blue-to-red lookup table over [0, max_value]. The table is filled from a single NumPy array.
+
+    Args:
+        max_value (float): Upper bound of the scalar range.
+        table_size (int): Number of the table values.
+
+    Returns:
+        vtkLookupTable: Built lookup table.
+    """
+    from numpy import linspace, column_stack, zeros, ones
+    from vtkmodules.util.numpy_support import numpy_to_vtk
+    
+    ratio = linspace(0.0, 1.0, table_size)
+    rgba = column_stack((ratio, zeros(table_size), 1.0 - ratio, ones(table_size)))
+    
+    lookup_table = vtkLookupTable()
+    lookup_table.SetNumberOfTableValues(table_size)
+    lookup_table.SetRange(0, max_value)
+    lookup_table.SetTable(numpy_to_vtk((rgba * 255).round().astype('uint8'), deep=True))
+    return lookup_table
+
+
 def extract_boundaries(polydata):
     """Extract boundaries from vtkPolyData using vtkFeatureEdges."""
     feature_edges = vtkFeatureEdges()
@@ -71,6 +71,11 @@ class WindowApp(QMainWindow):
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 0)
         self.progress_bar.setHidden(True)
+        
+        # Results are loaded in the background, showing the progress of the loading
+        self.results_tab.loadingStarted.connect(self.on_results_loading_started)
+        self.results_tab.loadingProgress.connect(self.progress_bar.setValue)
+        self.results_tab.loadingFinished.connect(lambda: self.progress_bar.setHidden(True))
 
         # Set the scroll area
         scroll_area = QScrollArea()
@@ -144,7 +149,13 @@ class WindowApp(QMainWindow):
         self.log_console.log_console.setTextCursor(cursor)
         self.log_console.log_console.setCurrentCharFormat(QTextCharFormat())
 
+    def on_results_loading_started(self):
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setHidden(False)
+
     def on_process_finished(self, exitCode, exitStatus):
+        self.results_tab.stop_live_refresh()
         self.progress_bar.setHidden(True)
         exec_time = time() - self.start_time
         self.progress_bar.setValue(100)
@@ -546,6 +557,7 @@ class WindowApp(QMainWindow):
     def run_cpp(self, args: str) -> None:
         self.progress_bar.setHidden(False)
         self.start_time = time()
+        self.results_tab.start_live_refresh(getattr(self, 'hdf5_filename', None))
 
         # Checking OS
         if os.name == 'nt':